@@ -0,0 +1,272 @@
+"""
+Algoritmo Aho–Corasick para búsqueda simultánea de múltiples patrones.
+Responsabilidad única: encontrar todas las ocurrencias de un conjunto de
+patrones en una sola pasada sobre el texto.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
+
+@dataclass
+class AhoCorasickAutomaton:
+    """Autómata Aho–Corasick construido a partir de una lista de patrones."""
+    goto: list[dict[str, int]]
+    fail: list[int]
+    output: list[list[int]]
+    lengths: list[int]
+    # Patrones no vacíos (los que pueden coincidir)
+    active_count: int
+    
+    @property
+    def pattern_count(self) -> int:
+        """Número de patrones con los que se construyó el autómata."""
+        return len(self.lengths)
+
+
+def build_automaton(patterns: list[str]) -> AhoCorasickAutomaton:
+    """
+    Construye el autómata (trie + enlaces de fallo) para todos los patrones.
+    
+    Cada nodo guarda en `output` los índices de los patrones que terminan en
+    él, incluyendo los heredados por su enlace de fallo, de modo que la
+    búsqueda no necesita recorrer la cadena de fallos al reportar.
+    
+    Args:
+        patterns: Lista de patrones (los vacíos se ignoran)
+    
+    Returns:
+        AhoCorasickAutomaton listo para aho_corasick_search
+    
+    Complejidad: O(M * σ) donde M = suma de longitudes de los patrones
+    """
+    goto: list[dict[str, int]] = [{}]
+    output: list[list[int]] = [[]]
+    
+    for index, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        node = 0
+        for char in pattern:
+            next_node = goto[node].get(char)
+            if next_node is None:
+                next_node = len(goto)
+                goto[node][char] = next_node
+                goto.append({})
+                output.append([])
+            node = next_node
+        output[node].append(index)
+    
+    # Enlaces de fallo por recorrido en anchura (BFS)
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            queue.append(child)
+            state = fail[node]
+            while state and char not in goto[state]:
+                state = fail[state]
+            fallback = goto[state].get(char, 0)
+            fail[child] = fallback if fallback != child else 0
+            if output[fail[child]]:
+                output[child] = output[child] + output[fail[child]]
+    
+    return AhoCorasickAutomaton(
+        goto=goto,
+        fail=fail,
+        output=output,
+        lengths=[len(p) for p in patterns],
+        active_count=sum(1 for p in patterns if p),
+    )
+
+
+def aho_corasick_search(text: str, automaton: AhoCorasickAutomaton, mode: str = "all",
+                        max_matches: Optional[int] = None,
+                        overlapping: bool = True) -> Union[dict[int, list[int]], dict[int, int]]:
+    """
+    Busca todas las ocurrencias de todos los patrones del autómata.
+    
+    El resultado es disperso: el costo por llamada depende del texto y
+    de las coincidencias, no de la cantidad de patrones.
+    
+    Args:
+        text: Texto en el que buscar
+        automaton: Autómata construido con build_automaton
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar por patrón (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento de
+            cada patrón consigo mismo, de izquierda a derecha
+    
+    Returns:
+        Diccionario {índice de patrón: posiciones} solo con los patrones
+        encontrados (posiciones de inicio en orden ascendente, incluyendo
+        solapamientos), o {índice de patrón: cantidad} en modo "count"
+    
+    Complejidad: O(n + z) donde n = len(text), z = número de coincidencias;
+    con tope, termina cuando todos los patrones lo alcanzan
+    """
+    limit = match_limit(mode, max_matches)
+    record = mode != "count"
+    matches: dict[int, list[int]] = {}
+    found: dict[int, int] = {}
+    
+    if not text:
+        return matches if record else found
+    
+    goto = automaton.goto
+    fail = automaton.fail
+    output = automaton.output
+    lengths = automaton.lengths
+    # Patrones que aún no alcanzaron el tope (los vacíos nunca coinciden)
+    pending = automaton.active_count
+    # Sin solapamiento: primera posición de inicio admitida por patrón
+    next_free: Optional[dict[int, int]] = None if overlapping else {}
+    node = 0
+    
+    for i, char in enumerate(text):
+        while node and char not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(char, 0)
+        
+        if output[node]:
+            end = i + 1
+            for index in output[node]:
+                count = found.get(index, 0)
+                if count == limit:
+                    continue
+                start = end - lengths[index]
+                if next_free is not None:
+                    if start < next_free.get(index, 0):
+                        continue
+                    next_free[index] = end
+                found[index] = count + 1
+                if record:
+                    if count:
+                        matches[index].append(start)
+                    else:
+                        matches[index] = [start]
+                if count + 1 == limit:
+                    pending -= 1
+            if not pending:
+                break
+    
+    return matches if record else found
+
+
+def aho_corasick_matched(text: str, automaton: AhoCorasickAutomaton,
+                         stop_on: frozenset[int] = frozenset()) -> set[int]:
+    """
+    Indica qué patrones aparecen en el texto, sin guardar posiciones.
+    
+    Args:
+        text: Texto en el que buscar
+        automaton: Autómata construido con build_automaton
+        stop_on: Índices de patrones cuya aparición detiene el recorrido
+    
+    Returns:
+        Conjunto de índices de los patrones encontrados (si se detuvo
+        antes, solo los encontrados hasta ese punto)
+    
+    Complejidad: O(n) en el peor caso, sin memoria por coincidencia
+    """
+    matched: set[int] = set()
+    
+    goto = automaton.goto
+    fail = automaton.fail
+    output = automaton.output
+    node = 0
+    
+    for char in text:
+        while node and char not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(char, 0)
+        
+        if output[node]:
+            matched.update(output[node])
+            if stop_on and not stop_on.isdisjoint(output[node]):
+                break
+    
+    return matched
+
+
+def aho_corasick_search_single(text: str, pattern: str, mode: str = "all",
+                               max_matches: Optional[int] = None,
+                               overlapping: bool = True) -> Union[list[int], int]:
+    """
+    Busca un único patrón con Aho–Corasick.
+    (Misma interfaz que kmp_search y boyer_moore_search)
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de posiciones donde se encuentra el patrón, o su cantidad
+        en modo "count"
+    """
+    if not pattern or not text:
+        match_limit(mode, max_matches)
+        return no_matches(mode)
+    
+    return aho_corasick_search(
+        text, build_automaton([pattern]), mode, max_matches, overlapping
+    ).get(0, no_matches(mode))
+
+
+class AhoCorasickStream:
+    """
+    Búsqueda Aho–Corasick incremental sobre fragmentos (chunks).
+    El único estado entre fragmentos es el nodo actual del autómata.
+    """
+    
+    def __init__(self, automaton: AhoCorasickAutomaton):
+        """
+        Args:
+            automaton: Autómata construido con build_automaton
+        """
+        self.automaton = automaton
+        self.offset = 0
+        self._node = 0
+    
+    def feed(self, chunk: str) -> list[tuple[int, int]]:
+        """
+        Procesa el siguiente fragmento del texto.
+        
+        Args:
+            chunk: Fragmento de texto
+        
+        Returns:
+            Lista de tuplas (índice de patrón, posición global) de las
+            coincidencias que terminan dentro de este fragmento
+        
+        Complejidad: O(len(chunk) + z), memoria O(1) entre fragmentos
+        """
+        goto = self.automaton.goto
+        fail = self.automaton.fail
+        output = self.automaton.output
+        lengths = self.automaton.lengths
+        base = self.offset + 1
+        node = self._node
+        matches = []
+        
+        for i, char in enumerate(chunk):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            
+            if output[node]:
+                for index in output[node]:
+                    matches.append((index, base + i - lengths[index]))
+        
+        self._node = node
+        self.offset += len(chunk)
+        return matches
@@ -1,8 +1,13 @@
 """
 Algoritmo Boyer–Moore para búsqueda de patrones.
-Responsabilidad única: búsqueda eficiente usando bad character rule.
+Responsabilidad única: búsqueda eficiente usando bad character rule
+y, en la versión completa, good suffix rule con la optimización de Galil.
 """
 
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
 
 def build_bad_char_table(pattern: str) -> dict[str, int]:
     """
@@ -25,7 +30,11 @@ def build_bad_char_table(pattern: str) -> dict[str, int]:
     return bad_char
 
 
-def boyer_moore_search(text: str, pattern: str) -> list[int]:
+def boyer_moore_search(text: str, pattern: str,
+                       bad_char: Optional[dict[str, int]] = None,
+                       mode: str = "all",
+                       max_matches: Optional[int] = None,
+                       overlapping: bool = True) -> Union[list[int], int]:
     """
     Busca todas las ocurrencias de un patrón en un texto usando Boyer-Moore.
     Utiliza la regla del carácter malo para saltar posiciones.
@@ -33,26 +42,37 @@ def boyer_moore_search(text: str, pattern: str) -> list[int]:
     Args:
         text: Texto en el que buscar
         pattern: Patrón a buscar
+        bad_char: Tabla de carácter malo precalculada (se construye si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
     
     Returns:
-        Lista de posiciones (índices) donde se encuentra el patrón
+        Lista de posiciones (índices) donde se encuentra el patrón, o su
+        cantidad en modo "count"
     
     Complejidad: 
         - Mejor caso: O(n/m)
         - Peor caso: O(n*m)
         donde n = len(text), m = len(pattern)
     """
+    limit = match_limit(mode, max_matches)
+    
     if not pattern or not text:
-        return []
+        return no_matches(mode)
     
     n = len(text)
     m = len(pattern)
     
     if m > n:
-        return []
+        return no_matches(mode)
     
-    bad_char = build_bad_char_table(pattern)
+    if bad_char is None:
+        bad_char = build_bad_char_table(pattern)
+    record = mode != "count"
     matches = []
+    found = 0
     
     # s es el desplazamiento del patrón en el texto
     s = 0
@@ -66,9 +86,19 @@ def boyer_moore_search(text: str, pattern: str) -> list[int]:
         
         if j < 0:
             # Se encontró coincidencia en posición s
-            matches.append(s)
+            found += 1
+            if record:
+                matches.append(s)
+            if found == limit:
+                break
             # Desplazarse para buscar próxima coincidencia
-            s += 1 if s + m < n else 1
+            if not overlapping:
+                s += m
+            elif s + m < n:
+                # Alinear text[s + m] con su última aparición en el patrón
+                s += m - bad_char.get(text[s + m], -1)
+            else:
+                s += 1
         else:
             # Carácter malo en text[s + j]
             bad_char_pos = bad_char.get(text[s + j], -1)
@@ -77,13 +107,141 @@ def boyer_moore_search(text: str, pattern: str) -> list[int]:
             shift = max(1, j - bad_char_pos)
             s += shift
     
-    return matches
+    return matches if record else found
+
+
+def build_good_suffix_table(pattern: str) -> list[int]:
+    """
+    Construye la tabla de sufijo bueno fuerte (Strong Good Suffix Rule).
+    
+    shift[j + 1] es el desplazamiento seguro cuando ocurre un fallo en
+    pattern[j] tras haber coincidido pattern[j+1:]; shift[0] es el
+    desplazamiento tras una coincidencia completa (el periodo del patrón).
+    
+    Args:
+        pattern: Patrón a analizar
+    
+    Returns:
+        Lista de longitud len(pattern) + 1 con los desplazamientos
+    
+    Complejidad: O(m) donde m = len(pattern)
+    """
+    m = len(pattern)
+    shift = [0] * (m + 1)
+    # border[i]: inicio del borde más largo de pattern[i:]
+    border = [0] * (m + 1)
+    
+    # Caso 1: el sufijo coincidente aparece en otra parte del patrón,
+    # precedido por un carácter distinto
+    i = m
+    j = m + 1
+    border[i] = j
+    while i > 0:
+        while j <= m and pattern[i - 1] != pattern[j - 1]:
+            if shift[j] == 0:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
+        border[i] = j
+    
+    # Caso 2: solo una parte del sufijo coincidente es prefijo del patrón
+    j = border[0]
+    for i in range(m + 1):
+        if shift[i] == 0:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+    
+    return shift
+
+
+def boyer_moore_full_search(text: str, pattern: str,
+                            bad_char: Optional[dict[str, int]] = None,
+                            good_suffix: Optional[list[int]] = None,
+                            mode: str = "all",
+                            max_matches: Optional[int] = None,
+                            overlapping: bool = True) -> Union[list[int], int]:
+    """
+    Boyer-Moore completo: bad character + strong good suffix + regla de Galil.
+    
+    Tras una coincidencia el patrón avanza su periodo, y la regla de Galil
+    evita volver a comparar el prefijo que ya se sabe coincidente, por lo
+    que el texto nunca se relee más de una vez por alineación.
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        bad_char: Tabla de carácter malo precalculada (se construye si es None)
+        good_suffix: Tabla de sufijo bueno precalculada (se construye si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de posiciones (índices) donde se encuentra el patrón, o su
+        cantidad en modo "count"
+    
+    Complejidad:
+        - Mejor caso: O(n/m)
+        - Peor caso: O(n + m), incluso en textos repetitivos ("aaaa...")
+        donde n = len(text), m = len(pattern)
+    """
+    limit = match_limit(mode, max_matches)
+    
+    if not pattern or not text:
+        return no_matches(mode)
+    
+    n = len(text)
+    m = len(pattern)
+    
+    if m > n:
+        return no_matches(mode)
+    
+    if bad_char is None:
+        bad_char = build_bad_char_table(pattern)
+    if good_suffix is None:
+        good_suffix = build_good_suffix_table(pattern)
+    period = good_suffix[0]
+    record = mode != "count"
+    matches = []
+    found = 0
+    
+    s = 0
+    # Regla de Galil: pattern[:low] ya coincide en la alineación actual
+    low = 0
+    
+    while s <= n - m:
+        j = m - 1
+        
+        while j >= low and pattern[j] == text[s + j]:
+            j -= 1
+        
+        if j < low:
+            found += 1
+            if record:
+                matches.append(s)
+            if found == limit:
+                break
+            if overlapping:
+                s += period
+                low = m - period
+            else:
+                s += m
+                low = 0
+        else:
+            bad_char_shift = j - bad_char.get(text[s + j], -1)
+            s += max(good_suffix[j + 1], bad_char_shift)
+            low = 0
+    
+    return matches if record else found
 
 
 def boyer_moore_search_with_good_suffix(text: str, pattern: str) -> list[int]:
     """
     Versión mejorada de Boyer-Moore que incluye good suffix rule.
-    (Versión alternativa - usa la misma interfaz que boyer_moore_search)
+    (Alias de boyer_moore_full_search - misma interfaz que boyer_moore_search)
     
     Args:
         text: Texto en el que buscar
@@ -92,6 +250,49 @@ def boyer_moore_search_with_good_suffix(text: str, pattern: str) -> list[int]:
     Returns:
         Lista de posiciones donde se encuentra el patrón
     """
-    # Para esta implementación básica, usamos la versión con bad char
-    # La good suffix rule es una optimización adicional
-    return boyer_moore_search(text, pattern)
+    return boyer_moore_full_search(text, pattern)
+
+
+class BoyerMooreStream:
+    """
+    Búsqueda Boyer-Moore incremental sobre fragmentos (chunks).
+    Conserva los últimos len(pattern) - 1 caracteres como solapamiento,
+    suficiente para detectar coincidencias que cruzan fragmentos sin
+    reportar dos veces la misma.
+    """
+    
+    def __init__(self, pattern: str, bad_char: Optional[dict[str, int]] = None):
+        """
+        Args:
+            pattern: Patrón a buscar
+            bad_char: Tabla de carácter malo precalculada (se construye si es None)
+        """
+        self.pattern = pattern
+        self.bad_char = bad_char if bad_char is not None else build_bad_char_table(pattern)
+        self.offset = 0
+        self._tail = ""
+    
+    def feed(self, chunk: str) -> list[int]:
+        """
+        Procesa el siguiente fragmento del texto.
+        
+        Args:
+            chunk: Fragmento de texto
+        
+        Returns:
+            Posiciones globales (desde el inicio del flujo) de las
+            coincidencias que terminan dentro de este fragmento
+        
+        Complejidad: O(len(chunk) + m) por fragmento, memoria O(m)
+        """
+        m = len(self.pattern)
+        window = self._tail + chunk
+        base = self.offset - len(self._tail)
+        
+        matches = [
+            base + s for s in boyer_moore_search(window, self.pattern, self.bad_char)
+        ]
+        
+        self._tail = window[max(0, len(window) - m + 1):] if m > 1 else ""
+        self.offset += len(chunk)
+        return matches
@@ -0,0 +1,98 @@
+"""
+Algoritmo Boyer–Moore–Horspool para búsqueda de patrones.
+Responsabilidad única: búsqueda con salto por el último carácter de la ventana.
+"""
+
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
+
+def build_horspool_shift_table(pattern: str) -> dict[str, int]:
+    """
+    Construye la tabla de desplazamientos de Horspool.
+    Para cada carácter del patrón (excepto el último), almacena la distancia
+    desde su última aparición hasta el final del patrón.
+    
+    Args:
+        pattern: Patrón a analizar
+    
+    Returns:
+        Diccionario {caracter: desplazamiento}; los caracteres ausentes
+        desplazan len(pattern)
+    
+    Complejidad: O(m) donde m = len(pattern)
+    """
+    m = len(pattern)
+    shift = {}
+    
+    for i, char in enumerate(pattern[:-1]):
+        shift[char] = m - 1 - i
+    
+    return shift
+
+
+def horspool_search(text: str, pattern: str,
+                    shift: Optional[dict[str, int]] = None,
+                    mode: str = "all",
+                    max_matches: Optional[int] = None,
+                    overlapping: bool = True) -> Union[list[int], int]:
+    """
+    Busca todas las ocurrencias de un patrón usando Horspool.
+    
+    Cada ventana se verifica con una comparación de slices (en C) y el
+    salto depende solo del carácter alineado con el final del patrón.
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        shift: Tabla de desplazamientos precalculada (se construye si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de posiciones (índices) donde se encuentra el patrón, o su
+        cantidad en modo "count"
+    
+    Complejidad:
+        - Mejor caso: O(n/m)
+        - Peor caso: O(n*m)
+        donde n = len(text), m = len(pattern)
+    """
+    limit = match_limit(mode, max_matches)
+    
+    if not pattern or not text:
+        return no_matches(mode)
+    
+    n = len(text)
+    m = len(pattern)
+    
+    if m > n:
+        return no_matches(mode)
+    
+    if shift is None:
+        shift = build_horspool_shift_table(pattern)
+    last = m - 1
+    last_char = pattern[last]
+    record = mode != "count"
+    matches = []
+    found = 0
+    
+    s = 0
+    
+    while s <= n - m:
+        char = text[s + last]
+        if char == last_char and text[s:s + m] == pattern:
+            found += 1
+            if record:
+                matches.append(s)
+            if found == limit:
+                break
+            if not overlapping:
+                s += m
+                continue
+        s += shift.get(char, m)
+    
+    return matches if record else found
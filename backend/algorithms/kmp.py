@@ -3,6 +3,10 @@ Algoritmo Knuth–Morris–Pratt (KMP) para búsqueda de patrones.
 Responsabilidad única: búsqueda eficiente de patrones en texto.
 """
 
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
 
 def build_lps(pattern: str) -> list[int]:
     """
@@ -36,30 +40,44 @@ def build_lps(pattern: str) -> list[int]:
     return lps
 
 
-def kmp_search(text: str, pattern: str) -> list[int]:
+def kmp_search(text: str, pattern: str, lps: Optional[list[int]] = None,
+               mode: str = "all", max_matches: Optional[int] = None,
+               overlapping: bool = True) -> Union[list[int], int]:
     """
     Busca todas las ocurrencias de un patrón en un texto usando KMP.
     
     Args:
         text: Texto en el que buscar
         pattern: Patrón a buscar
+        lps: Array LPS precalculado (se construye si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
     
     Returns:
-        Lista de posiciones (índices) donde se encuentra el patrón
+        Lista de posiciones (índices) donde se encuentra el patrón, o su
+        cantidad en modo "count"
     
-    Complejidad: O(n + m) donde n = len(text), m = len(pattern)
+    Complejidad: O(n + m) donde n = len(text), m = len(pattern); con
+    tope, termina al alcanzarlo
     """
+    limit = match_limit(mode, max_matches)
+    
     if not pattern or not text:
-        return []
+        return no_matches(mode)
     
     n = len(text)
     m = len(pattern)
     
     if m > n:
-        return []
+        return no_matches(mode)
     
-    lps = build_lps(pattern)
+    if lps is None:
+        lps = build_lps(pattern)
+    record = mode != "count"
     matches = []
+    found = 0
     i = 0  # índice en text
     j = 0  # índice en pattern
     
@@ -70,12 +88,74 @@ def kmp_search(text: str, pattern: str) -> list[int]:
         
         if j == m:
             # Encontramos una coincidencia
-            matches.append(i - j)
-            j = lps[j - 1]
+            found += 1
+            if record:
+                matches.append(i - j)
+            if found == limit:
+                break
+            # Sin solapamiento, la próxima coincidencia empieza desde cero en i
+            j = lps[j - 1] if overlapping else 0
         elif i < n and text[i] != pattern[j]:
             if j != 0:
                 j = lps[j - 1]
             else:
                 i += 1
     
-    return matches
+    return matches if record else found
+
+
+class KMPStream:
+    """
+    Búsqueda KMP incremental: recibe el texto en fragmentos (chunks) y
+    conserva el estado (j = prefijo coincidente) entre uno y otro, por lo
+    que las coincidencias que cruzan fragmentos también se detectan.
+    """
+    
+    def __init__(self, pattern: str, lps: Optional[list[int]] = None):
+        """
+        Args:
+            pattern: Patrón a buscar
+            lps: Array LPS precalculado (se construye si es None)
+        """
+        self.pattern = pattern
+        self.lps = lps if lps is not None else build_lps(pattern)
+        self.offset = 0
+        self._j = 0
+    
+    def feed(self, chunk: str) -> list[int]:
+        """
+        Procesa el siguiente fragmento del texto.
+        
+        Args:
+            chunk: Fragmento de texto
+        
+        Returns:
+            Posiciones globales (desde el inicio del flujo) de las
+            coincidencias que terminan dentro de este fragmento
+        
+        Complejidad: O(len(chunk)) amortizado, memoria O(m)
+        """
+        pattern = self.pattern
+        m = len(pattern)
+        
+        if not m:
+            self.offset += len(chunk)
+            return []
+        
+        lps = self.lps
+        base = self.offset - m + 1
+        matches = []
+        j = self._j
+        
+        for i, char in enumerate(chunk):
+            while j and char != pattern[j]:
+                j = lps[j - 1]
+            if char == pattern[j]:
+                j += 1
+                if j == m:
+                    matches.append(base + i)
+                    j = lps[j - 1]
+        
+        self._j = j
+        self.offset += len(chunk)
+        return matches
@@ -0,0 +1,243 @@
+"""
+Algoritmo de Myers (vector de bits) para búsqueda aproximada de patrones.
+Responsabilidad única: encontrar ocurrencias de un patrón con hasta k
+errores de edición (inserción, eliminación o sustitución).
+"""
+
+import heapq
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
+
+def build_peq(pattern: str) -> dict[str, int]:
+    """
+    Construye las máscaras de igualdad de Myers.
+    El bit i de peq[c] vale 1 si pattern[i] == c.
+    
+    Args:
+        pattern: Patrón a analizar
+    
+    Returns:
+        Diccionario {caracter: máscara}; los caracteres ausentes usan 0
+    
+    Complejidad: O(m) donde m = len(pattern)
+    """
+    peq = {}
+    
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    
+    return peq
+
+
+def _match_start(text: str, end: int, pattern: str, distance: int) -> int:
+    """
+    Calcula el inicio de una ocurrencia aproximada que termina en `end`.
+    
+    Programación dinámica sobre patrón y texto invertidos, limitada a una
+    ventana de len(pattern) + distance caracteres. Entre los inicios con la
+    distancia encontrada, elige el de longitud más cercana al patrón.
+    
+    Complejidad: O(m * (m + k))
+    """
+    m = len(pattern)
+    window = min(end + 1, m + distance)
+    reversed_pattern = pattern[::-1]
+    
+    # previous[i] = distancia entre pattern[-i:] y el sufijo de texto actual
+    previous = list(range(m + 1))
+    best_length = None
+    
+    for length in range(1, window + 1):
+        char = text[end - length + 1]
+        current = [length] + [0] * m
+        for i in range(1, m + 1):
+            cost = 0 if reversed_pattern[i - 1] == char else 1
+            current[i] = min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + cost)
+        if current[m] == distance:
+            if best_length is None or abs(length - m) < abs(best_length - m):
+                best_length = length
+        previous = current
+    
+    return end - (best_length if best_length is not None else m) + 1
+
+
+def myers_search(text: str, pattern: str, max_errors: int = 0,
+                 peq: Optional[dict[str, int]] = None, mode: str = "all",
+                 max_matches: Optional[int] = None,
+                 overlapping: bool = True) -> Union[list[tuple[int, int]], int]:
+    """
+    Busca ocurrencias aproximadas de un patrón con el algoritmo de Myers.
+    
+    Una columna de la matriz de distancias de edición se representa con dos
+    vectores de bits (deltas +1/-1), por lo que cada carácter del texto se
+    procesa con un número constante de operaciones sobre enteros.
+    
+    Las posiciones finales consecutivas con distancia <= max_errors forman
+    una sola ocurrencia; se reporta la de menor distancia (todas, si son
+    exactas, igual que kmp_search). Si dos ocurrencias comparten inicio,
+    queda una sola, con la menor distancia. Con mode="first" o
+    max_matches el resultado es un prefijo del de mode="all".
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        max_errors: Errores de edición permitidos (se limita a len(pattern) - 1)
+        peq: Máscaras precalculadas (se construyen si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de tuplas (posición de inicio, distancia de edición),
+        ordenada por posición, o su cantidad en modo "count"
+    
+    Complejidad: O(n * ceil(m / w)) + O(m * (m + k)) por ocurrencia; con
+    tope, el recorrido termina tras max_matches ocurrencias completas
+    """
+    limit = match_limit(mode, max_matches)
+    
+    if not pattern or not text:
+        return no_matches(mode)
+    
+    m = len(pattern)
+    k = max(0, min(max_errors, m - 1))
+    
+    if m - k > len(text):
+        return no_matches(mode)
+    
+    if peq is None:
+        peq = build_peq(pattern)
+    all_ones = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    
+    pv = all_ones
+    mv = 0
+    score = m
+    
+    # Menor distancia por inicio, de los tramos ya resueltos
+    best_by_start: dict[int, int] = {}
+    # Tramo abierto: (fin, distancia) de posiciones consecutivas que cumplen el umbral
+    run: list[tuple[int, int]] = []
+    # Sin solapamiento alguna ocurrencia puede descartarse, así que no se corta antes
+    stop_after = limit if overlapping else None
+    
+    def resolve(run: list[tuple[int, int]]) -> None:
+        best = min(distance for _, distance in run)
+        if best == 0:
+            starts = [end - m + 1 for end, distance in run if distance == 0]
+        else:
+            end = next(end for end, distance in run if distance == best)
+            starts = [_match_start(text, end, pattern, best)]
+        for start in starts:
+            if best < best_by_start.get(start, best + 1):
+                best_by_start[start] = best
+    
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & all_ones
+        mh = pv & xh
+        
+        if ph & high_bit:
+            score += 1
+        elif mh & high_bit:
+            score -= 1
+        
+        ph = (ph << 1) & all_ones
+        mh = (mh << 1) & all_ones
+        pv = (mh | ~(xv | ph)) & all_ones
+        mv = ph & xv
+        
+        if score <= k:
+            if run and run[-1][0] != j - 1:
+                resolve(run)
+                run = []
+                # Los tramos siguientes terminan en >= j, así que empiezan en
+                # >= j - (m + k) + 1: si los primeros inicios quedan antes, ya
+                # no cambian
+                if (stop_after is not None and len(best_by_start) >= stop_after
+                        and heapq.nsmallest(stop_after, best_by_start)[-1] < j - m - k + 1):
+                    break
+            run.append((j, score))
+    else:
+        if run:
+            resolve(run)
+    
+    matches = sorted(best_by_start.items())
+    if not overlapping:
+        # De izquierda a derecha, cada ocurrencia ocupa m caracteres
+        kept = []
+        next_free = 0
+        for start, distance in matches:
+            if start >= next_free:
+                kept.append((start, distance))
+                next_free = start + m
+        matches = kept
+    if limit is not None:
+        del matches[limit:]
+    return matches if mode != "count" else len(matches)
+
+
+def myers_exists(text: str, pattern: str, max_errors: int = 0,
+                 peq: Optional[dict[str, int]] = None) -> bool:
+    """
+    Indica si el patrón aparece con a lo sumo max_errors errores,
+    deteniéndose en la primera posición que cumple el umbral.
+    
+    Equivale a bool(myers_search(text, pattern, max_errors, peq)) sin
+    recorrer el resto del texto ni calcular posiciones de inicio.
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        max_errors: Errores de edición permitidos (se limita a len(pattern) - 1)
+        peq: Máscaras precalculadas (se construyen si es None)
+    
+    Returns:
+        True si hay al menos una ocurrencia
+    
+    Complejidad: O(n * ceil(m / w)) en el peor caso
+    """
+    if not pattern or not text:
+        return False
+    
+    m = len(pattern)
+    k = max(0, min(max_errors, m - 1))
+    
+    if m - k > len(text):
+        return False
+    
+    if peq is None:
+        peq = build_peq(pattern)
+    all_ones = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    
+    pv = all_ones
+    mv = 0
+    score = m
+    
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & all_ones
+        mh = pv & xh
+        
+        if ph & high_bit:
+            score += 1
+        elif mh & high_bit:
+            score -= 1
+        
+        if score <= k:
+            return True
+        
+        ph = (ph << 1) & all_ones
+        mh = (mh << 1) & all_ones
+        pv = (mh | ~(xv | ph)) & all_ones
+        mv = ph & xv
+    
+    return False
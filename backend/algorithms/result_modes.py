@@ -0,0 +1,47 @@
+"""
+Modos de resultado comunes a los algoritmos de búsqueda.
+Responsabilidad única: validar `mode` / `max_matches` y definir qué
+retorna una búsqueda sin coincidencias en cada modo.
+
+- "all": lista de posiciones (hasta max_matches, si se indica)
+- "first": lista con a lo sumo la primera posición; la búsqueda se
+  detiene en ella
+- "count": solo el número de coincidencias (hasta max_matches), sin
+  construir la lista de posiciones
+"""
+
+from typing import Optional, Union
+
+
+MATCH_MODES = ("all", "first", "count")
+
+
+def match_limit(mode: str, max_matches: Optional[int] = None) -> Optional[int]:
+    """
+    Valida el modo y retorna cuántas coincidencias reportar como máximo.
+    
+    Args:
+        mode: "all", "first" o "count"
+        max_matches: Tope de coincidencias (None = sin tope)
+    
+    Returns:
+        Tope efectivo (1 en modo "first"), o None si no hay tope
+    
+    Raises:
+        ValueError: Si el modo no existe o max_matches < 1
+    """
+    if mode == "all" and max_matches is None:
+        return None
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Modo debe ser uno de: {', '.join(MATCH_MODES)}")
+    if max_matches is not None and max_matches < 1:
+        raise ValueError("max_matches debe ser al menos 1")
+    
+    if mode == "first":
+        return 1
+    return max_matches
+
+
+def no_matches(mode: str) -> Union[list, int]:
+    """Resultado de una búsqueda sin coincidencias: 0 en modo "count", si no []."""
+    return 0 if mode == "count" else []
@@ -0,0 +1,254 @@
+"""
+Algoritmo Shift-Or (bitap) para búsqueda de patrones.
+Responsabilidad única: búsqueda bit-paralela, una operación shift-or por
+carácter del texto, para uno o varios patrones empaquetados en un entero.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
+
+def build_shift_or_masks(pattern: str) -> dict[str, int]:
+    """
+    Construye las máscaras de caracteres de Shift-Or.
+    El bit i de mask[c] vale 0 si pattern[i] == c y 1 en caso contrario.
+    
+    Args:
+        pattern: Patrón a analizar
+    
+    Returns:
+        Diccionario {caracter: máscara}; los caracteres ausentes usan
+        la máscara con todos los bits en 1
+    
+    Complejidad: O(m * σ) donde m = len(pattern), σ = caracteres distintos
+    """
+    all_ones = (1 << len(pattern)) - 1
+    masks = {}
+    
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, all_ones) & ~(1 << i)
+    
+    return masks
+
+
+def shift_or_search(text: str, pattern: str,
+                    masks: Optional[dict[str, int]] = None,
+                    mode: str = "all",
+                    max_matches: Optional[int] = None,
+                    overlapping: bool = True) -> Union[list[int], int]:
+    """
+    Busca todas las ocurrencias de un patrón usando Shift-Or.
+    
+    El estado guarda un bit por prefijo del patrón (0 = el prefijo coincide
+    terminando en el carácter actual); cada carácter del texto actualiza
+    todos los prefijos a la vez con un desplazamiento y un OR.
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        masks: Máscaras precalculadas (se construyen si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de posiciones (índices) donde se encuentra el patrón, o su
+        cantidad en modo "count"
+    
+    Complejidad: O(n * ceil(m / w)), O(n) para patrones de hasta
+    w = 30/60 bits (un dígito de entero de CPython)
+    """
+    limit = match_limit(mode, max_matches)
+    
+    if not pattern or not text:
+        return no_matches(mode)
+    
+    n = len(text)
+    m = len(pattern)
+    
+    if m > n:
+        return no_matches(mode)
+    
+    if masks is None:
+        masks = build_shift_or_masks(pattern)
+    all_ones = (1 << m) - 1
+    match_bit = 1 << (m - 1)
+    record = mode != "count"
+    matches = []
+    found = 0
+    
+    state = all_ones
+    
+    for i, char in enumerate(text):
+        state = ((state << 1) | masks.get(char, all_ones)) & all_ones
+        if not state & match_bit:
+            found += 1
+            if record:
+                matches.append(i - m + 1)
+            if found == limit:
+                break
+            if not overlapping:
+                # Descartar los prefijos que empezaron dentro de esta coincidencia
+                state = all_ones
+    
+    return matches if record else found
+
+
+@dataclass
+class ShiftOrGroup:
+    """Varios patrones empaquetados en campos de bits de un mismo entero."""
+    masks: dict[str, int]
+    all_ones: int
+    keep: int
+    end_bits: int
+    ends: dict[int, tuple[int, int]]
+
+
+@dataclass
+class ShiftOrMultiTables:
+    """Grupos Shift-Or construidos a partir de una lista de patrones."""
+    groups: list[ShiftOrGroup]
+    pattern_count: int
+
+
+def build_shift_or_multi(patterns: list[str], word_size: int = 4096) -> ShiftOrMultiTables:
+    """
+    Empaqueta los patrones en grupos de hasta `word_size` bits.
+    
+    Cada patrón ocupa len(patrón) bits consecutivos dentro del entero del
+    grupo. Tras cada desplazamiento se fuerza a 0 el primer bit de cada
+    campo (`keep`), de modo que el último bit de un patrón no contamine
+    al siguiente. Los patrones más largos que `word_size` van solos.
+    
+    En CPython el costo dominante es el bucle interpretado por carácter, no
+    el tamaño del entero, por lo que conviene pocos grupos anchos.
+    
+    Args:
+        patterns: Lista de patrones (los vacíos se ignoran)
+        word_size: Bits máximos por grupo
+    
+    Returns:
+        ShiftOrMultiTables listas para shift_or_multi_search
+    """
+    groups = []
+    pending: list[tuple[int, str]] = []
+    pending_bits = 0
+    
+    def flush() -> None:
+        masks: dict[str, int] = {}
+        start_bits = 0
+        end_bits = 0
+        ends = {}
+        offset = 0
+        
+        for index, pattern in pending:
+            m = len(pattern)
+            start_bits |= 1 << offset
+            end_bits |= 1 << (offset + m - 1)
+            ends[1 << (offset + m - 1)] = (index, m)
+            for i, char in enumerate(pattern):
+                masks[char] = masks.get(char, 0) | (1 << (offset + i))
+            offset += m
+        
+        all_ones = (1 << offset) - 1
+        groups.append(ShiftOrGroup(
+            # En los campos, bit en 1 = el carácter NO coincide
+            masks={char: all_ones & ~bits for char, bits in masks.items()},
+            all_ones=all_ones,
+            keep=all_ones & ~start_bits,
+            end_bits=end_bits,
+            ends=ends,
+        ))
+    
+    for index, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        if pending and pending_bits + len(pattern) > word_size:
+            flush()
+            pending = []
+            pending_bits = 0
+        pending.append((index, pattern))
+        pending_bits += len(pattern)
+    
+    if pending:
+        flush()
+    
+    return ShiftOrMultiTables(groups=groups, pattern_count=len(patterns))
+
+
+def shift_or_multi_search(text: str, tables: ShiftOrMultiTables, mode: str = "all",
+                          max_matches: Optional[int] = None,
+                          overlapping: bool = True) -> Union[dict[int, list[int]], dict[int, int]]:
+    """
+    Busca todas las ocurrencias de todos los patrones empaquetados.
+    
+    El resultado es disperso, igual que en aho_corasick_search.
+    
+    Args:
+        text: Texto en el que buscar
+        tables: Grupos construidos con build_shift_or_multi
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar por patrón (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento de
+            cada patrón consigo mismo, de izquierda a derecha
+    
+    Returns:
+        Diccionario {índice de patrón: posiciones} solo con los patrones
+        encontrados (posiciones de inicio en orden ascendente, incluyendo
+        solapamientos), o {índice de patrón: cantidad} en modo "count"
+    
+    Complejidad: O(n * grupos); con tope, cada grupo termina cuando todos
+    sus patrones lo alcanzan
+    """
+    limit = match_limit(mode, max_matches)
+    record = mode != "count"
+    matches: dict[int, list[int]] = {}
+    found: dict[int, int] = {}
+    # Sin solapamiento: primera posición de inicio admitida por patrón
+    next_free: Optional[dict[int, int]] = None if overlapping else {}
+    
+    if not text:
+        return matches if record else found
+    
+    for group in tables.groups:
+        masks = group.masks
+        all_ones = group.all_ones
+        keep = group.keep
+        end_bits = group.end_bits
+        ends = group.ends
+        # Patrones del grupo que aún no alcanzaron el tope
+        pending = len(ends)
+        state = all_ones
+        
+        for i, char in enumerate(text):
+            state = ((state << 1) & keep) | masks.get(char, all_ones)
+            if state & end_bits != end_bits:
+                # Recorrer solo los bits de fin en 0 (patrones que terminan aquí)
+                hits = ~state & end_bits
+                while hits:
+                    bit = hits & -hits
+                    hits ^= bit
+                    index, m = ends[bit]
+                    count = found.get(index, 0)
+                    if count == limit:
+                        continue
+                    start = i - m + 1
+                    if next_free is not None:
+                        if start < next_free.get(index, 0):
+                            continue
+                        next_free[index] = i + 1
+                    found[index] = count + 1
+                    if record:
+                        if count:
+                            matches[index].append(start)
+                        else:
+                            matches[index] = [start]
+                    if count + 1 == limit:
+                        pending -= 1
+                if not pending:
+                    break
+    
+    return matches if record else found
@@ -0,0 +1,99 @@
+"""
+Algoritmo Sunday (Quick Search) para búsqueda de patrones.
+Responsabilidad única: búsqueda con salto por el carácter siguiente a la ventana.
+"""
+
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
+
+def build_sunday_shift_table(pattern: str) -> dict[str, int]:
+    """
+    Construye la tabla de desplazamientos de Sunday.
+    Para cada carácter del patrón, almacena cuánto avanzar si ese carácter
+    es el que sigue inmediatamente a la ventana actual.
+    
+    Args:
+        pattern: Patrón a analizar
+    
+    Returns:
+        Diccionario {caracter: desplazamiento}; los caracteres ausentes
+        desplazan len(pattern) + 1
+    
+    Complejidad: O(m) donde m = len(pattern)
+    """
+    m = len(pattern)
+    shift = {}
+    
+    for i, char in enumerate(pattern):
+        shift[char] = m - i
+    
+    return shift
+
+
+def sunday_search(text: str, pattern: str,
+                  shift: Optional[dict[str, int]] = None,
+                  mode: str = "all",
+                  max_matches: Optional[int] = None,
+                  overlapping: bool = True) -> Union[list[int], int]:
+    """
+    Busca todas las ocurrencias de un patrón usando Sunday (Quick Search).
+    
+    Cada ventana se verifica con una comparación de slices (en C) y el
+    salto depende del carácter text[s + m], por lo que puede avanzar
+    hasta m + 1 posiciones.
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        shift: Tabla de desplazamientos precalculada (se construye si es None)
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de posiciones (índices) donde se encuentra el patrón, o su
+        cantidad en modo "count"
+    
+    Complejidad:
+        - Mejor caso: O(n/(m+1))
+        - Peor caso: O(n*m)
+        donde n = len(text), m = len(pattern)
+    """
+    limit = match_limit(mode, max_matches)
+    
+    if not pattern or not text:
+        return no_matches(mode)
+    
+    n = len(text)
+    m = len(pattern)
+    
+    if m > n:
+        return no_matches(mode)
+    
+    if shift is None:
+        shift = build_sunday_shift_table(pattern)
+    first_char = pattern[0]
+    record = mode != "count"
+    matches = []
+    found = 0
+    
+    s = 0
+    
+    while s <= n - m:
+        if text[s] == first_char and text[s:s + m] == pattern:
+            found += 1
+            if record:
+                matches.append(s)
+            if found == limit:
+                break
+            if not overlapping:
+                s += m
+                continue
+        if s + m >= n:
+            break
+        s += shift.get(text[s + m], m + 1)
+    
+    return matches if record else found
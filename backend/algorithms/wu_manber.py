@@ -0,0 +1,199 @@
+"""
+Algoritmo Wu–Manber para búsqueda simultánea de múltiples patrones.
+Responsabilidad única: saltar porciones del texto usando una tabla de
+desplazamientos por bloques de B caracteres común a todos los patrones.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from algorithms.result_modes import match_limit, no_matches
+
+
+@dataclass
+class WuManberTables:
+    """Tablas Wu–Manber construidas a partir de una lista de patrones."""
+    patterns: list[str]
+    block_size: int
+    window: int
+    shift: dict[str, int]
+    candidates: dict[str, list[int]]
+    # Patrones no vacíos (los que pueden coincidir)
+    active_count: int
+    
+    @property
+    def pattern_count(self) -> int:
+        """Número de patrones con los que se construyeron las tablas."""
+        return len(self.patterns)
+
+
+def choose_block_size(min_length: int, pattern_count: int) -> int:
+    """
+    Elige el tamaño de bloque B.
+    
+    Con pocos patrones bastan bloques de 2 caracteres; con muchos, bloques
+    de 3 reducen las colisiones en la tabla de desplazamientos. B nunca
+    supera la longitud del patrón más corto.
+    
+    Args:
+        min_length: Longitud del patrón más corto
+        pattern_count: Número de patrones
+    
+    Returns:
+        Tamaño de bloque B (1, 2 o 3)
+    """
+    preferred = 3 if pattern_count > 100 else 2
+    return max(1, min(preferred, min_length))
+
+
+def build_wu_manber_tables(patterns: list[str]) -> WuManberTables:
+    """
+    Construye las tablas SHIFT y HASH de Wu–Manber.
+    
+    Solo se consideran los primeros `window` caracteres de cada patrón
+    (window = longitud del patrón más corto):
+        - shift[bloque]: cuánto puede avanzar la ventana si el bloque
+          aparece al final de ella (0 = posible coincidencia)
+        - candidates[bloque]: patrones cuyo prefijo termina en ese bloque
+    
+    Args:
+        patterns: Lista de patrones (los vacíos se ignoran)
+    
+    Returns:
+        WuManberTables listas para wu_manber_search
+    
+    Complejidad: O(M) donde M = suma de longitudes de los patrones
+    """
+    lengths = [len(p) for p in patterns if p]
+    window = min(lengths) if lengths else 0
+    block_size = choose_block_size(window, len(lengths))
+    
+    shift: dict[str, int] = {}
+    candidates: dict[str, list[int]] = {}
+    
+    for index, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        for q in range(block_size - 1, window):
+            block = pattern[q - block_size + 1:q + 1]
+            distance = window - 1 - q
+            if distance < shift.get(block, window):
+                shift[block] = distance
+        candidates.setdefault(pattern[window - block_size:window], []).append(index)
+    
+    return WuManberTables(
+        patterns=list(patterns),
+        block_size=block_size,
+        window=window,
+        shift=shift,
+        candidates=candidates,
+        active_count=len(lengths),
+    )
+
+
+def wu_manber_search(text: str, tables: WuManberTables, mode: str = "all",
+                     max_matches: Optional[int] = None,
+                     overlapping: bool = True) -> Union[dict[int, list[int]], dict[int, int]]:
+    """
+    Busca todas las ocurrencias de todos los patrones con Wu–Manber.
+    
+    El resultado es disperso, igual que en aho_corasick_search.
+    
+    Args:
+        text: Texto en el que buscar
+        tables: Tablas construidas con build_wu_manber_tables
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar por patrón (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento de
+            cada patrón consigo mismo, de izquierda a derecha
+    
+    Returns:
+        Diccionario {índice de patrón: posiciones} solo con los patrones
+        encontrados (posiciones de inicio en orden ascendente, incluyendo
+        solapamientos), o {índice de patrón: cantidad} en modo "count"
+    
+    Complejidad:
+        - Caso típico: O(n * B / window), la mayoría de ventanas se saltan
+        - Peor caso: O(n * M)
+        Con tope, termina cuando todos los patrones lo alcanzan
+    """
+    limit = match_limit(mode, max_matches)
+    record = mode != "count"
+    matches: dict[int, list[int]] = {}
+    found: dict[int, int] = {}
+    window = tables.window
+    n = len(text)
+    
+    if not window or n < window:
+        return matches if record else found
+    
+    patterns = tables.patterns
+    shift = tables.shift
+    candidates = tables.candidates
+    block_size = tables.block_size
+    default_shift = window - block_size + 1
+    
+    # Patrones que aún no alcanzaron el tope
+    pending = tables.active_count
+    # Sin solapamiento: primera posición de inicio admitida por patrón
+    next_free: Optional[dict[int, int]] = None if overlapping else {}
+    # pos es el índice del último carácter de la ventana actual
+    pos = window - 1
+    
+    while pos < n:
+        block = text[pos - block_size + 1:pos + 1]
+        distance = shift.get(block, default_shift)
+        
+        if distance:
+            pos += distance
+            continue
+        
+        start = pos - window + 1
+        for index in candidates[block]:
+            count = found.get(index, 0)
+            if count != limit and text.startswith(patterns[index], start):
+                if next_free is not None:
+                    if start < next_free.get(index, 0):
+                        continue
+                    next_free[index] = start + len(patterns[index])
+                found[index] = count + 1
+                if record:
+                    if count:
+                        matches[index].append(start)
+                    else:
+                        matches[index] = [start]
+                if count + 1 == limit:
+                    pending -= 1
+        if not pending:
+            break
+        pos += 1
+    
+    return matches if record else found
+
+
+def wu_manber_search_single(text: str, pattern: str, mode: str = "all",
+                            max_matches: Optional[int] = None,
+                            overlapping: bool = True) -> Union[list[int], int]:
+    """
+    Busca un único patrón con Wu–Manber.
+    (Misma interfaz que kmp_search y boyer_moore_search)
+    
+    Args:
+        text: Texto en el que buscar
+        pattern: Patrón a buscar
+        mode: "all", "first" o "count" (ver algorithms.result_modes)
+        max_matches: Tope de coincidencias a reportar (None = sin tope)
+        overlapping: Si es False, solo coincidencias sin solapamiento, de
+            izquierda a derecha: tras cada una la búsqueda sigue m posiciones después
+    
+    Returns:
+        Lista de posiciones donde se encuentra el patrón, o su cantidad
+        en modo "count"
+    """
+    if not pattern or not text:
+        match_limit(mode, max_matches)
+        return no_matches(mode)
+    
+    return wu_manber_search(
+        text, build_wu_manber_tables([pattern]), mode, max_matches, overlapping
+    ).get(0, no_matches(mode))
@@ -3,14 +3,33 @@ API web para detección de reclamos.
 Usa FastAPI para servir endpoints de análisis de patrones.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from array import array
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, List
+import asyncio
 import os
 import json
+import time
 
-from services.detector import create_detector
-from preprocessing.normalize import normalize_text
+from services.detector import (
+    create_detector,
+    validate_fields,
+    ComplaintDetector,
+    ALGORITHMS,
+    COMPACT_FIELDS,
+    EXACT_ALGORITHMS,
+    DEFAULT_ALGORITHM,
+    DEFAULT_TRIAGE_ALGORITHM,
+    MATCH_MODES,
+    TRIAGE_ALGORITHMS,
+)
+from services.executor import DEFAULT_BACKEND, DetectionExecutor
+from preprocessing.normalize import normalization_cache
+from services.metrics import MetricsRegistry
 
 
 # ==================== MODELOS PYDANTIC ====================
@@ -18,12 +37,18 @@ from preprocessing.normalize import normalize_text
 class AnalyzeRequest(BaseModel):
     """Modelo de solicitud de análisis."""
     text: str = Field(..., min_length=1, max_length=5000, description="Texto a analizar")
-    algorithm: str = Field(default="kmp", description="Algoritmo: 'kmp' o 'boyer_moore'")
+    algorithm: str = Field(default=DEFAULT_ALGORITHM, description=f"Algoritmo: {', '.join(ALGORITHMS)}")
+    mode: str = Field(default="all", description=f"Resultado por patrón: {', '.join(MATCH_MODES)}")
+    max_matches: Optional[int] = Field(default=None, ge=1, description="Tope de posiciones por patrón")
+    overlapping: bool = Field(default=True, description="False = coincidencias sin solapamiento")
+    fields: Optional[str] = Field(default=None, description="Campos de cada detección, separados por comas")
+    compact: bool = Field(default=False, description="Solo pattern_index, alert_level y match_count")
     
     class Config:
         example = {
             "text": "Producto con defecto, no funciona",
-            "algorithm": "kmp"
+            "algorithm": "aho_corasick",
+            "mode": "all"
         }
 
 
@@ -36,6 +61,8 @@ class DetectionInfo(BaseModel):
     positions: List[int]
     found: bool
     match_count: int
+    edit_distances: Optional[List[int]] = None
+    spans: Optional[List[List[int]]] = None
 
 
 class AnalyzeResponse(BaseModel):
@@ -67,6 +94,38 @@ class AnalyzeResponse(BaseModel):
         }
 
 
+class TriageRequest(BaseModel):
+    """Modelo de solicitud de triage."""
+    text: str = Field(..., min_length=1, max_length=5000, description="Texto a clasificar")
+    algorithm: str = Field(default=DEFAULT_TRIAGE_ALGORITHM,
+                           description=f"Estrategia: {', '.join(TRIAGE_ALGORITHMS)}")
+    
+    class Config:
+        example = {
+            "text": "El pedido no llegó y la caja estaba rota",
+            "algorithm": "substring"
+        }
+
+
+class TriageResponse(BaseModel):
+    """Modelo de respuesta de triage (sin posiciones)."""
+    has_complaints: bool
+    max_alert_level: Optional[str] = None
+    pattern: Optional[str] = None
+    category: Optional[str] = None
+    alert_message: Optional[str] = None
+    algorithm: str
+    patterns_checked: int
+    total_patterns: int
+    execution_time_ms: float
+
+
+class InstrumentationRequest(BaseModel):
+    """Modelo para activar/desactivar la instrumentación."""
+    enabled: bool = Field(..., description="Activar la medición por etapa y por patrón")
+    reset: bool = Field(default=False, description="Descartar los histogramas acumulados")
+
+
 class HealthResponse(BaseModel):
     """Modelo de respuesta de salud."""
     status: str
@@ -75,12 +134,32 @@ class HealthResponse(BaseModel):
     patterns_loaded: int
 
 
+ALGORITHMS_ERROR = f"Algoritmo debe ser uno de: {', '.join(ALGORITHMS)}"
+MODES_ERROR = f"Modo debe ser uno de: {', '.join(MATCH_MODES)}"
+
+# Formatos de /analyze/batch: un resultado por texto o columnas paralelas
+BATCH_FORMATS = ("rows", "columnar")
+
+# /analyze/stream: mensajes por tarea del pool y tope de bytes por línea
+STREAM_BATCH_SIZE = 256
+STREAM_MAX_LINE_BYTES = 64 * 1024
+
+
 # ==================== INSTANCIA FASTAPI ====================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Detiene el pool de detección al apagar el servidor."""
+    yield
+    if executor:
+        executor.shutdown(wait=False)
+
+
 app = FastAPI(
     title="API de Detección de Reclamos",
-    description="API para detectar patrones de reclamos usando KMP y Boyer-Moore",
+    description="API para detectar patrones de reclamos usando Aho-Corasick, KMP y Boyer-Moore",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configurar CORS para permitir peticiones del frontend
@@ -103,6 +182,150 @@ except Exception as e:
     detector = None
     PATTERNS_COUNT = 0
 
+# Las detecciones corren en un pool dedicado (procesos por defecto), no en
+# el threadpool de Starlette: DETECTION_BACKEND=process|thread,
+# DETECTION_WORKERS=n (default: núcleos disponibles)
+executor = DetectionExecutor(
+    detector,
+    backend=os.environ.get("DETECTION_BACKEND", DEFAULT_BACKEND),
+    workers=int(os.environ["DETECTION_WORKERS"]) if os.environ.get("DETECTION_WORKERS") else None,
+) if detector else None
+
+
+# ==================== MÉTRICAS ====================
+
+metrics = MetricsRegistry()
+metrics.counter("complaint_api_requests_total", "Solicitudes HTTP por endpoint, método y estado")
+metrics.histogram("complaint_api_request_duration_seconds", "Latencia HTTP por endpoint y método")
+metrics.counter("complaint_detection_requests_total", "Análisis por endpoint y algoritmo")
+metrics.histogram("complaint_detection_duration_seconds",
+                  "Tiempo de detect_all por endpoint y algoritmo")
+metrics.histogram("complaint_text_length_chars", "Longitud de los textos analizados",
+                  buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000))
+metrics.histogram("complaint_batch_size", "Textos por solicitud de /analyze/batch",
+                  buckets=(1, 2, 5, 10, 25, 50, 100))
+metrics.counter("complaint_detections_total", "Patrones detectados por nivel de alerta y categoría")
+metrics.counter("complaint_triage_total", "Resultados de /triage por estrategia y nivel de alerta máximo")
+
+
+def _collect_state() -> list:
+    """Métricas calculadas al leer /metrics: cachés y patrones cargados."""
+    caches = {"normalization": normalization_cache.stats()}
+    if detector:
+        caches["results"] = detector.result_cache.stats()
+    
+    samples = [
+        ("complaint_cache_hits_total", "counter", "Aciertos por caché",
+         [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("complaint_cache_misses_total", "counter", "Fallos por caché",
+         [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("complaint_cache_hit_ratio", "gauge", "Tasa de aciertos por caché",
+         [({"cache": name}, stats["hit_rate"]) for name, stats in caches.items()]),
+        ("complaint_cache_entries", "gauge", "Entradas por caché",
+         [({"cache": name}, stats["size"]) for name, stats in caches.items()]),
+    ]
+    if detector:
+        samples += [
+            ("complaint_patterns_loaded", "gauge", "Patrones cargados",
+             [({}, len(detector.patterns))]),
+            ("complaint_patterns_version", "gauge", "Versión del conjunto de patrones",
+             [({}, detector.version)]),
+        ]
+    return samples
+
+
+metrics.add_collector(_collect_state)
+
+
+# Campos de detección que usan las métricas
+METRIC_FIELDS = ("alert_level", "category")
+
+
+def _fields_option(fields: Optional[str], compact: bool) -> Optional[tuple[str, ...]]:
+    """
+    Campos pedidos para la respuesta compacta (compact = COMPACT_FIELDS),
+    o None para la respuesta completa. HTTP 400 si algún campo no existe.
+    """
+    if fields is None and not compact:
+        return None
+    try:
+        return validate_fields(fields) if fields is not None else COMPACT_FIELDS
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _search_fields(fields: Optional[tuple[str, ...]]) -> tuple[Optional[tuple[str, ...]], tuple[str, ...]]:
+    """
+    Campos a pedir a detect_all: los solicitados más los de METRIC_FIELDS
+    que falten, que _record_analysis quita después de registrarlos.
+    
+    Returns:
+        Tupla (campos para detect_all, campos a quitar)
+    """
+    if fields is None:
+        return None, ()
+    extra = tuple(f for f in METRIC_FIELDS if f not in fields)
+    return fields + extra, extra
+
+
+def _record_analysis(endpoint: str, analysis: dict, text: str,
+                     strip: tuple[str, ...] = ()) -> None:
+    """
+    Registra en las métricas un resultado de detect_all.
+    
+    Args:
+        endpoint: Ruta que lo produjo
+        analysis: Resultado de detect_all
+        text: Texto analizado
+        strip: Campos de cada detección a quitar después de registrarla
+    """
+    algorithm = analysis["algorithm"]
+    labels = {"endpoint": endpoint, "algorithm": algorithm}
+    metrics.inc("complaint_detection_requests_total", labels)
+    metrics.observe("complaint_detection_duration_seconds",
+                    analysis["performance"]["total_execution_time_ms"] / 1000, labels)
+    metrics.observe("complaint_text_length_chars", len(text))
+    for detection in analysis["detections"]:
+        metrics.inc("complaint_detections_total", {
+            "alert_level": detection["alert_level"],
+            "category": detection["category"],
+        })
+        for name in strip:
+            del detection[name]
+
+
+def _record_columnar(endpoint: str, columns: dict, texts: List[str]) -> None:
+    """Registra en las métricas un resultado de detect_columnar."""
+    metrics.inc("complaint_detection_requests_total",
+                {"endpoint": endpoint, "algorithm": columns["algorithm"]}, len(texts))
+    for text in texts:
+        metrics.observe("complaint_text_length_chars", len(text))
+    for pattern, hits in zip(columns["patterns"], columns["pattern_hits"]):
+        if hits:
+            metrics.inc("complaint_detections_total", {
+                "alert_level": pattern["alert_level"],
+                "category": pattern["category"],
+            }, hits)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Cuenta y mide cada solicitud HTTP por ruta (plantilla, no URL concreta)."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else "unmatched"
+    metrics.inc("complaint_api_requests_total", {
+        "endpoint": endpoint,
+        "method": request.method,
+        "status": str(response.status_code),
+    })
+    metrics.observe("complaint_api_request_duration_seconds", elapsed,
+                    {"endpoint": endpoint, "method": request.method})
+    return response
+
 
 # ==================== ENDPOINTS ====================
 
@@ -115,6 +338,8 @@ def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze",
+            "triage": "/triage",
+            "stream": "/analyze/stream",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -133,12 +358,20 @@ def health():
 
 
 @app.post("/analyze", response_model=AnalyzeResponse, tags=["Analysis"])
-def analyze(request: AnalyzeRequest):
+async def analyze(request: AnalyzeRequest):
     """
     Analiza texto en busca de patrones de reclamos.
     
     - **text**: Texto a analizar (máximo 5000 caracteres)
-    - **algorithm**: Algoritmo de búsqueda ("kmp" o "boyer_moore")
+    - **algorithm**: Algoritmo de búsqueda ("aho_corasick", "kmp", "boyer_moore", ...)
+    - **mode**: "all" (todas las posiciones), "first" (solo la primera) o
+      "count" (solo match_count, sin posiciones)
+    - **max_matches**: Tope de posiciones por patrón
+    - **overlapping**: False para coincidencias sin solapamiento de cada
+      patrón (de izquierda a derecha), útil para resaltar y contar
+    - **fields**: Campos de cada detección, separados por comas (p.ej.
+      "pattern_index,match_count"); omite original_text y normalized_text
+    - **compact**: Igual a fields="pattern_index,alert_level,match_count"
     
     Retorna estructura con detecciones, tiempos y análisis.
     """
@@ -149,17 +382,35 @@ def analyze(request: AnalyzeRequest):
         )
     
     # Validar algoritmo
-    if request.algorithm not in ["kmp", "boyer_moore"]:
+    if request.algorithm not in ALGORITHMS:
         raise HTTPException(
             status_code=400,
-            detail="Algoritmo debe ser 'kmp' o 'boyer_moore'"
+            detail=ALGORITHMS_ERROR
         )
     
+    if request.mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=MODES_ERROR)
+    
+    fields = _fields_option(request.fields, request.compact)
+    search_fields, strip = _search_fields(fields)
+    
     try:
-        # Realizar análisis
-        analysis = detector.detect_all(request.text, algorithm=request.algorithm)
+        # Realizar análisis en el pool de detección (una sola normalización)
+        analysis = await executor.run(
+            ComplaintDetector.detect_all, request.text, algorithm=request.algorithm,
+            mode=request.mode, max_matches=request.max_matches,
+            overlapping=request.overlapping, fields=search_fields
+        )
+        _record_analysis("/analyze", analysis, request.text, strip)
+        
+        if fields is not None:
+            # detect_all ya construyó dicts serializables: sin AnalyzeResponse
+            return JSONResponse(analysis)
         
         # Convertir a modelo de respuesta
+        timed = detector.instrumentation.enabled
+        if timed:
+            start = time.perf_counter()
         response = AnalyzeResponse(
             original_text=analysis["original_text"],
             normalized_text=analysis["normalized_text"],
@@ -171,6 +422,10 @@ def analyze(request: AnalyzeRequest):
             alert_levels=analysis["alert_levels"],
             performance=analysis["performance"]
         )
+        if timed:
+            detector.instrumentation.record_stage(
+                "response_model", (time.perf_counter() - start) * 1000
+            )
         
         return response
     
@@ -181,11 +436,55 @@ def analyze(request: AnalyzeRequest):
         )
 
 
+@app.post("/triage", response_model=TriageResponse, tags=["Analysis"])
+async def triage(request: TriageRequest):
+    """
+    Clasifica un texto para enrutamiento: solo indica si hay reclamos y el
+    nivel de alerta más alto, deteniéndose en la primera coincidencia
+    `high` y sin calcular posiciones.
+    
+    - **text**: Texto a clasificar (máximo 5000 caracteres)
+    - **algorithm**: Estrategia ("substring", "aho_corasick", "myers")
+    """
+    if not detector:
+        raise HTTPException(status_code=503, detail="Detector not available")
+    
+    if request.algorithm not in TRIAGE_ALGORITHMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Algoritmo de triage debe ser uno de: {', '.join(TRIAGE_ALGORITHMS)}"
+        )
+    
+    try:
+        result = await executor.run(ComplaintDetector.triage, request.text,
+                                    algorithm=request.algorithm)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error durante triage: {str(e)}")
+    
+    metrics.inc("complaint_triage_total", {
+        "algorithm": request.algorithm,
+        "alert_level": result["max_alert_level"] or "none",
+    })
+    return result
+
+
 @app.post("/analyze/batch", tags=["Analysis"])
-def analyze_batch(texts: List[str], algorithm: str = "kmp"):
+async def analyze_batch(texts: List[str], algorithm: str = DEFAULT_ALGORITHM,
+                        mode: str = "all", max_matches: Optional[int] = None,
+                        overlapping: bool = True, fields: Optional[str] = None,
+                        compact: bool = False,
+                        output_format: str = Query(default="rows", alias="format")):
     """
     Analiza múltiples textos en una solicitud.
     
+    `mode`, `max_matches`, `overlapping`, `fields` y `compact` funcionan
+    igual que en /analyze.
+    
+    Con `format=columnar` retorna arreglos paralelos `message_index`,
+    `pattern_index` y `position` (una entrada por coincidencia, o
+    `match_count` por texto y patrón en mode="count") más el diccionario
+    `patterns`, en lugar de un resultado por texto.
+    
     Retorna lista de análisis con resultados y tiempos.
     """
     if not detector:
@@ -206,17 +505,69 @@ def analyze_batch(texts: List[str], algorithm: str = "kmp"):
             detail="Máximo 100 textos por solicitud"
         )
     
+    if algorithm not in ALGORITHMS:
+        raise HTTPException(
+            status_code=400,
+            detail=ALGORITHMS_ERROR
+        )
+    
+    if mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=MODES_ERROR)
+    
+    if max_matches is not None and max_matches < 1:
+        raise HTTPException(status_code=400, detail="max_matches debe ser al menos 1")
+    
+    if output_format not in BATCH_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato debe ser uno de: {', '.join(BATCH_FORMATS)}"
+        )
+    
+    fields = _fields_option(fields, compact)
+    if output_format == "columnar" and fields is not None:
+        raise HTTPException(status_code=400, detail="fields y compact no aplican a format=columnar")
+    search_fields, strip = _search_fields(fields)
+    metrics.observe("complaint_batch_size", len(texts))
+    
+    if output_format == "columnar":
+        try:
+            columns = await executor.run(
+                ComplaintDetector.detect_many, texts, workers=1, algorithm=algorithm,
+                mode=mode, max_matches=max_matches, overlapping=overlapping,
+                columnar=True
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error durante análisis batch: {str(e)}")
+        _record_columnar("/analyze/batch", columns, texts)
+        return JSONResponse({
+            key: value.tolist() if isinstance(value, array) else value
+            for key, value in columns.items()
+        })
+    
     try:
-        results = []
-        for text in texts:
-            analysis = detector.detect_all(text, algorithm=algorithm)
-            results.append(analysis)
+        # Todo el lote es una sola tarea del pool, en serie dentro del worker
+        results = await executor.run(
+            ComplaintDetector.detect_many, texts, workers=1, algorithm=algorithm,
+            mode=mode, max_matches=max_matches, overlapping=overlapping,
+            fields=search_fields
+        )
+        for text, analysis in zip(texts, results):
+            _record_analysis("/analyze/batch", analysis, text, strip)
         
-        return {
+        hits = sum(1 for r in results if r["performance"]["cache_hit"])
+        
+        response = {
             "total_analyzed": len(results),
             "algorithm": algorithm,
-            "results": results
+            "results": results,
+            "cache": {
+                "hits": hits,
+                "misses": len(results) - hits,
+                "hit_rate": round(hits / len(results), 4)
+            }
         }
+        # Con fields, sin pasar por jsonable_encoder
+        return JSONResponse(response) if fields is not None else response
     
     except Exception as e:
         raise HTTPException(
@@ -225,10 +576,215 @@ def analyze_batch(texts: List[str], algorithm: str = "kmp"):
         )
 
 
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que no lee `receive` mientras responde: el generador
+    sigue leyendo el cuerpo de la solicitud (una desconexión llega como
+    ClientDisconnect al leerlo).
+    """
+    
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_stream_line(line: bytes) -> tuple[object, str]:
+    """
+    Interpreta una línea NDJSON de /analyze/stream: un string JSON o un
+    objeto {"text": ..., "id": ...} (id opcional, se devuelve tal cual).
+    
+    Returns:
+        Tupla (id, texto)
+    
+    Raises:
+        ValueError: Si la línea no es JSON válido o el texto no es válido
+    """
+    message = json.loads(line)
+    message_id = None
+    if isinstance(message, dict):
+        message_id = message.get("id")
+        message = message.get("text")
+    if not isinstance(message, str):
+        raise ValueError("Cada línea debe ser un string JSON o un objeto con 'text'")
+    if not 1 <= len(message) <= 5000:
+        raise ValueError("El texto debe tener entre 1 y 5000 caracteres")
+    return message_id, message
+
+
+async def _stream_batches(request: Request) -> AsyncIterator[list[dict]]:
+    """
+    Lee el cuerpo NDJSON a medida que llega y agrupa los mensajes en lotes.
+    
+    Un lote se entrega al llenarse (STREAM_BATCH_SIZE) o al agotarse el
+    fragmento recibido, así el primer resultado no espera al resto del
+    cuerpo. Solo se retiene en memoria la línea incompleta (hasta
+    STREAM_MAX_LINE_BYTES; una línea más larga se reporta como error).
+    
+    Yields:
+        Listas de entradas {"index", "id", "text"} o {"index", "id", "error"}
+    """
+    pending = b""
+    skipping = False
+    batch = []
+    index = 0
+    
+    def add(line: bytes) -> None:
+        nonlocal index
+        entry = {"index": index, "id": None}
+        if len(line) > STREAM_MAX_LINE_BYTES:
+            entry["error"] = f"Línea de más de {STREAM_MAX_LINE_BYTES} bytes"
+        else:
+            try:
+                entry["id"], entry["text"] = _parse_stream_line(line)
+            except ValueError as e:
+                entry["error"] = str(e)
+        batch.append(entry)
+        index += 1
+    
+    async for chunk in request.stream():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        if skipping and lines:
+            # Fin de una línea demasiado larga: se descarta
+            lines.pop(0)
+            skipping = False
+        
+        for line in lines:
+            if line.strip():
+                add(line)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield batch
+                batch = []
+        
+        if len(pending) > STREAM_MAX_LINE_BYTES or skipping:
+            if not skipping:
+                add(pending)
+            pending = b""
+            skipping = True
+        
+        if batch:
+            yield batch
+            batch = []
+    
+    if pending.strip() and not skipping:
+        add(pending)
+        yield batch
+
+
+async def _analyze_stream_batch(batch: list[dict], options: dict,
+                                strip: tuple[str, ...]) -> bytes:
+    """
+    Analiza un lote de /analyze/stream en el pool y lo codifica como NDJSON,
+    sin repetir original_text ni normalized_text.
+    """
+    texts = [entry["text"] for entry in batch if "text" in entry]
+    analyses = iter(await executor.run(
+        ComplaintDetector.detect_many, texts, workers=1, **options
+    )) if texts else iter(())
+    
+    lines = []
+    for entry in batch:
+        result = {"index": entry["index"]}
+        if entry["id"] is not None:
+            result["id"] = entry["id"]
+        if "error" in entry:
+            result["error"] = entry["error"]
+        else:
+            analysis = next(analyses)
+            _record_analysis("/analyze/stream", analysis, entry["text"], strip)
+            analysis.pop("original_text", None)
+            analysis.pop("normalized_text", None)
+            result.update(analysis)
+        lines.append(json.dumps(result, ensure_ascii=False))
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+async def _stream_results(request: Request, options: dict,
+                          strip: tuple[str, ...]) -> AsyncIterator[bytes]:
+    """
+    Resultados NDJSON de /analyze/stream en el orden de entrada. Mantiene a
+    lo sumo executor.workers + 1 lotes en análisis: la memoria queda acotada
+    sin importar el tamaño del cuerpo.
+    
+    Espera a la vez el lote más antiguo en análisis y la lectura del
+    siguiente, así cada resultado sale apenas está listo aunque el cliente
+    todavía no haya enviado más cuerpo.
+    """
+    batches = _stream_batches(request)
+    in_flight = deque()
+    reading = None
+    exhausted = False
+    try:
+        while not exhausted or in_flight:
+            if reading is None and not exhausted and len(in_flight) <= executor.workers:
+                reading = asyncio.ensure_future(anext(batches, None))
+            waiting = [task for task in (reading, in_flight[0] if in_flight else None)
+                       if task is not None]
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            
+            while in_flight and in_flight[0].done():
+                yield in_flight.popleft().result()
+            
+            if reading is not None and reading.done():
+                batch, reading = reading.result(), None
+                if batch is None:
+                    exhausted = True
+                else:
+                    in_flight.append(asyncio.ensure_future(_analyze_stream_batch(batch, options, strip)))
+    finally:
+        if reading is not None:
+            reading.cancel()
+        for task in in_flight:
+            task.cancel()
+
+
+@app.post("/analyze/stream", tags=["Analysis"])
+async def analyze_stream(request: Request, algorithm: str = DEFAULT_ALGORITHM,
+                         mode: str = "all", max_matches: Optional[int] = None,
+                         overlapping: bool = True, fields: Optional[str] = None,
+                         compact: bool = False):
+    """
+    Analiza mensajes NDJSON (uno por línea: un string JSON o
+    {"text": ..., "id": ...}) leyendo el cuerpo a medida que llega, y
+    responde NDJSON con un resultado por mensaje, en orden, apenas está
+    listo. Sin límite de mensajes.
+    
+    Cada línea de respuesta trae `index` (posición del mensaje), `id` si se
+    indicó y el resultado de /analyze sin `original_text` ni
+    `normalized_text`, o `error` si la línea no es válida.
+    
+    `algorithm`, `mode`, `max_matches`, `overlapping`, `fields` y `compact`
+    funcionan igual que en /analyze.
+    """
+    if not detector:
+        raise HTTPException(status_code=503, detail="Detector not available")
+    
+    if algorithm not in ALGORITHMS:
+        raise HTTPException(status_code=400, detail=ALGORITHMS_ERROR)
+    
+    if mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=MODES_ERROR)
+    
+    if max_matches is not None and max_matches < 1:
+        raise HTTPException(status_code=400, detail="max_matches debe ser al menos 1")
+    
+    search_fields, strip = _search_fields(_fields_option(fields, compact))
+    options = {
+        "algorithm": algorithm, "mode": mode,
+        "max_matches": max_matches, "overlapping": overlapping,
+        "fields": search_fields,
+    }
+    return DuplexStreamingResponse(_stream_results(request, options, strip),
+                                   media_type="application/x-ndjson")
+
+
 @app.get("/patterns", tags=["Info"])
 def get_patterns():
     """
-    Retorna lista de patrones cargados.
+    Retorna lista de patrones cargados, en el orden al que se refiere
+    `pattern_index` de las respuestas compactas (ver patterns_version).
     """
     if not detector:
         raise HTTPException(
@@ -236,23 +792,106 @@ def get_patterns():
             detail="Detector not available"
         )
     
+    snapshot_patterns, version = detector.patterns, detector.version
     return {
-        "total_patterns": len(detector.patterns),
+        "total_patterns": len(snapshot_patterns),
+        "patterns_version": version,
         "patterns": [
             {
                 "pattern": p["pattern"],
                 "category": p["category"],
-                "alert_level": p["alert_level"]
+                "alert_level": p["alert_level"],
+                "max_errors": p.get("max_errors", 0)
             }
-            for p in detector.patterns
+            for p in snapshot_patterns
         ]
     }
 
 
+@app.get("/patterns/stats", tags=["Info"])
+def get_pattern_stats(reset: bool = False):
+    """
+    Retorna, por patrón, cuántos textos se analizaron, en cuántos apareció
+    (hit_rate), coincidencias totales y costo medio de búsqueda (µs, por
+    muestreo), en el orden que usa el modo triage.
+    
+    - **reset**: Descartar las estadísticas después de leerlas
+    """
+    if not detector:
+        raise HTTPException(status_code=503, detail="Detector not available")
+    
+    stats = detector.pattern_stats
+    result = {
+        "scans": stats.scans,
+        "patterns_version": detector.version,
+        "patterns": stats.snapshot(detector.patterns)
+    }
+    if reset:
+        stats.reset()
+    return result
+
+
+@app.get("/cache/stats", tags=["Info"])
+def get_cache_stats():
+    """
+    Retorna estadísticas de las cachés de normalización y de resultados
+    (tamaño, aciertos, fallos y tasas).
+    """
+    return {
+        "normalization": normalization_cache.stats(),
+        "results": detector.result_cache.stats() if detector else None,
+        "patterns_version": detector.version if detector else None,
+        "executor": executor.stats() if executor else None
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Info"])
+def get_metrics():
+    """
+    Métricas en formato de texto de Prometheus: solicitudes y latencias
+    por endpoint y algoritmo, longitud de textos, tamaño de lotes,
+    detecciones por nivel y categoría, cachés y versión de patrones.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/instrumentation", tags=["Info"])
+def get_instrumentation():
+    """
+    Retorna los histogramas de tiempo (ms) por etapa (normalize, search,
+    build_results, serialize, response_model) y por patrón.
+    """
+    if not detector:
+        raise HTTPException(status_code=503, detail="Detector not available")
+    
+    return detector.instrumentation.snapshot()
+
+
+@app.post("/instrumentation", tags=["Info"])
+def set_instrumentation(request: InstrumentationRequest):
+    """
+    Activa o desactiva la instrumentación y opcionalmente reinicia los
+    histogramas. Desactivada, las búsquedas no miden nada.
+    """
+    if not detector:
+        raise HTTPException(status_code=503, detail="Detector not available")
+    
+    detector.instrumentation.enabled = request.enabled
+    if request.reset:
+        detector.instrumentation.reset()
+    
+    return {"success": True, "enabled": detector.instrumentation.enabled}
+
+
 @app.post("/compare", tags=["Analysis"])
-def compare_algorithms(request: AnalyzeRequest):
+async def compare_algorithms(request: AnalyzeRequest):
     """
-    Compara resultado y tiempo de ejecución entre KMP y Boyer-Moore.
+    Compara resultado y tiempo de ejecución entre todos los algoritmos
+    disponibles (Aho-Corasick, KMP, Boyer-Moore, ...).
+    
+    "faster" y "difference_ms" solo comparan los algoritmos exactos: la
+    búsqueda aproximada (myers) puede encontrar otras coincidencias, así
+    que su tiempo se informa aparte, en fuzzy_execution_times_ms.
     """
     if not detector:
         raise HTTPException(
@@ -261,30 +900,32 @@ def compare_algorithms(request: AnalyzeRequest):
         )
     
     try:
-        analysis_kmp = detector.detect_all(request.text, algorithm="kmp")
-        analysis_bm = detector.detect_all(request.text, algorithm="boyer_moore")
+        response = {"original_text": request.text}
+        times = {}
         
-        return {
-            "original_text": request.text,
-            "kmp": {
-                "patterns_found": analysis_kmp["patterns_found"],
-                "execution_time_ms": analysis_kmp["performance"]["total_execution_time_ms"],
-                "detections": analysis_kmp["detections"]
-            },
-            "boyer_moore": {
-                "patterns_found": analysis_bm["patterns_found"],
-                "execution_time_ms": analysis_bm["performance"]["total_execution_time_ms"],
-                "detections": analysis_bm["detections"]
-            },
-            "comparison": {
-                "faster": "kmp" if analysis_kmp["performance"]["total_execution_time_ms"] < 
-                         analysis_bm["performance"]["total_execution_time_ms"] else "boyer_moore",
-                "difference_ms": abs(
-                    analysis_kmp["performance"]["total_execution_time_ms"] -
-                    analysis_bm["performance"]["total_execution_time_ms"]
-                )
+        # Todos los algoritmos comparten la misma normalización; sin caché
+        # de resultados para medir el escaneo real de cada algoritmo
+        analyses = await executor.run(ComplaintDetector.compare, request.text)
+        
+        for algorithm, analysis in analyses.items():
+            _record_analysis("/compare", analysis, request.text)
+            times[algorithm] = analysis["performance"]["total_execution_time_ms"]
+            response[algorithm] = {
+                "patterns_found": analysis["patterns_found"],
+                "execution_time_ms": times[algorithm],
+                "detections": analysis["detections"]
             }
+        
+        exact_times = {a: t for a, t in times.items() if a in EXACT_ALGORITHMS}
+        faster = min(exact_times, key=exact_times.get)
+        response["comparison"] = {
+            "faster": faster,
+            "difference_ms": max(exact_times.values()) - exact_times[faster],
+            "execution_times_ms": exact_times,
+            "fuzzy_execution_times_ms": {a: t for a, t in times.items() if a not in exact_times},
         }
+        
+        return response
     
     except Exception as e:
         raise HTTPException(
@@ -301,6 +942,10 @@ class PatternRequest(BaseModel):
     category: str = Field(..., min_length=1, max_length=50, description="Categoría del patrón")
     alert_level: str = Field(default="medium", description="Nivel: 'high', 'medium', 'low'")
     alert_message: str = Field(default="", max_length=200, description="Mensaje de alerta")
+    max_errors: Optional[int] = Field(
+        default=None, ge=0, le=3,
+        description="Errores de edición permitidos con algoritmo 'myers' (vacío = 0 al crear, sin cambios al actualizar)"
+    )
 
 
 @app.post("/patterns", tags=["Patterns"])
@@ -319,10 +964,13 @@ def create_pattern(request: PatternRequest):
             pattern=request.pattern,
             category=request.category,
             alert_level=request.alert_level,
-            alert_message=request.alert_message or f"Patrón '{request.pattern}' detectado"
+            alert_message=request.alert_message or f"Patrón '{request.pattern}' detectado",
+            max_errors=request.max_errors or 0
         )
         detector.save_patterns()
         return {"success": True, "pattern": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al crear patrón: {str(e)}")
 
@@ -344,12 +992,15 @@ def update_pattern(index: int, request: PatternRequest):
             pattern=request.pattern,
             category=request.category,
             alert_level=request.alert_level,
-            alert_message=request.alert_message or f"Patrón '{request.pattern}' detectado"
+            alert_message=request.alert_message or f"Patrón '{request.pattern}' detectado",
+            max_errors=request.max_errors
         )
         detector.save_patterns()
         return {"success": True, "pattern": result}
     except IndexError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al actualizar patrón: {str(e)}")
 
@@ -408,7 +1059,7 @@ def reload_patterns():
 _setup_config = {
     "text_name": "",
     "pattern_group": "Claims",
-    "algorithm": "kmp"
+    "algorithm": DEFAULT_ALGORITHM
 }
 
 
@@ -416,7 +1067,7 @@ class SetupConfigRequest(BaseModel):
     """Modelo de configuración del setup."""
     text_name: str = Field(default="", max_length=100)
     pattern_group: str = Field(default="Claims", description="Grupo: 'Claims', 'Complaints', 'Custom'")
-    algorithm: str = Field(default="kmp", description="Algoritmo: 'kmp' o 'boyer_moore'")
+    algorithm: str = Field(default=DEFAULT_ALGORITHM, description=f"Algoritmo: {', '.join(ALGORITHMS)}")
 
 
 @app.get("/setup/config", tags=["Setup"])
@@ -437,8 +1088,8 @@ def save_setup_config(request: SetupConfigRequest):
     if request.pattern_group not in ["Claims", "Complaints", "Custom"]:
         raise HTTPException(status_code=400, detail="pattern_group debe ser 'Claims', 'Complaints' o 'Custom'")
     
-    if request.algorithm not in ["kmp", "boyer_moore"]:
-        raise HTTPException(status_code=400, detail="algorithm debe ser 'kmp' o 'boyer_moore'")
+    if request.algorithm not in ALGORITHMS:
+        raise HTTPException(status_code=400, detail=ALGORITHMS_ERROR)
     
     _setup_config = {
         "text_name": request.text_name,
@@ -3,13 +3,31 @@ Módulo de medición de rendimiento de algoritmos.
 Responsabilidad única: medir tiempo de ejecución en milisegundos.
 """
 
+import json
 import time
+import tracemalloc
 from dataclasses import dataclass
 from typing import Callable, Any
 
-from preprocessing.normalize import normalize_text
+from preprocessing.normalize import (
+    NormalizedDocument,
+    normalize_text,
+    normalize_text_reference,
+)
 from algorithms.kmp import kmp_search
-from algorithms.boyer_moore import boyer_moore_search
+from algorithms.boyer_moore import boyer_moore_search, boyer_moore_full_search
+from algorithms.horspool import horspool_search
+from algorithms.sunday import sunday_search
+from algorithms.shift_or import shift_or_search
+from algorithms.myers import myers_search
+from services.detector import (
+    COMPACT_FIELDS,
+    COMPILED_SEARCH_FUNCTIONS,
+    FUZZY_SEARCH_FUNCTIONS,
+    MULTI_PATTERN_ALGORITHMS,
+    TRIAGE_ALGORITHMS,
+    compile_pattern,
+)
 
 
 @dataclass
@@ -34,11 +52,14 @@ class AlgorithmBenchmark:
     """Clase para medir rendimiento de algoritmos de búsqueda."""
     
     @staticmethod
-    def measure_kmp(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
+    def _measure(name: str, search_fn: Callable[[str, str], list[int]],
+                 text: str, pattern: str, iterations: int) -> BenchmarkResult:
         """
-        Mide tiempo de ejecución del algoritmo KMP.
+        Mide el tiempo promedio de una función de búsqueda.
         
         Args:
+            name: Nombre del algoritmo a reportar
+            search_fn: Función (text, pattern) -> posiciones
             text: Texto a buscar
             pattern: Patrón a buscar
             iterations: Número de iteraciones para promedio
@@ -51,14 +72,14 @@ class AlgorithmBenchmark:
         
         for _ in range(iterations):
             start = time.perf_counter()
-            matches = kmp_search(text, pattern)
+            matches = search_fn(text, pattern)
             end = time.perf_counter()
             total_time += (end - start)
         
         execution_time_ms = (total_time / iterations) * 1000
         
         return BenchmarkResult(
-            algorithm="KMP",
+            algorithm=name,
             text_length=len(text),
             pattern_length=len(pattern),
             execution_time_ms=execution_time_ms,
@@ -66,6 +87,21 @@ class AlgorithmBenchmark:
             matches=matches
         )
     
+    @staticmethod
+    def measure_kmp(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
+        """
+        Mide tiempo de ejecución del algoritmo KMP.
+        
+        Args:
+            text: Texto a buscar
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            BenchmarkResult con mediciones
+        """
+        return AlgorithmBenchmark._measure("KMP", kmp_search, text, pattern, iterations)
+    
     @staticmethod
     def measure_boyer_moore(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
         """
@@ -79,30 +115,121 @@ class AlgorithmBenchmark:
         Returns:
             BenchmarkResult con mediciones
         """
-        total_time = 0
-        matches = []
+        return AlgorithmBenchmark._measure("Boyer-Moore", boyer_moore_search,
+                                           text, pattern, iterations)
+    
+    @staticmethod
+    def measure_boyer_moore_full(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
+        """
+        Mide tiempo de ejecución de Boyer-Moore completo (good suffix + Galil).
         
-        for _ in range(iterations):
-            start = time.perf_counter()
-            matches = boyer_moore_search(text, pattern)
-            end = time.perf_counter()
-            total_time += (end - start)
+        Args:
+            text: Texto a buscar
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
         
-        execution_time_ms = (total_time / iterations) * 1000
+        Returns:
+            BenchmarkResult con mediciones
+        """
+        return AlgorithmBenchmark._measure("Boyer-Moore (full)", boyer_moore_full_search,
+                                           text, pattern, iterations)
+    
+    @staticmethod
+    def measure_horspool(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
+        """
+        Mide tiempo de ejecución del algoritmo Horspool.
         
-        return BenchmarkResult(
-            algorithm="Boyer-Moore",
-            text_length=len(text),
-            pattern_length=len(pattern),
-            execution_time_ms=execution_time_ms,
-            match_count=len(matches),
-            matches=matches
+        Args:
+            text: Texto a buscar
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            BenchmarkResult con mediciones
+        """
+        return AlgorithmBenchmark._measure("Horspool", horspool_search,
+                                           text, pattern, iterations)
+    
+    @staticmethod
+    def measure_sunday(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
+        """
+        Mide tiempo de ejecución del algoritmo Sunday (Quick Search).
+        
+        Args:
+            text: Texto a buscar
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            BenchmarkResult con mediciones
+        """
+        return AlgorithmBenchmark._measure("Sunday", sunday_search,
+                                           text, pattern, iterations)
+    
+    @staticmethod
+    def measure_shift_or(text: str, pattern: str, iterations: int = 1) -> BenchmarkResult:
+        """
+        Mide tiempo de ejecución del algoritmo Shift-Or (bitap).
+        
+        Args:
+            text: Texto a buscar
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            BenchmarkResult con mediciones
+        """
+        return AlgorithmBenchmark._measure("Shift-Or", shift_or_search,
+                                           text, pattern, iterations)
+    
+    @staticmethod
+    def measure_myers(text: str, pattern: str, iterations: int = 1,
+                      max_errors: int = 1) -> BenchmarkResult:
+        """
+        Mide tiempo de ejecución de la búsqueda aproximada de Myers.
+        
+        Args:
+            text: Texto a buscar
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
+            max_errors: Errores de edición permitidos
+        
+        Returns:
+            BenchmarkResult con mediciones
+        """
+        return AlgorithmBenchmark._measure(
+            f"Myers (k={max_errors})",
+            lambda t, p: myers_search(t, p, max_errors),
+            text, pattern, iterations
         )
     
+    @staticmethod
+    def measures() -> dict[str, Callable[..., BenchmarkResult]]:
+        """
+        Retorna los métodos de medición disponibles por nombre de algoritmo.
+        
+        Returns:
+            Diccionario {nombre: método measure_*}
+        """
+        return {
+            "kmp": AlgorithmBenchmark.measure_kmp,
+            "boyer_moore": AlgorithmBenchmark.measure_boyer_moore,
+            "boyer_moore_full": AlgorithmBenchmark.measure_boyer_moore_full,
+            "horspool": AlgorithmBenchmark.measure_horspool,
+            "sunday": AlgorithmBenchmark.measure_sunday,
+            "shift_or": AlgorithmBenchmark.measure_shift_or,
+            "myers": AlgorithmBenchmark.measure_myers,
+        }
+    
     @staticmethod
     def compare(text: str, pattern: str, iterations: int = 1) -> dict:
         """
-        Compara rendimiento de ambos algoritmos.
+        Compara rendimiento de todos los algoritmos.
+        
+        En "comparison", difference_ms, faster_algorithm y speedup_factor
+        comparan KMP con Boyer-Moore; fastest_overall es el más rápido de los
+        algoritmos exactos (myers, aproximado, no compite: puede reportar
+        otras coincidencias).
         
         Args:
             text: Texto a buscar
@@ -112,8 +239,12 @@ class AlgorithmBenchmark:
         Returns:
             Diccionario con resultados y comparativa
         """
-        kmp_result = AlgorithmBenchmark.measure_kmp(text, pattern, iterations)
-        bm_result = AlgorithmBenchmark.measure_boyer_moore(text, pattern, iterations)
+        results = {
+            name: measure(text, pattern, iterations)
+            for name, measure in AlgorithmBenchmark.measures().items()
+        }
+        kmp_result = results["kmp"]
+        bm_result = results["boyer_moore"]
         
         # Calcular diferencia
         diff_ms = abs(kmp_result.execution_time_ms - bm_result.execution_time_ms)
@@ -123,27 +254,31 @@ class AlgorithmBenchmark:
             speedup = 1.0
         
         faster = "KMP" if kmp_result.execution_time_ms < bm_result.execution_time_ms else "Boyer-Moore"
+        fastest = min((result for name, result in results.items()
+                       if name not in FUZZY_SEARCH_FUNCTIONS),
+                      key=lambda r: r.execution_time_ms)
         
-        return {
-            "kmp": {
-                "time_ms": round(kmp_result.execution_time_ms, 4),
-                "matches": kmp_result.match_count,
-            },
-            "boyer_moore": {
-                "time_ms": round(bm_result.execution_time_ms, 4),
-                "matches": bm_result.match_count,
-            },
-            "comparison": {
-                "difference_ms": round(diff_ms, 4),
-                "faster_algorithm": faster,
-                "speedup_factor": round(speedup, 2),
-            },
-            "test_case": {
-                "text_length": len(text),
-                "pattern_length": len(pattern),
-                "iterations": iterations,
+        comparison = {
+            name: {
+                "time_ms": round(result.execution_time_ms, 4),
+                "matches": result.match_count,
             }
+            for name, result in results.items()
+        }
+        comparison["comparison"] = {
+            "difference_ms": round(diff_ms, 4),
+            "faster_algorithm": faster,
+            "speedup_factor": round(speedup, 2),
+            # Más rápido entre los algoritmos exactos (no solo KMP vs Boyer-Moore)
+            "fastest_overall": fastest.algorithm,
+        }
+        comparison["test_case"] = {
+            "text_length": len(text),
+            "pattern_length": len(pattern),
+            "iterations": iterations,
         }
+        
+        return comparison
     
     @staticmethod
     def benchmark_bulk(test_cases: list[tuple[str, str]], 
@@ -165,19 +300,523 @@ class AlgorithmBenchmark:
             results.append(comparison)
         
         # Calcular promedios
-        kmp_times = [r["kmp"]["time_ms"] for r in results]
-        bm_times = [r["boyer_moore"]["time_ms"] for r in results]
+        summary = {}
+        for name in AlgorithmBenchmark.measures():
+            times = [r[name]["time_ms"] for r in results]
+            summary[f"{name}_avg_ms"] = round(sum(times) / len(times), 4)
+            summary[f"{name}_min_ms"] = round(min(times), 4)
+            summary[f"{name}_max_ms"] = round(max(times), 4)
         
         return {
             "total_cases": len(test_cases),
             "iterations_per_case": iterations,
             "results": results,
-            "summary": {
-                "kmp_avg_ms": round(sum(kmp_times) / len(kmp_times), 4),
-                "boyer_moore_avg_ms": round(sum(bm_times) / len(bm_times), 4),
-                "kmp_min_ms": round(min(kmp_times), 4),
-                "kmp_max_ms": round(max(kmp_times), 4),
-                "boyer_moore_min_ms": round(min(bm_times), 4),
-                "boyer_moore_max_ms": round(max(bm_times), 4),
+            "summary": summary
+        }
+    
+    @staticmethod
+    def benchmark_detector(detector, texts: list[str], algorithms: list[str],
+                           iterations: int = 1) -> dict:
+        """
+        Mide el tiempo de detección completa (todos los patrones cargados)
+        por algoritmo sobre un conjunto de mensajes.
+        
+        Args:
+            detector: Instancia de ComplaintDetector
+            texts: Mensajes a analizar
+            algorithms: Nombres de algoritmo a comparar
+            iterations: Número de iteraciones sobre el conjunto
+        
+        Returns:
+            Diccionario {algoritmo: {total_ms, avg_ms_per_text}} y el más rápido
+        """
+        timings = {}
+        
+        for algorithm in algorithms:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for text in texts:
+                    detector.detect(text, algorithm=algorithm, use_cache=False)
+            total_ms = (time.perf_counter() - start) * 1000 / iterations
+            timings[algorithm] = {
+                "total_ms": round(total_ms, 4),
+                "avg_ms_per_text": round(total_ms / max(len(texts), 1), 4),
+            }
+        
+        return {
+            "texts": len(texts),
+            "iterations": iterations,
+            "results": timings,
+            "fastest": min(timings, key=lambda a: timings[a]["total_ms"]) if timings else None,
+        }
+    
+    @staticmethod
+    def compare_multi_pattern(text: str, patterns: list[str], iterations: int = 1) -> dict:
+        """
+        Compara la búsqueda de un conjunto de patrones patrón por patrón
+        (KMP, Boyer-Moore, ...) contra los motores multi-patrón
+        (Aho-Corasick, Wu-Manber), que recorren el texto una sola vez.
+        
+        Las tablas e índices se construyen fuera de la medición, igual que
+        en ComplaintDetector, para medir solo el escaneo.
+        
+        Args:
+            text: Texto (ya normalizado) a buscar
+            patterns: Patrones (ya normalizados)
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            Diccionario con tiempo y coincidencias por algoritmo y el más rápido
+        """
+        compiled = [compile_pattern(p) for p in patterns]
+        timings = {}
+        
+        for name, search_fn in COMPILED_SEARCH_FUNCTIONS.items():
+            start = time.perf_counter()
+            for _ in range(iterations):
+                positions = [search_fn(text, cp) for cp in compiled]
+            elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+            timings[name] = {
+                "time_ms": round(elapsed_ms, 4),
+                "matches": sum(len(p) for p in positions),
+            }
+        
+        for name, (build_index, search_all) in MULTI_PATTERN_ALGORITHMS.items():
+            index = build_index([cp.normalized for cp in compiled])
+            start = time.perf_counter()
+            for _ in range(iterations):
+                positions = search_all(text, index)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+            timings[name] = {
+                "time_ms": round(elapsed_ms, 4),
+                "matches": sum(len(p) for p in positions.values()),
+            }
+        
+        return {
+            "text_length": len(text),
+            "pattern_count": len(patterns),
+            "min_pattern_length": min((len(p) for p in patterns), default=0),
+            "results": timings,
+            "fastest": min(timings, key=lambda a: timings[a]["time_ms"]),
+        }
+    
+    @staticmethod
+    def measure_scaling(measure_fn: Callable[..., BenchmarkResult],
+                        cases: list[tuple[str, str]],
+                        iterations: int = 1) -> dict:
+        """
+        Mide cómo crece el tiempo de un algoritmo al crecer la entrada.
+        
+        Con un crecimiento lineal en el texto, el tiempo por carácter se
+        mantiene aproximadamente constante entre casos.
+        
+        Args:
+            measure_fn: Uno de los métodos measure_* de esta clase
+            cases: Lista de tuplas (texto, patrón), de menor a mayor
+            iterations: Número de iteraciones por caso
+        
+        Returns:
+            Diccionario con tiempos por caso y tiempo por carácter
+        """
+        results = [measure_fn(text, pattern, iterations) for text, pattern in cases]
+        
+        return {
+            "algorithm": results[0].algorithm if results else "",
+            "cases": [
+                {
+                    "text_length": r.text_length,
+                    "pattern_length": r.pattern_length,
+                    "time_ms": round(r.execution_time_ms, 4),
+                    "us_per_char": round(r.execution_time_ms * 1000 / max(r.text_length, 1), 4),
+                    "matches": r.match_count,
+                }
+                for r in results
+            ],
+        }
+    
+    @staticmethod
+    def compare_normalization(texts: list[str], iterations: int = 1) -> dict:
+        """
+        Compara normalize_text (traducción en una pasada) contra la
+        implementación original en varias pasadas, verificando que la
+        salida sea idéntica carácter por carácter para cada texto.
+        
+        Args:
+            texts: Textos brutos (sin normalizar)
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            Diccionario con tiempos, aceleración y número de diferencias
+        """
+        timings = {}
+        outputs = {}
+        
+        for name, normalize_fn in [("reference", normalize_text_reference),
+                                   ("normalize_text", normalize_text)]:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                outputs[name] = [normalize_fn(t) for t in texts]
+            timings[name] = (time.perf_counter() - start) * 1000 / iterations
+        
+        mismatches = sum(
+            1 for expected, actual in zip(outputs["reference"], outputs["normalize_text"])
+            if expected.encode("utf-8") != actual.encode("utf-8")
+        )
+        
+        return {
+            "texts": len(texts),
+            "total_chars": sum(len(t) for t in texts),
+            "ascii_texts": sum(1 for t in texts if t.isascii()),
+            "reference_ms": round(timings["reference"], 4),
+            "normalize_text_ms": round(timings["normalize_text"], 4),
+            "speedup_factor": round(timings["reference"] / timings["normalize_text"], 2)
+                              if timings["normalize_text"] > 0 else 0,
+            "mismatches": mismatches,
+            "identical": mismatches == 0,
+        }
+    
+    @staticmethod
+    def compare_document_reuse(detector, text: str, algorithms: list[str],
+                               iterations: int = 1) -> dict:
+        """
+        Mide una solicitud tipo /compare (detect_all con varios algoritmos
+        sobre el mismo texto) normalizando el texto en cada llamada contra
+        compartir un único NormalizedDocument. Ninguna variante pasa por
+        normalization_cache: con el texto bruto, detect_all lo tomaría de
+        la caché y la primera variante tampoco normalizaría.
+        
+        Args:
+            detector: Instancia de ComplaintDetector
+            text: Texto bruto
+            algorithms: Algoritmos a ejecutar por solicitud
+            iterations: Número de solicitudes simuladas
+        
+        Returns:
+            Diccionario con el tiempo por solicitud de cada variante y la
+            fracción de latencia ahorrada
+        """
+        # Los índices multi-patrón se construyen en el primer uso: fuera de la medición
+        document = NormalizedDocument(text, with_offsets=True)
+        for algorithm in algorithms:
+            detector.detect_all(document, algorithm=algorithm, use_cache=False)
+        
+        # Variantes alternadas en cada iteración: el ruido afecta a ambas por igual
+        per_call_ms = shared_ms = 0.0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            for algorithm in algorithms:
+                document = NormalizedDocument(text, with_offsets=True)
+                detector.detect_all(document, algorithm=algorithm, use_cache=False)
+            middle = time.perf_counter()
+            document = NormalizedDocument(text, with_offsets=True)
+            for algorithm in algorithms:
+                detector.detect_all(document, algorithm=algorithm, use_cache=False)
+            per_call_ms += (middle - start) * 1000 / iterations
+            shared_ms += (time.perf_counter() - middle) * 1000 / iterations
+        
+        return {
+            "text_length": len(text),
+            "algorithms": len(algorithms),
+            "normalize_per_call_ms": round(per_call_ms, 4),
+            "shared_document_ms": round(shared_ms, 4),
+            "saved_fraction": round(1 - shared_ms / per_call_ms, 4) if per_call_ms > 0 else 0,
+        }
+    
+    @staticmethod
+    def compare_triage(detector, texts: list[str], iterations: int = 1) -> dict:
+        """
+        Mide detector.triage con cada estrategia contra detect_all
+        (aho_corasick, sin caché) sobre los mismos textos.
+        
+        Args:
+            detector: Instancia de ComplaintDetector
+            texts: Textos a clasificar
+            iterations: Repeticiones sobre el conjunto de textos
+        
+        Returns:
+            Diccionario con el tiempo medio por texto (ms) de detect_all y
+            de cada estrategia de triage, y patrones probados en promedio
+        """
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                detector.detect_all(text, use_cache=False)
+        runs = iterations * len(texts)
+        detect_all_ms = (time.perf_counter() - start) * 1000 / runs
+        
+        triage = {}
+        for algorithm in TRIAGE_ALGORITHMS:
+            checked = 0
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for text in texts:
+                    checked += detector.triage(text, algorithm=algorithm)["patterns_checked"]
+            elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+            triage[algorithm] = {
+                "per_text_ms": round(elapsed_ms, 4),
+                "avg_patterns_checked": round(checked / runs, 2),
+                "speedup": round(detect_all_ms / elapsed_ms, 2) if elapsed_ms > 0 else 0,
             }
+        
+        return {
+            "texts": len(texts),
+            "detect_all_ms": round(detect_all_ms, 4),
+            "triage": triage,
+        }
+    
+    @staticmethod
+    def compare_match_modes(text: str, pattern: str, max_matches: int = 100,
+                            iterations: int = 1) -> dict:
+        """
+        Mide cada algoritmo de un patrón con mode="all", "first", "count"
+        y con max_matches: tiempo medio y memoria pico (tracemalloc, en
+        una ejecución aparte para no distorsionar el tiempo).
+        
+        Args:
+            text: Texto a buscar (p.ej. "a" * 200_000)
+            pattern: Patrón a buscar
+            max_matches: Tope para la variante "all" acotada
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            Diccionario {algoritmo: {variante: {time_ms, peak_kb, result}}}
+            donde result es la cantidad de coincidencias reportadas
+        """
+        search_functions = {
+            "kmp": kmp_search,
+            "boyer_moore": boyer_moore_search,
+            "boyer_moore_full": boyer_moore_full_search,
+            "horspool": horspool_search,
+            "sunday": sunday_search,
+            "shift_or": shift_or_search,
+        }
+        variants = {
+            "all": {"mode": "all"},
+            f"max_matches={max_matches}": {"mode": "all", "max_matches": max_matches},
+            "first": {"mode": "first"},
+            "count": {"mode": "count"},
+        }
+        results = {}
+        
+        for name, search_fn in search_functions.items():
+            results[name] = {}
+            for label, options in variants.items():
+                # Liberar el resultado anterior fuera de la medición
+                found = None
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    found = search_fn(text, pattern, **options)
+                elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+                
+                tracemalloc.start()
+                search_fn(text, pattern, **options)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                
+                results[name][label] = {
+                    "time_ms": round(elapsed_ms, 4),
+                    "peak_kb": round(peak / 1024, 1),
+                    "result": found if isinstance(found, int) else len(found),
+                }
+        
+        return results
+    
+    @staticmethod
+    def compare_overlapping(text: str, pattern: str, iterations: int = 1) -> dict:
+        """
+        Mide cada algoritmo de un patrón con coincidencias solapadas
+        (overlapping=True) y sin solapamiento (overlapping=False, salto de
+        m tras cada coincidencia).
+        
+        Args:
+            text: Texto a buscar (idealmente repetitivo, p.ej. "ab" * 50_000)
+            pattern: Patrón a buscar
+            iterations: Número de iteraciones para promedio
+        
+        Returns:
+            Diccionario {algoritmo: {overlapping_ms, non_overlapping_ms,
+            overlapping_matches, non_overlapping_matches, speedup}}
+        """
+        search_functions = {
+            "kmp": kmp_search,
+            "boyer_moore": boyer_moore_search,
+            "boyer_moore_full": boyer_moore_full_search,
+            "horspool": horspool_search,
+            "sunday": sunday_search,
+            "shift_or": shift_or_search,
+        }
+        results = {}
+        
+        for name, search_fn in search_functions.items():
+            times = {}
+            counts = {}
+            for overlapping in (True, False):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    matches = search_fn(text, pattern, overlapping=overlapping)
+                times[overlapping] = (time.perf_counter() - start) * 1000 / iterations
+                counts[overlapping] = len(matches)
+            
+            results[name] = {
+                "overlapping_ms": round(times[True], 4),
+                "non_overlapping_ms": round(times[False], 4),
+                "overlapping_matches": counts[True],
+                "non_overlapping_matches": counts[False],
+                "speedup": round(times[True] / times[False], 2) if times[False] > 0 else 0,
+            }
+        
+        return results
+    
+    @staticmethod
+    def compare_detect_many(detector, texts: list[str],
+                            workers_list: list[int]) -> dict:
+        """
+        Mide detector.detect_many (sin caché) con distintas cantidades de
+        workers sobre el mismo corpus. Incluye el arranque del pool y la
+        compilación de patrones en cada worker.
+        
+        Args:
+            detector: Instancia de ComplaintDetector
+            texts: Corpus de mensajes
+            workers_list: Cantidades de procesos a probar (p.ej. [1, 2, 4, 8])
+        
+        Returns:
+            Diccionario {workers: {time_ms, texts_per_s, speedup, efficiency}}
+            con speedup relativo a 1 worker (si workers_list no empieza con
+            1, se mide primero con 1 worker como referencia)
+        """
+        if not workers_list or workers_list[0] != 1:
+            workers_list = [1, *(workers for workers in workers_list if workers != 1)]
+        
+        results = {}
+        baseline_ms = None
+        
+        for workers in workers_list:
+            start = time.perf_counter()
+            detector.detect_many(texts, workers=workers, use_cache=False)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if baseline_ms is None:
+                baseline_ms = elapsed_ms
+            speedup = baseline_ms / elapsed_ms if elapsed_ms > 0 else 0
+            results[workers] = {
+                "time_ms": round(elapsed_ms, 2),
+                "texts_per_s": round(len(texts) / (elapsed_ms / 1000)) if elapsed_ms > 0 else 0,
+                "speedup": round(speedup, 2),
+                "efficiency": round(speedup / workers, 2),
+            }
+        
+        return results
+    
+    @staticmethod
+    def compare_response_formats(detector, texts: list[str], iterations: int = 1) -> dict:
+        """
+        Mide el armado de la respuesta de /analyze en tres variantes sobre
+        los mismos textos (sin caché de resultados):
+        
+        - model: detect_all completo + AnalyzeResponse/DetectionInfo (la
+          respuesta de /analyze sin fields)
+        - dict: detect_all completo serializado directamente
+        - compact: detect_all(fields=COMPACT_FIELDS) serializado directamente
+        
+        Args:
+            detector: Instancia de ComplaintDetector
+            texts: Textos a analizar
+            iterations: Repeticiones sobre el conjunto de textos
+        
+        Returns:
+            Diccionario {variante: {detect_ms, serialize_ms, total_ms, bytes}}
+            con tiempos medios por texto y tamaño medio de la respuesta
+        """
+        # Importación diferida: importar api crea el detector de la aplicación
+        from api import AnalyzeResponse, DetectionInfo
+        
+        def dumps(payload: dict) -> bytes:
+            # Mismo formato que JSONResponse
+            return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        
+        def with_model(analysis: dict) -> bytes:
+            response = AnalyzeResponse(
+                **{**analysis, "detections": [DetectionInfo(**d) for d in analysis["detections"]]}
+            )
+            return dumps(response.model_dump(mode="json"))
+        
+        variants = {
+            "model": (None, with_model),
+            "dict": (None, dumps),
+            "compact": (COMPACT_FIELDS, dumps),
+        }
+        runs = iterations * len(texts)
+        results = {}
+        
+        for name, (fields, serialize) in variants.items():
+            detect_s = serialize_s = 0.0
+            size = 0
+            for _ in range(iterations):
+                for text in texts:
+                    start = time.perf_counter()
+                    analysis = detector.detect_all(text, use_cache=False, fields=fields)
+                    middle = time.perf_counter()
+                    body = serialize(analysis)
+                    detect_s += middle - start
+                    serialize_s += time.perf_counter() - middle
+                    size += len(body)
+            results[name] = {
+                "detect_ms": round(detect_s * 1000 / runs, 4),
+                "serialize_ms": round(serialize_s * 1000 / runs, 4),
+                "total_ms": round((detect_s + serialize_s) * 1000 / runs, 4),
+                "bytes": round(size / runs),
+            }
+        
+        return results
+    
+    @staticmethod
+    def compare_batch_formats(detector, texts: list[str]) -> dict:
+        """
+        Compara /analyze/batch por filas (un detect_all por texto) con el
+        formato columnar (detect_columnar): tiempo de detección más
+        serialización, tamaño de la respuesta y memoria pico de los
+        resultados (tracemalloc, en una ejecución aparte), sin caché.
+        
+        Args:
+            detector: Instancia de ComplaintDetector
+            texts: Lote de textos (idealmente densos en coincidencias)
+        
+        Returns:
+            Diccionario {formato: {time_ms, bytes, peak_kb}} y la razón
+            rows/columnar de cada medida en "ratio"
+        """
+        def dumps(payload: dict) -> bytes:
+            return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        
+        def rows() -> dict:
+            return {"results": detector.detect_many(texts, workers=1, use_cache=False)}
+        
+        def columnar() -> dict:
+            columns = detector.detect_columnar(texts, use_cache=False)
+            return {key: value.tolist() if hasattr(value, "tolist") else value
+                    for key, value in columns.items()}
+        
+        results = {}
+        for name, build in (("rows", rows), ("columnar", columnar)):
+            start = time.perf_counter()
+            body = dumps(build())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            tracemalloc.start()
+            payload = build()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            payload = None
+            
+            results[name] = {
+                "time_ms": round(elapsed_ms, 2),
+                "bytes": len(body),
+                "peak_kb": round(peak / 1024, 1),
+            }
+        
+        results["ratio"] = {
+            key: round(results["rows"][key] / results["columnar"][key], 1)
+            if results["columnar"][key] else 0
+            for key in ("time_ms", "bytes", "peak_kb")
         }
+        return results
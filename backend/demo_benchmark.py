@@ -2,8 +2,12 @@
 Script de demostración de mediciones de rendimiento.
 """
 
+import os
+import random
+import sys
+
 from benchmark import AlgorithmBenchmark
-from services.detector import create_detector
+from services.detector import create_detector, ALGORITHMS
 from preprocessing.normalize import normalize_text
 
 
@@ -24,7 +28,7 @@ def demo_benchmark():
         ("defecto defecto defecto defecto", "defecto"),
     ]
     
-    print("Comparativa KMP vs Boyer-Moore:\n")
+    print("Comparativa KMP vs Boyer-Moore vs Horspool vs Sunday:\n")
     
     for i, (text, pattern) in enumerate(test_cases, 1):
         print(f"[Caso {i}]")
@@ -35,8 +39,12 @@ def demo_benchmark():
         
         print(f"  KMP:           {comparison['kmp']['time_ms']:.4f} ms")
         print(f"  Boyer-Moore:   {comparison['boyer_moore']['time_ms']:.4f} ms")
-        print(f"  Diferencia:    {comparison['comparison']['difference_ms']:.4f} ms")
-        print(f"  Mas rapido:    {comparison['comparison']['faster_algorithm']}")
+        print(f"  Horspool:      {comparison['horspool']['time_ms']:.4f} ms")
+        print(f"  Sunday:        {comparison['sunday']['time_ms']:.4f} ms")
+        print(f"  Shift-Or:      {comparison['shift_or']['time_ms']:.4f} ms")
+        print(f"  Diferencia:    {comparison['comparison']['difference_ms']:.4f} ms (KMP vs Boyer-Moore)")
+        print(f"  Mas rapido:    {comparison['comparison']['faster_algorithm']} (KMP vs Boyer-Moore), "
+              f"{comparison['comparison']['fastest_overall']} (exactos)")
         print()
     
     print("\n" + "=" * 70)
@@ -52,6 +60,8 @@ def demo_benchmark():
     print("Promedio de tiempos:")
     print(f"  KMP:           {summary['kmp_avg_ms']:.4f} ms")
     print(f"  Boyer-Moore:   {summary['boyer_moore_avg_ms']:.4f} ms")
+    print(f"  Horspool:      {summary['horspool_avg_ms']:.4f} ms")
+    print(f"  Sunday:        {summary['sunday_avg_ms']:.4f} ms")
     print()
     print("Rango KMP:")
     print(f"  Min:  {summary['kmp_min_ms']:.4f} ms")
@@ -62,6 +72,390 @@ def demo_benchmark():
     print(f"  Max:  {summary['boyer_moore_max_ms']:.4f} ms")
 
 
+def demo_adversarial_boyer_moore():
+    """
+    Demuestra el peor caso de Boyer-Moore con solo bad character
+    (texto y patrón repetitivos) frente a la versión completa con
+    good suffix + regla de Galil, que se mantiene lineal.
+    
+    El texto tiene longitud fija y crece el patrón: un algoritmo O(n*m)
+    tarda proporcionalmente más, uno O(n + m) tarda lo mismo.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: ENTRADAS ADVERSARIAS (PEOR CASO BOYER-MOORE)")
+    print("=" * 70 + "\n")
+    
+    n = 8000
+    adversarial_inputs = {
+        "'a'*n / 'a'*m": lambda m: ("a" * n, "a" * m),
+        "'ab'*n / 'ab'*m": lambda m: ("ab" * (n // 2), "ab" * (m // 2)),
+        "'a'*n / 'b'+'a'*m": lambda m: ("a" * n, "b" + "a" * (m - 1)),
+    }
+    pattern_lengths = [10, 20, 40, 80]
+    
+    measures = [
+        AlgorithmBenchmark.measure_kmp,
+        AlgorithmBenchmark.measure_boyer_moore,
+        AlgorithmBenchmark.measure_boyer_moore_full,
+    ]
+    
+    for label, build_case in adversarial_inputs.items():
+        print(f"Caso: {label}  (n = {n})")
+        cases = [build_case(m) for m in pattern_lengths]
+        
+        for measure in measures:
+            scaling = AlgorithmBenchmark.measure_scaling(measure, cases, iterations=3)
+            times = [c["time_ms"] for c in scaling["cases"]]
+            growth = times[-1] / times[0] if times[0] > 0 else 1.0
+            print(f"  {scaling['algorithm']:<20} ms [{', '.join(f'{t:.2f}' for t in times)}]  "
+                  f"x{growth:.1f} (m {pattern_lengths[0]} -> {pattern_lengths[-1]})")
+        print()
+    
+    print("Un factor cercano a x1 indica tiempo lineal O(n + m);")
+    print(f"un factor cercano a x{pattern_lengths[-1] // pattern_lengths[0]} indica O(n*m).")
+
+
+def demo_pattern_mix():
+    """
+    Compara los algoritmos con los patrones reales de patterns.csv sobre
+    los mensajes de data/messages.txt para elegir el más rápido.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: PATRONES REALES SOBRE MENSAJES DE PRUEBA")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        messages = [line.strip() for line in f if line.strip()]
+    
+    result = AlgorithmBenchmark.benchmark_detector(
+        detector, messages, list(ALGORITHMS), iterations=50
+    )
+    
+    print(f"Mensajes: {result['texts']}  Patrones: {len(detector.patterns)}\n")
+    for algorithm, timing in result["results"].items():
+        print(f"  {algorithm:<18} {timing['avg_ms_per_text']:.4f} ms/mensaje")
+    print(f"\n  Mas rapido: {result['fastest']}")
+
+
+def demo_multi_pattern():
+    """
+    Compara búsqueda patrón por patrón contra Aho-Corasick y Wu-Manber
+    al crecer el número de patrones, sobre un texto largo tipo email.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: MULTI-PATRON (UNA PASADA) VS PATRON POR PATRON")
+    print("=" * 70 + "\n")
+    
+    rng = random.Random(42)
+    words = [
+        "cliente", "pedido", "entrega", "producto", "servicio", "factura",
+        "garantia", "reembolso", "soporte", "cuenta", "envio", "pago",
+        "tarjeta", "devolucion", "paquete", "tienda", "correo", "atencion",
+    ]
+    text = normalize_text(" ".join(rng.choice(words) for _ in range(700)))
+    
+    def random_phrase() -> str:
+        length = rng.randint(5, 14)
+        return "".join(rng.choice("abcdefghijlmnoprstuvz") for _ in range(length))
+    
+    for count in [10, 100, 1000]:
+        patterns = [random_phrase() for _ in range(count - 2)] + ["reembolso", "no llego"]
+        iterations = 3 if count >= 1000 else 10
+        result = AlgorithmBenchmark.compare_multi_pattern(text, patterns, iterations)
+        
+        print(f"Patrones: {result['pattern_count']}  "
+              f"(texto: {result['text_length']} chars, "
+              f"patron mas corto: {result['min_pattern_length']})")
+        for algorithm, timing in result["results"].items():
+            print(f"  {algorithm:<18} {timing['time_ms']:>10.4f} ms  "
+                  f"({timing['matches']} coincidencias)")
+        print(f"  Mas rapido: {result['fastest']}\n")
+
+
+def demo_message_lengths():
+    """
+    Compara Shift-Or (uno y varios patrones por entero) contra KMP y
+    Boyer-Moore con los patrones reales sobre textos de longitud típica
+    de nuestros mensajes (chat corto, email, texto máximo de la API).
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: SHIFT-OR VS KMP / BOYER-MOORE POR LONGITUD DE MENSAJE")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    patterns = [normalize_text(p["pattern"]) for p in detector.patterns]
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        corpus = normalize_text(" ".join(line.strip() for line in f))
+    
+    selected = ["kmp", "boyer_moore", "shift_or", "shift_or_multi", "aho_corasick"]
+    
+    for length in [50, 500, 5000]:
+        text = (corpus * (length // len(corpus) + 1))[:length]
+        result = AlgorithmBenchmark.compare_multi_pattern(text, patterns, iterations=20)
+        
+        print(f"Texto: {length} chars, {len(patterns)} patrones")
+        for algorithm in selected:
+            print(f"  {algorithm:<16} {result['results'][algorithm]['time_ms']:.4f} ms")
+        print()
+
+
+def demo_normalization():
+    """
+    Verifica y mide normalize_text contra la implementación original sobre
+    un corpus grande en español: los mensajes de prueba con variaciones de
+    mayúsculas, tildes, puntuación, espacios Unicode y emojis, más su
+    versión ya sin tildes (camino rápido ASCII).
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: NORMALIZACION EN UNA PASADA VS ORIGINAL")
+    print("=" * 70 + "\n")
+    
+    rng = random.Random(7)
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        messages = [line.strip() for line in f if line.strip()]
+    
+    extras = ["¡", "¿", "!", "?", "...", ",", "\u00a0", "\t", "  ", "😡", "👍",
+              "Ñ", "ü", "Ç", "(", ")", "\"", "«", "»", "—", "€"]
+    corpus = []
+    
+    for _ in range(4000):
+        words = rng.choice(messages).split()
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randint(0, len(words)), rng.choice(extras))
+        text = " ".join(w.upper() if rng.random() < 0.2 else w for w in words)
+        corpus.append(text)
+    
+    # Mitad del corpus sin tildes ni símbolos: mensajes ASCII puros
+    corpus += [t.encode("ascii", "ignore").decode() for t in corpus]
+    
+    result = AlgorithmBenchmark.compare_normalization(corpus, iterations=5)
+    
+    print(f"Textos: {result['texts']} ({result['ascii_texts']} ASCII), "
+          f"{result['total_chars']} caracteres")
+    print(f"  Original:        {result['reference_ms']:.4f} ms")
+    print(f"  normalize_text:  {result['normalize_text_ms']:.4f} ms")
+    print(f"  Aceleracion:     {result['speedup_factor']}x")
+    print(f"  Salida identica: {'OK' if result['identical'] else 'FAIL'} "
+          f"({result['mismatches']} diferencias)")
+
+
+def demo_shared_document():
+    """
+    Mide cuánto ahorra compartir un NormalizedDocument entre todos los
+    algoritmos de una solicitud /compare con textos de 5000 caracteres
+    (el máximo de la API).
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: NORMALIZACION COMPARTIDA POR SOLICITUD (/compare)")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        corpus = " ".join(line.strip() for line in f)
+    text = (corpus * (5000 // len(corpus) + 1))[:5000]
+    
+    for algorithms in [["aho_corasick", "kmp", "boyer_moore"], list(ALGORITHMS)]:
+        result = AlgorithmBenchmark.compare_document_reuse(
+            detector, text, algorithms, iterations=10
+        )
+        print(f"Algoritmos por solicitud: {result['algorithms']}  "
+              f"(texto: {result['text_length']} chars)")
+        print(f"  Normalizando en cada llamada: {result['normalize_per_call_ms']:.4f} ms")
+        print(f"  NormalizedDocument compartido: {result['shared_document_ms']:.4f} ms")
+        print(f"  Latencia ahorrada:            {result['saved_fraction'] * 100:.1f}%\n")
+
+
+def demo_triage():
+    """
+    Compara /triage (solo has_complaints y nivel máximo, con corte
+    temprano) con detect_all sobre mensajes con reclamos y mensajes limpios.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: TRIAGE CON CORTE TEMPRANO vs detect_all")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        dirty = [line.strip() for line in f if line.strip()]
+    clean = [
+        "Hola, quisiera saber el horario de atención de la sucursal",
+        "Gracias por la rápida respuesta, todo llegó bien",
+        "¿Tienen stock del modelo azul en talla mediana?",
+        "Necesito actualizar la dirección de envío de mi cuenta",
+    ]
+    
+    for label, texts in [("Con reclamos", dirty), ("Limpios", clean)]:
+        result = AlgorithmBenchmark.compare_triage(detector, texts, iterations=20)
+        print(f"{label} ({result['texts']} mensajes)")
+        print(f"  detect_all (aho_corasick): {result['detect_all_ms']:.4f} ms/texto")
+        for algorithm, data in result["triage"].items():
+            print(f"  triage {algorithm:<13} {data['per_text_ms']:.4f} ms/texto  "
+                  f"x{data['speedup']:<6} patrones probados: {data['avg_patterns_checked']}")
+        print()
+
+
+def demo_match_modes():
+    """
+    Compara mode="all" con "first", "count" y max_matches en un texto
+    patológico ("a" * 200_000): la lista de posiciones, una por carácter,
+    es la que domina tiempo y memoria.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: MODOS DE RESULTADO (all / max_matches / first / count)")
+    print("=" * 70 + "\n")
+    
+    text = "a" * 200_000
+    pattern = "aa"
+    results = AlgorithmBenchmark.compare_match_modes(text, pattern, max_matches=100)
+    
+    print(f"Texto: 'a' * {len(text):,}  Patrón: '{pattern}'\n")
+    for algorithm, variants in results.items():
+        print(f"{algorithm}")
+        for label, data in variants.items():
+            print(f"  {label:<16} {data['time_ms']:>10.2f} ms  {data['peak_kb']:>9.1f} KB  "
+                  f"resultado: {data['result']:,}")
+        print()
+
+
+def demo_overlapping():
+    """
+    Compara coincidencias solapadas con coincidencias sin solapamiento en
+    textos repetitivos, donde casi cada posición inicia una coincidencia.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: COINCIDENCIAS SOLAPADAS vs SIN SOLAPAMIENTO")
+    print("=" * 70 + "\n")
+    
+    cases = [
+        ("a" * 100_000, "aaaa"),
+        ("ab" * 50_000, "abab"),
+        ("problema " * 10_000, "problema problema"),
+    ]
+    
+    for text, pattern in cases:
+        results = AlgorithmBenchmark.compare_overlapping(text, pattern, iterations=3)
+        print(f"Texto: '{text[:12]}...' ({len(text):,} chars)  Patrón: '{pattern}'")
+        for algorithm, data in results.items():
+            print(f"  {algorithm:<17} solapadas: {data['overlapping_ms']:>8.2f} ms "
+                  f"({data['overlapping_matches']:,})  sin solapamiento: "
+                  f"{data['non_overlapping_ms']:>8.2f} ms ({data['non_overlapping_matches']:,})  "
+                  f"x{data['speedup']}")
+        print()
+
+
+def demo_parallel_batch(total: int = 100_000):
+    """
+    Escalado de detect_many con procesos sobre un corpus sintético: los
+    mensajes de data/messages.txt y mensajes limpios, mezclados al azar.
+    Con `python demo_benchmark.py --full` se usa 1 000 000 de mensajes.
+    """
+    
+    print("\n" + "=" * 70)
+    print(f"  BENCHMARK: detect_many EN PARALELO ({total:,} mensajes)")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        base = [line.strip() for line in f if line.strip()]
+    base += [
+        "Hola, quisiera saber el horario de atención de la sucursal",
+        "Gracias por la rápida respuesta, todo llegó bien",
+        "¿Tienen stock del modelo azul en talla mediana?",
+    ]
+    rng = random.Random(42)
+    texts = [rng.choice(base) for _ in range(total)]
+    
+    cpus = os.cpu_count() or 1
+    workers_list = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    results = AlgorithmBenchmark.compare_detect_many(detector, texts, workers_list)
+    for workers, data in results.items():
+        print(f"  {workers:>2} workers: {data['time_ms']:>10.0f} ms  "
+              f"{data['texts_per_s']:>9,} msg/s  x{data['speedup']:<5} "
+              f"eficiencia {data['efficiency']:.0%}")
+    print()
+
+
+def demo_response_formats():
+    """
+    Compara tiempo de serialización y tamaño de la respuesta de /analyze
+    completa (con y sin modelos Pydantic) contra la respuesta compacta.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: RESPUESTA COMPLETA vs COMPACTA (fields / compact)")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        messages = [line.strip() for line in f if line.strip()]
+    dense = ("El producto llegó roto, con defecto y no funciona. " * 100)[:5000]
+    
+    for label, texts, iterations in [("Mensajes cortos", messages, 50),
+                                     ("Texto denso de 5000 chars", [dense], 50)]:
+        results = AlgorithmBenchmark.compare_response_formats(detector, texts, iterations)
+        print(f"{label} ({len(texts)} textos)")
+        for variant, data in results.items():
+            print(f"  {variant:<8} detect: {data['detect_ms']:>8.4f} ms  "
+                  f"serializar: {data['serialize_ms']:>8.4f} ms  "
+                  f"total: {data['total_ms']:>8.4f} ms  {data['bytes']:>7,} bytes")
+        print()
+
+
+def demo_batch_formats():
+    """
+    Compara el lote por filas con el formato columnar en lotes densos
+    (muchas coincidencias por texto) y en mensajes cortos.
+    """
+    
+    print("\n" + "=" * 70)
+    print("  BENCHMARK: LOTE POR FILAS vs COLUMNAR")
+    print("=" * 70 + "\n")
+    
+    detector = create_detector()
+    messages_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "data", "messages.txt")
+    with open(messages_path, "r", encoding="utf-8") as f:
+        messages = [line.strip() for line in f if line.strip()]
+    dense = ("El producto llegó roto, con defecto y no funciona. " * 100)[:5000]
+    
+    for label, texts in [("100 textos densos de 5000 chars", [dense + str(i) for i in range(100)]),
+                         ("Mensajes cortos x 7", messages * 7)]:
+        results = AlgorithmBenchmark.compare_batch_formats(detector, texts)
+        print(f"{label}")
+        for name in ("rows", "columnar"):
+            data = results[name]
+            print(f"  {name:<9} {data['time_ms']:>9.2f} ms  {data['bytes']:>10,} bytes  "
+                  f"pico {data['peak_kb']:>9,.1f} KB")
+        ratio = results["ratio"]
+        print(f"  rows/columnar: tiempo x{ratio['time_ms']}  tamaño x{ratio['bytes']}  "
+              f"memoria x{ratio['peak_kb']}")
+        print()
+
+
 def demo_detector_with_timing():
     """Demuestra el detector con medición de tiempo."""
     
@@ -124,5 +518,17 @@ def demo_benchmark_single_algorithm():
 
 if __name__ == "__main__":
     demo_benchmark()
+    demo_adversarial_boyer_moore()
+    demo_pattern_mix()
+    demo_multi_pattern()
+    demo_message_lengths()
+    demo_normalization()
+    demo_shared_document()
+    demo_triage()
+    demo_match_modes()
+    demo_overlapping()
+    demo_parallel_batch(1_000_000 if "--full" in sys.argv[1:] else 100_000)
+    demo_response_formats()
+    demo_batch_formats()
     demo_detector_with_timing()
     demo_benchmark_single_algorithm()
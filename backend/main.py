@@ -3,10 +3,34 @@ Script principal para pruebas del sistema de detección de patrones.
 Responsabilidad: ejecutar y validar funcionalidad básica.
 """
 
-from preprocessing.normalize import normalize_text
-from algorithms.kmp import kmp_search
-from algorithms.boyer_moore import boyer_moore_search, build_bad_char_table
-from services.detector import create_detector, ComplaintDetector
+import asyncio
+import threading
+
+from preprocessing.normalize import (
+    NormalizationCache,
+    NormalizedDocument,
+    normalize_stream,
+    normalize_text,
+    normalize_text_reference,
+    normalization_cache,
+)
+from algorithms.kmp import kmp_search, KMPStream
+from algorithms.boyer_moore import (
+    BoyerMooreStream,
+    boyer_moore_search,
+    boyer_moore_full_search,
+    build_bad_char_table,
+    build_good_suffix_table,
+)
+from algorithms.horspool import horspool_search
+from algorithms.sunday import sunday_search
+from algorithms.aho_corasick import build_automaton, aho_corasick_search
+from algorithms.wu_manber import build_wu_manber_tables, wu_manber_search
+from algorithms.shift_or import shift_or_search, build_shift_or_multi, shift_or_multi_search
+from algorithms.myers import myers_search
+from services.detector import create_detector, ComplaintDetector, COMPACT_FIELDS
+from services.executor import DetectionExecutor
+from services.metrics import MetricsRegistry
 from benchmark import AlgorithmBenchmark
 
 
@@ -58,7 +82,7 @@ def test_kmp_basic():
     if matches:
         for pos in matches:
             print(f"  -> Encontrado en indice {pos}: '{text[pos:pos+len(pattern)]}'")
-    
+
 
 def test_kmp_with_normalization():
     """Prueba KMP con preprocesamiento."""
@@ -443,13 +467,775 @@ def test_detector_timing():
         print()
 
 
+def test_boyer_moore_full():
+    """Prueba Boyer-Moore completo (good suffix + Galil) contra KMP."""
+    print_section("PRUEBA 22: Boyer-Moore Completo (Good Suffix + Galil)")
+    
+    for pattern in ["abab", "aaaa", "problema", "anpanman"]:
+        print(f"Patron: '{pattern}'")
+        print(f"Good suffix: {build_good_suffix_table(pattern)}")
+    print()
+    
+    test_cases = [
+        ("problema problema problema", "problema"),
+        ("aaaaaaaaaa", "aaa"),
+        ("abababababab", "abab"),
+        ("a" * 100, "a" * 10),
+        ("a" * 100, "b" + "a" * 9),
+        ("el servicio es excelente", "defecto"),
+    ]
+    
+    for text, pattern in test_cases:
+        kmp_results = kmp_search(text, pattern)
+        full_results = boyer_moore_full_search(text, pattern)
+        
+        match = "OK" if kmp_results == full_results else "FAIL"
+        print(f"Texto: '{text[:30]}{'...' if len(text) > 30 else ''}'  Patron: '{pattern}'")
+        print(f"  Coincidencias: {len(full_results)}  Coinciden con KMP: {match}")
 
 
+def test_aho_corasick_vs_kmp():
+    """Compara Aho-Corasick (una pasada) contra KMP (un patrón por pasada)."""
+    print_section("PRUEBA 21: Aho-Corasick vs KMP")
+    
+    patterns = ["problema", "no funciona", "pro", "aaa", "a"]
+    texts = [
+        "problema problema no funciona",
+        "aaaaaaaaaa",
+        "el servicio es excelente",
+    ]
+    
+    automaton = build_automaton(patterns)
+    
+    for text in texts:
+        ac_results = aho_corasick_search(text, automaton)
+        kmp_results = {i: hits for i, hits in enumerate(kmp_search(text, p) for p in patterns) if hits}
+        
+        match = "OK" if ac_results == kmp_results else "FAIL"
+        print(f"Texto: '{text}'")
+        for i, pattern in enumerate(patterns):
+            print(f"  '{pattern}': {ac_results.get(i, [])}")
+        print(f"  Coinciden con KMP: {match}\n")
+    
+    detector = create_detector()
+    text = "Producto defectuoso, no funciona y esta roto"
+    ac = [r.to_dict() for r in detector.detect(text, algorithm="aho_corasick")]
+    kmp = [r.to_dict() for r in detector.detect(text, algorithm="kmp")]
+    print(f"Detector '{text}'")
+    print(f"  Aho-Corasick: {len(ac)} patrones, KMP: {len(kmp)} patrones")
+    print(f"  Coinciden:    {'OK' if ac == kmp else 'FAIL'}")
+    
+    # Resultado disperso: solo los patrones encontrados, sin importar cuántos haya
+    many = [f"zq{i}x" for i in range(5000)] + ["roto"]
+    hits = aho_corasick_search("producto roto", build_automaton(many))
+    print(f"  5001 patrones: {hits} {'OK' if hits == {5000: [9]} else 'FAIL'}")
+
+
+def test_horspool_and_sunday():
+    """Compara Horspool y Sunday contra KMP."""
+    print_section("PRUEBA 23: Horspool y Sunday (Quick Search)")
+    
+    test_cases = [
+        ("el cliente esta feliz", "cliente"),
+        ("problema problema problema", "problema"),
+        ("no hay reclamos aqui", "reclamo"),
+        ("aaaaaaaaaa", "aaa"),
+        ("abababab", "bab"),
+        ("defecto", "defecto"),
+    ]
+    
+    for text, pattern in test_cases:
+        kmp_results = kmp_search(text, pattern)
+        horspool_results = horspool_search(text, pattern)
+        sunday_results = sunday_search(text, pattern)
+        
+        match = "OK" if kmp_results == horspool_results == sunday_results else "FAIL"
+        print(f"Texto: '{text}'  Patron: '{pattern}'")
+        print(f"  Horspool: {horspool_results}  Sunday: {sunday_results}  Coinciden con KMP: {match}")
+
+
+def test_wu_manber_vs_kmp():
+    """Compara Wu-Manber (tabla de desplazamientos por bloques) contra KMP."""
+    print_section("PRUEBA 24: Wu-Manber vs KMP")
+    
+    patterns = ["problema", "no funciona", "defecto", "roto", "no llego"]
+    texts = [
+        "problema problema no funciona",
+        "el pedido no llego y el producto esta roto",
+        "el servicio es excelente",
+    ]
+    
+    tables = build_wu_manber_tables(patterns)
+    print(f"Bloque B = {tables.block_size}, ventana = {tables.window}\n")
+    
+    for text in texts:
+        wm_results = wu_manber_search(text, tables)
+        kmp_results = {i: hits for i, hits in enumerate(kmp_search(text, p) for p in patterns) if hits}
+        
+        match = "OK" if wm_results == kmp_results else "FAIL"
+        found = {patterns[i]: pos for i, pos in wm_results.items()}
+        print(f"Texto: '{text}'")
+        print(f"  Encontrados: {found}")
+        print(f"  Coinciden con KMP: {match}\n")
+
+
+def test_shift_or():
+    """Compara Shift-Or (uno y varios patrones por entero) contra KMP."""
+    print_section("PRUEBA 25: Shift-Or (Bitap)")
+    
+    patterns = ["problema", "no funciona", "aaa", "roto"]
+    texts = [
+        "problema problema no funciona",
+        "aaaaaa roto",
+        "el servicio es excelente",
+    ]
+    
+    for word_size in [16, 4096]:
+        tables = build_shift_or_multi(patterns, word_size=word_size)
+        print(f"Empaquetado en {len(tables.groups)} entero(s) (word_size={word_size})")
+        
+        for text in texts:
+            kmp_results = [kmp_search(text, p) for p in patterns]
+            single_results = [shift_or_search(text, p) for p in patterns]
+            multi_results = shift_or_multi_search(text, tables)
+            dense_multi = [multi_results.get(i, []) for i in range(len(patterns))]
+            
+            match = "OK" if kmp_results == single_results == dense_multi else "FAIL"
+            print(f"  Texto: '{text}'  Coinciden con KMP: {match}")
+        print()
+
+
+def test_myers_fuzzy():
+    """Prueba búsqueda aproximada (k errores) con Myers."""
+    print_section("PRUEBA 26: Myers - Busqueda Aproximada")
+    
+    text = "servicio pesimo, psimo y pesimmo; no funsiona"
+    cases = [("pesimo", 0), ("pesimo", 1), ("no funciona", 1)]
+    
+    print(f"Texto: '{text}'\n")
+    for pattern, max_errors in cases:
+        hits = myers_search(text, pattern, max_errors)
+        print(f"Patron: '{pattern}' (k={max_errors})")
+        for start, distance in hits:
+            print(f"  -> indice {start}, distancia {distance}")
+    
+    exact = [start for start, _ in myers_search(text, "pesimo", 0)]
+    print(f"\nk=0 coincide con KMP: {'OK' if exact == kmp_search(text, 'pesimo') else 'FAIL'}")
+    
+    # Un inicio aparece una vez (con la menor distancia); first/max_matches son prefijos de all
+    for text_case, pattern, max_errors in [("bbabb", "aaabb", 3), ("babbabaabbabaabaa", "abbbaab", 2)]:
+        hits = myers_search(text_case, pattern, max_errors)
+        starts = [start for start, _ in hits]
+        prefix = (myers_search(text_case, pattern, max_errors, mode="first") == hits[:1]
+                  and myers_search(text_case, pattern, max_errors, max_matches=2) == hits[:2])
+        ok = len(starts) == len(set(starts)) and prefix
+        print(f"'{pattern}' en '{text_case}' (k={max_errors}): {hits} {'OK' if ok else 'FAIL'}")
+    
+    detector = create_detector()
+    analysis = detector.detect_all("Servicio psimo, no funsiona", algorithm="myers")
+    print("\nDetector (algoritmo 'myers', max_errors desde patterns.csv):")
+    for detection in analysis['detections']:
+        print(f"  {detection['pattern']}: {detection['positions']} "
+              f"distancias {detection['edit_distances']}")
+
+
+def test_streaming():
+    """Prueba matchers incrementales y detect_stream con texto por fragmentos."""
+    print_section("PRUEBA 27: Streaming por Fragmentos")
+    
+    text = "problema problema no funciona " * 3
+    pattern = "problema"
+    chunks = [text[i:i + 5] for i in range(0, len(text), 5)]
+    
+    stream = KMPStream(pattern)
+    stream_results = [pos for chunk in chunks for pos in stream.feed(chunk)]
+    
+    print(f"Texto en {len(chunks)} fragmentos de 5 caracteres")
+    print(f"  KMPStream:  {stream_results}")
+    print(f"  kmp_search: {kmp_search(text, pattern)}")
+    print(f"  Coinciden:  {'OK' if stream_results == kmp_search(text, pattern) else 'FAIL'}\n")
+    
+    detector = create_detector()
+    raw = "¡Producto con DEFECTO!   No funciona,   y llegó roto. " * 4
+    raw_chunks = [raw[i:i + 7] for i in range(0, len(raw), 7)]
+    expected = [r.to_dict() for r in detector.detect(raw, algorithm="kmp")]
+    
+    for algorithm in ["aho_corasick", "kmp", "boyer_moore"]:
+        results = [r.to_dict() for r in detector.detect_stream(raw_chunks, algorithm=algorithm)]
+        match = "OK" if results == expected else "FAIL"
+        print(f"  detect_stream ({algorithm}): {len(results)} patrones  Coincide con detect: {match}")
+    
+    # Fragmentos más cortos que el patrón: el solapamiento no puede perder caracteres
+    stream = BoyerMooreStream("aaaa")
+    short_results = [pos for chunk in ["aa", "a", "a", ""] for pos in stream.feed(chunk)]
+    print(f"\n  BoyerMooreStream('aaaa') sobre ['aa','a','a','']: {short_results} "
+          f"{'OK' if short_results == [0] else 'FAIL'}")
+    
+    short_chunks = ['El ', 'pro', 'duc', 'to ', 'lle', 'gó ', 'rot', 'o y ', 'no ', 'fun', 'cio', 'na']
+    expected = [r.to_dict() for r in detector.detect(''.join(short_chunks), algorithm="kmp")]
+    results = [r.to_dict() for r in detector.detect_stream(short_chunks, algorithm="boyer_moore")]
+    found = any(r['pattern'] == "no funciona" for r in results)
+    print(f"  detect_stream (boyer_moore, fragmentos de 3): 'no funciona' encontrado: {found} "
+          f"{'OK' if found and results == expected else 'FAIL'}")
+    
+    # La sigma final griega depende del carácter siguiente, aunque esté en otro fragmento
+    sigma_chunks = ["ΟΔΟΣ", "Α ΛΟΓΟΣ"]
+    streamed = ''.join(normalize_stream(sigma_chunks))
+    print(f"  normalize_stream({sigma_chunks}): '{streamed}' "
+          f"{'OK' if streamed == normalize_text(''.join(sigma_chunks)) else 'FAIL'}")
+
+
+def test_single_pass_normalization():
+    """Prueba que la normalización en una pasada iguala a la original."""
+    print_section("PRUEBA 28: Normalización en una Pasada")
+    
+    test_cases = [
+        "¡PÉSIMO Servicio!",
+        "Pedido incompleto, daño en tránsito... ¿Reembolso?",
+        "plain ascii TEXT, with punctuation!!",
+        "Atención\u00a0al   cliente\t😡 «pésima»",
+        "ΟΔΟΣ Ñandú ÇA",
+    ]
+    
+    for text in test_cases:
+        result = normalize_text(text)
+        expected = normalize_text_reference(text)
+        status = "[PASS]" if result == expected else "[FAIL]"
+        print(f"{status} {text!r} → {result!r}")
+
+
+def test_original_spans():
+    """Prueba que los spans de detect_all apunten al texto original."""
+    print_section("PRUEBA 29: Spans sobre el Texto Original")
+    
+    detector = create_detector()
+    text = "¡¡Pésimo   servicio!!  El PRODUCTO llegó con DEFECTO... no-funciona, NO FUNCIONA."
+    analysis = detector.detect_all(text, algorithm="aho_corasick")
+    
+    print(f"Original:    '{text}'")
+    print(f"Normalizado: '{analysis['normalized_text']}'\n")
+    
+    for detection in analysis["detections"]:
+        fragments = [text[start:end] for start, end in detection["spans"]]
+        expected = normalize_text(detection["pattern"])
+        passed = all(normalize_text(f) == expected for f in fragments)
+        status = "[PASS]" if passed else "[FAIL]"
+        print(f"{status} {detection['pattern']:<14} spans={detection['spans']}  {fragments}")
+
+
+def test_normalized_document():
+    """Prueba que un NormalizedDocument compartido dé los mismos resultados."""
+    print_section("PRUEBA 30: NormalizedDocument Compartido")
+    
+    detector = create_detector()
+    text = "¡Pésimo servicio! El producto llegó con DEFECTO y no funciona."
+    document = NormalizedDocument(text, with_offsets=True)
+    
+    print(f"Normalizado: '{document.normalized}'")
+    print(f"Palabras:    {len(document.tokens)}\n")
+    
+    for algorithm in ["aho_corasick", "kmp", "myers"]:
+        shared = detector.detect_all(document, algorithm=algorithm)
+        fresh = detector.detect_all(text, algorithm=algorithm)
+        match = shared["detections"] == fresh["detections"]
+        status = "[PASS]" if match else "[FAIL]"
+        print(f"{status} detect_all ({algorithm}): {shared['patterns_found']} patrones")
+    
+    single = detector.detect_single_pattern(document, "defecto", algorithm="kmp")
+    status = "[PASS]" if single.positions == detector.detect_single_pattern(text, "defecto").positions else "[FAIL]"
+    print(f"{status} detect_single_pattern: {single.positions}")
+
+
+def test_normalization_cache():
+    """Prueba la caché LRU de normalización y sus estadísticas."""
+    print_section("PRUEBA 31: Caché LRU de Normalización")
+    
+    cache = NormalizationCache(maxsize=2)
+    messages = ["No funciona", "no funciona!", "No funciona", "Pedido incompleto", "No funciona"]
+    
+    for message in messages:
+        result = cache.normalize(message)
+        status = "[PASS]" if result == normalize_text(message) else "[FAIL]"
+        print(f"{status} '{message}' → '{result}'")
+    
+    stats = cache.stats()
+    print(f"\nEstadisticas: {stats}")
+    # "no funciona!" se descarta al entrar "Pedido incompleto" (LRU de 2)
+    expected = {"size": 2, "hits": 2, "misses": 3}
+    passed = all(stats[key] == value for key, value in expected.items())
+    print(f"{'[PASS]' if passed else '[FAIL]'} Aciertos/fallos/tamaño esperados: {expected}")
+
+
+def test_result_cache():
+    """Prueba la caché de resultados y su invalidación por versión."""
+    print_section("PRUEBA 32: Caché de Resultados por Versión de Patrones")
+    
+    detector = create_detector()
+    first = detector.detect_all("El producto no funciona", algorithm="kmp")
+    second = detector.detect_all("EL PRODUCTO NO FUNCIONA!!", algorithm="kmp")
+    
+    checks = [
+        ("Primer análisis escanea", not first["performance"]["cache_hit"]),
+        ("Mismo texto normalizado sale de caché", second["performance"]["cache_hit"]),
+        ("Resultado idéntico", first["detections"] == second["detections"]),
+    ]
+    
+    version = detector.version
+    detector.add_pattern("producto", "test", "low", "Patron de prueba")
+    third = detector.detect_all("El producto no funciona", algorithm="kmp")
+    detector.delete_pattern(len(detector.patterns) - 1)
+    
+    checks += [
+        ("add_pattern incrementa la versión", detector.version > version),
+        ("Tras cambiar patrones se vuelve a escanear", not third["performance"]["cache_hit"]),
+        ("El patrón nuevo aparece", third["patterns_found"] == first["patterns_found"] + 1),
+    ]
+    
+    for label, passed in checks:
+        print(f"{'[PASS]' if passed else '[FAIL]'} {label}")
+    print(f"\nEstadisticas: {detector.result_cache.stats()}")
+
+
+def test_snapshot_swap():
+    """Prueba que las búsquedas concurrentes vean siempre un snapshot completo."""
+    print_section("PRUEBA 33: Snapshot Inmutable con Reemplazo Atómico")
+    
+    detector = create_detector()
+    base = len(detector.patterns)
+    text = "el producto llego con defecto y no funciona"
+    inconsistent = []
+    done = threading.Event()
+    
+    def reader():
+        while not done.is_set():
+            analysis = detector.detect_all(text, algorithm="aho_corasick", use_cache=False)
+            found = {d["pattern"] for d in analysis["detections"]}
+            has_new = "producto" in found
+            # Con base patrones no debe aparecer el nuevo; con base + 1, sí
+            if has_new != (analysis["total_patterns_checked"] == base + 1):
+                inconsistent.append(analysis["total_patterns_checked"])
+    
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for _ in range(100):
+        detector.add_pattern("producto", "test", "low", "Patron de prueba")
+        detector.delete_pattern(len(detector.patterns) - 1)
+    done.set()
+    for thread in readers:
+        thread.join()
+    
+    print(f"Versión final: {detector.version}  Patrones: {len(detector.patterns)}")
+    status = "[PASS]" if not inconsistent and len(detector.patterns) == base else "[FAIL]"
+    print(f"{status} 200 reemplazos con 4 lectores concurrentes, "
+          f"{len(inconsistent)} resultados inconsistentes")
+
+
+def test_instrumentation():
+    """Prueba la instrumentación opcional por etapa y por patrón."""
+    print_section("PRUEBA 34: Instrumentación por Etapa y por Patrón")
+    
+    detector = create_detector()
+    records = []
+    detector.instrumentation.add_hook(records.append)
+    text = "El producto llegó con defecto y no funciona"
+    
+    disabled = detector.detect_all(text, algorithm="kmp")
+    hook_calls_disabled = len(records)
+    detector.instrumentation.enabled = True
+    enabled = detector.detect_all(text, algorithm="kmp", use_cache=False)
+    detector.detect(text, algorithm="aho_corasick", use_cache=False)
+    snapshot = detector.instrumentation.snapshot()
+    
+    checks = [
+        ("Desactivada: sin stages_ms ni hooks", "stages_ms" not in disabled["performance"] and hook_calls_disabled == 0),
+        ("Activada: stages_ms en performance", set(enabled["performance"].get("stages_ms", {})) ==
+         {"normalize", "search", "build_results", "serialize"}),
+        ("Hook llamado por cada detección", len(records) == 2),
+        ("Tiempo por patrón (kmp)", len(records[0]["patterns_ms"]) == len(detector.patterns)),
+        ("Multi-patrón: sin tiempo por patrón", records[1]["patterns_ms"] == {}),
+        ("Histograma de búsqueda", snapshot["stages"]["search"]["count"] == 2),
+    ]
+    
+    for label, passed in checks:
+        print(f"{'[PASS]' if passed else '[FAIL]'} {label}")
+    print(f"\nEtapas (ms): {enabled['performance']['stages_ms']}")
+
+
+def test_prometheus_metrics():
+    """Prueba el formato de texto de Prometheus de MetricsRegistry."""
+    print_section("PRUEBA 35: Métricas en Formato Prometheus")
+    
+    registry = MetricsRegistry()
+    registry.counter("demo_requests_total", "Solicitudes de prueba")
+    registry.histogram("demo_latency_seconds", "Latencia de prueba", buckets=(0.01, 0.1))
+    registry.inc("demo_requests_total", {"endpoint": "/analyze", "algorithm": "kmp"})
+    registry.inc("demo_requests_total", {"endpoint": "/analyze", "algorithm": "kmp"})
+    registry.observe("demo_latency_seconds", 0.005, {"endpoint": "/analyze"})
+    registry.observe("demo_latency_seconds", 0.5, {"endpoint": "/analyze"})
+    registry.add_collector(lambda: [("demo_version", "gauge", "Versión", [({}, 3)])])
+    
+    text = registry.render()
+    print(text)
+    
+    expected = [
+        '# TYPE demo_requests_total counter',
+        'demo_requests_total{algorithm="kmp",endpoint="/analyze"} 2',
+        'demo_latency_seconds_bucket{endpoint="/analyze",le="0.01"} 1',
+        'demo_latency_seconds_bucket{endpoint="/analyze",le="0.1"} 1',
+        'demo_latency_seconds_bucket{endpoint="/analyze",le="+Inf"} 2',
+        'demo_latency_seconds_count{endpoint="/analyze"} 2',
+        'demo_version 3',
+    ]
+    for line in expected:
+        print(f"{'[PASS]' if line in text.splitlines() else '[FAIL]'} {line}")
+
+
+def test_pattern_stats():
+    """Prueba los contadores por patrón y el orden del modo triage."""
+    print_section("PRUEBA 36: Estadísticas por Patrón y Orden de Triage")
+    
+    detector = create_detector()
+    messages = [
+        "Hay un problema con el envío",
+        "Otro problema: el paquete no llego",
+        "Sigo con el problema, el producto está roto",
+        "Gracias, todo bien",
+    ]
+    for msg in messages:
+        detector.detect_all(msg, algorithm="kmp", use_cache=False)
+    # Desde la caché también cuenta como texto analizado
+    detector.detect_all(messages[0], algorithm="kmp")
+    detector.detect_all(messages[0], algorithm="kmp")
+    
+    stats = {entry["pattern"]: entry for entry in detector.pattern_stats.snapshot(detector.patterns)}
+    order = detector.pattern_stats.triage_order(detector.patterns)
+    levels = [detector.patterns[i]["alert_level"] for i in order]
+    high_order = [detector.patterns[i]["pattern"] for i in order if detector.patterns[i]["alert_level"] == "high"]
+    medium_order = [detector.patterns[i]["pattern"] for i in order if detector.patterns[i]["alert_level"] == "medium"]
+    triage = [r.pattern for r in detector.detect_triage(messages[2], algorithm="kmp")]
+    
+    checks = [
+        ("6 textos analizados", detector.pattern_stats.scans == 6),
+        ("'problema': 5 hits de 6", stats["problema"]["hits"] == 5 and stats["problema"]["scans"] == 6),
+        ("'roto': 1 hit", stats["roto"]["hits"] == 1),
+        ("Severidad primero (high, medium, low)", levels == sorted(levels, key=["high", "medium", "low"].index)),
+        ("Dentro de high: observados primero", high_order[:2] == ["no llego", "roto"] or high_order[:2] == ["roto", "no llego"]),
+        ("Dentro de medium: 'problema' primero", medium_order[0] == "problema"),
+        ("detect_triage: high antes que medium", triage == ["roto", "problema"]),
+        ("Sin instrumentación ni muestreo: costo no medido",
+         all(entry["cost_samples"] == 0 for entry in stats.values())),
+    ]
+    
+    for label, passed in checks:
+        print(f"{'[PASS]' if passed else '[FAIL]'} {label}")
+    print(f"\nOrden de triage: {[detector.patterns[i]['pattern'] for i in order][:6]} ...")
+    
+    # Muestreo explícito: 1 de cada 2 análisis mide el costo por patrón
+    detector.pattern_stats.cost_sample_every = 2
+    for msg in messages:
+        detector.detect_all(msg, algorithm="kmp", use_cache=False)
+    samples = max(e["cost_samples"] for e in detector.pattern_stats.snapshot(detector.patterns))
+    print(f"{'[PASS]' if samples == 2 else '[FAIL]'} Muestreo explícito (cada 2): {samples} muestras")
+
+
+def test_triage():
+    """Prueba el triage con corte temprano contra detect_all."""
+    print_section("PRUEBA 37: Triage con Corte Temprano")
+    
+    detector = create_detector()
+    rank = {"high": 0, "medium": 1, "low": 2}
+    messages = [
+        "El producto llegó roto y con un problema en la caja",
+        "Tengo un problema con la demora del envío",
+        "No entiendo las instrucciones",
+        "Gracias, todo llegó bien",
+        "El equipo no funcona",
+    ]
+    
+    for msg in messages:
+        for algorithm, full in [("substring", "kmp"), ("aho_corasick", "aho_corasick"), ("myers", "myers")]:
+            analysis = detector.detect_all(msg, algorithm=full, use_cache=False)
+            expected = min((d["alert_level"] for d in analysis["detections"]),
+                           key=rank.get, default=None)
+            result = detector.triage(msg, algorithm=algorithm)
+            passed = (result["max_alert_level"] == expected
+                      and result["has_complaints"] == analysis["has_complaints"])
+            print(f"{'[PASS]' if passed else '[FAIL]'} {algorithm:<13} '{msg[:35]}' -> "
+                  f"{result['max_alert_level']} ({result['patterns_checked']} patrones)")
+    
+    dirty = detector.triage(messages[0])
+    clean = detector.triage(messages[3])
+    print(f"{'[PASS]' if dirty['patterns_checked'] < dirty['total_patterns'] else '[FAIL]'} "
+          f"Corte temprano en el primer high ({dirty['pattern']})")
+    print(f"{'[PASS]' if clean['patterns_checked'] == clean['total_patterns'] else '[FAIL]'} "
+          f"Texto limpio: cada patrón probado una vez")
+
+
+def test_match_modes():
+    """Prueba los modos all / first / count y max_matches."""
+    print_section("PRUEBA 38: Modos de Resultado (all, first, count, max_matches)")
+    
+    text = "a" * 100_000
+    pattern = "aa"
+    reference = kmp_search(text, pattern)
+    engines = {
+        "kmp": kmp_search,
+        "boyer_moore": boyer_moore_search,
+        "horspool": horspool_search,
+        "sunday": sunday_search,
+        "shift_or": shift_or_search,
+    }
+    
+    for name, search_fn in engines.items():
+        passed = (search_fn(text, pattern, mode="first") == [0]
+                  and search_fn(text, pattern, mode="count") == len(reference)
+                  and search_fn(text, pattern, max_matches=3) == [0, 1, 2]
+                  and search_fn(text, pattern, mode="count", max_matches=10) == 10)
+        print(f"{'[PASS]' if passed else '[FAIL]'} {name}: first, count y max_matches")
+    
+    automaton = build_automaton(["aa", "aaa", "b"])
+    counts = aho_corasick_search(text, automaton, mode="count")
+    print(f"{'[PASS]' if counts == {0: 99_999, 1: 99_998} else '[FAIL]'} "
+          f"Aho-Corasick: conteo por patrón {counts}")
+    
+    detector = create_detector()
+    msg = "problema tras problema: " * 50 + "el producto llegó roto"
+    full = {d["pattern"]: d for d in detector.detect_all(msg)["detections"]}
+    counted = {d["pattern"]: d for d in detector.detect_all(msg, mode="count")["detections"]}
+    capped = {d["pattern"]: d for d in detector.detect_all(msg, max_matches=5)["detections"]}
+    
+    checks = [
+        ("count: mismo match_count sin posiciones",
+         all(counted[p]["match_count"] == full[p]["match_count"] and not counted[p]["positions"]
+             for p in full)),
+        ("max_matches=5: posiciones y spans acotados",
+         all(capped[p]["positions"] == full[p]["positions"][:5] and len(capped[p]["spans"]) == len(capped[p]["positions"])
+             for p in full)),
+        ("first: una posición por patrón",
+         all(len(r.positions) == 1 for r in detector.detect(msg, algorithm="kmp", mode="first"))),
+    ]
+    for label, passed in checks:
+        print(f"{'[PASS]' if passed else '[FAIL]'} {label}")
+    
+    try:
+        kmp_search(text, pattern, mode="some")
+        print("[FAIL] Modo inválido rechazado")
+    except ValueError:
+        print("[PASS] Modo inválido rechazado")
+
+
+def test_non_overlapping():
+    """Prueba las coincidencias sin solapamiento (overlapping=False)."""
+    print_section("PRUEBA 39: Coincidencias sin Solapamiento")
+    
+    cases = [
+        ("aaaaaaaaaa", "aaa", [0, 3, 6]),
+        ("rororororo", "roro", [0, 4]),
+        ("abcabcabc", "abc", [0, 3, 6]),
+        ("aabaabaab", "aab", [0, 3, 6]),
+    ]
+    engines = {
+        "kmp": kmp_search,
+        "boyer_moore": boyer_moore_search,
+        "boyer_moore_full": boyer_moore_full_search,
+        "horspool": horspool_search,
+        "sunday": sunday_search,
+        "shift_or": shift_or_search,
+    }
+    
+    for text, pattern, expected in cases:
+        failed = [name for name, search_fn in engines.items()
+                  if search_fn(text, pattern, overlapping=False) != expected]
+        multi = aho_corasick_search(text, build_automaton([pattern]), overlapping=False).get(0, [])
+        if multi != expected:
+            failed.append("aho_corasick")
+        status = "[PASS]" if not failed else "[FAIL]"
+        print(f"{status} '{text}' / '{pattern}' -> {expected}" + (f"  fallan: {failed}" if failed else ""))
+    
+    detector = create_detector()
+    analysis = detector.detect_all("roto rororo roro", algorithm="kmp", overlapping=False)
+    roro = next(d for d in analysis["detections"] if d["pattern"] == "roro")
+    spans_ok = all(a[1] <= b[0] for a, b in zip(roro["spans"], roro["spans"][1:]))
+    print(f"{'[PASS]' if spans_ok else '[FAIL]'} Detector: spans sin solapamiento {roro['spans']}")
+
+
+
+def test_detect_many():
+    """Prueba detect_many: mismos resultados y orden que detect_all en serie."""
+    print_section("PRUEBA 40: Detección en Paralelo (detect_many)")
+    
+    detector = create_detector()
+    texts = [
+        "Producto con defecto grave",
+        "Muy satisfecho con la compra",
+        "No funciona correctamente, es un problema",
+        "Pedido incompleto, dano en transito",
+    ] * 25
+    
+    def without_timing(analysis: dict) -> dict:
+        return {k: v for k, v in analysis.items() if k != "performance"}
+    
+    expected = [without_timing(detector.detect_all(t)) for t in texts]
+    for workers, chunksize in [(1, None), (2, None), (2, 7)]:
+        results = detector.detect_many(texts, workers=workers, chunksize=chunksize)
+        ok = [without_timing(r) for r in results] == expected
+        status = "[PASS]" if ok else "[FAIL]"
+        print(f"{status} workers={workers} chunksize={chunksize}: "
+              f"{len(results)} resultados en orden de entrada")
+    
+    try:
+        detector.detect_many(texts, workers=0)
+        print("[FAIL] workers=0 debería rechazarse")
+    except ValueError:
+        print("[PASS] workers=0 rechazado")
+
+
+def test_detection_executor():
+    """Prueba DetectionExecutor: mismos resultados en procesos e hilos."""
+    print_section("PRUEBA 41: Pool de Detección de la API (DetectionExecutor)")
+    
+    text = "Producto con defecto, llegó roto y no funciona"
+    
+    async def run_all(executor: DetectionExecutor) -> tuple:
+        analysis = await executor.run(ComplaintDetector.detect_all, text, algorithm="kmp")
+        triage = await executor.run(ComplaintDetector.triage, text)
+        compared = await executor.run(ComplaintDetector.compare, text, algorithms=("kmp", "myers"))
+        return analysis, triage, compared
+    
+    for backend in ("thread", "process"):
+        detector = create_detector()
+        expected = detector.detect_all(text, algorithm="kmp")
+        executor = DetectionExecutor(detector, backend=backend, workers=2)
+        try:
+            analysis, triage, compared = asyncio.run(run_all(executor))
+            ok = (analysis["detections"] == expected["detections"]
+                  and triage["has_complaints"]
+                  and compared["kmp"]["detections"] == expected["detections"])
+            status = "[PASS]" if ok else "[FAIL]"
+            print(f"{status} backend={backend}: detect_all, triage y compare iguales al detector")
+            
+            # Los workers reciben los patrones al crearse: las tareas solo llevan la versión
+            if backend == "process":
+                status = "[PASS]" if executor._payload is None else "[FAIL]"
+                print(f"{status} backend={backend}: patrones enviados solo al crear el pool")
+            
+            # Un patrón nuevo y la instrumentación llegan a los workers sin renovar el pool
+            pool = executor._current_pool()
+            detector.add_pattern("xyzzy", "prueba", "low", "Patrón de prueba")
+            detector.instrumentation.enabled = True
+            records = []
+            detector.instrumentation.add_hook(records.append)
+            cache_before = detector.result_cache.stats()
+            normalization_before = normalization_cache.stats()
+            scans_before = detector.pattern_stats.scans
+            analysis = asyncio.run(executor.run(ComplaintDetector.detect_all, "dice xyzzy",
+                                                fields=("pattern",)))
+            asyncio.run(executor.run(ComplaintDetector.detect_all, "dice xyzzy", fields=("pattern",)))
+            found = any(d["pattern"] == "xyzzy" for d in analysis["detections"])
+            ok = (found and executor._current_pool() is pool
+                  and analysis["patterns_version"] == detector.version)
+            status = "[PASS]" if ok else "[FAIL]"
+            print(f"{status} backend={backend}: patrón agregado visible sin renovar el pool")
+            
+            # Caché, pattern_stats e instrumentación de los workers se suman al detector
+            cache = detector.result_cache.stats()
+            xyzzy = next(e for e in detector.pattern_stats.snapshot(detector.patterns)
+                         if e["pattern"] == "xyzzy")
+            ok = (cache["hits"] - cache_before["hits"] == 1
+                  and cache["misses"] - cache_before["misses"] == 1
+                  and detector.pattern_stats.scans - scans_before == 2
+                  and xyzzy["hits"] == 2 and len(records) == 2
+                  and detector.instrumentation.snapshot()["stages"]["search"]["count"] >= 2)
+            status = "[PASS]" if ok else "[FAIL]"
+            print(f"{status} backend={backend}: caché +{cache['hits'] - cache_before['hits']} "
+                  f"aciertos, {detector.pattern_stats.scans - scans_before} scans, "
+                  f"{len(records)} registros de instrumentación")
+            
+            # La caché de normalización de los workers también se suma
+            normalization = normalization_cache.stats()
+            lookups = (normalization["hits"] + normalization["misses"]
+                       - normalization_before["hits"] - normalization_before["misses"])
+            status = "[PASS]" if lookups >= 1 and normalization["size"] >= 1 else "[FAIL]"
+            print(f"{status} backend={backend}: normalización +{lookups} consultas")
+        finally:
+            executor.shutdown()
+    
+    try:
+        DetectionExecutor(create_detector(), backend="gpu")
+        print("[FAIL] backend inválido debería rechazarse")
+    except ValueError:
+        print("[PASS] backend inválido rechazado")
+
+
+def test_compact_fields():
+    """Prueba detect_all(fields=...): mismos conteos, solo los campos pedidos."""
+    print_section("PRUEBA 42: Respuesta Compacta (fields / compact)")
+    
+    detector = create_detector()
+    text = "Producto con defecto, llegó roto y roto, no funciona"
+    
+    for algorithm in ("aho_corasick", "kmp", "myers"):
+        full = detector.detect_all(text, algorithm=algorithm)
+        compact = detector.detect_all(text, algorithm=algorithm, fields=COMPACT_FIELDS)
+        expected = [
+            ([p["pattern"] for p in detector.patterns].index(d["pattern"]), d["alert_level"], d["match_count"])
+            for d in full["detections"]
+        ]
+        got = [(d["pattern_index"], d["alert_level"], d["match_count"]) for d in compact["detections"]]
+        ok = (got == expected and all(set(d) == set(COMPACT_FIELDS) for d in compact["detections"])
+              and "original_text" not in compact and compact["patterns_version"] == detector.version)
+        status = "[PASS]" if ok else "[FAIL]"
+        print(f"{status} {algorithm}: {got}")
+    
+    spans = detector.detect_all(text, fields="pattern,spans")["detections"]
+    full_spans = [{"pattern": d["pattern"], "spans": d["spans"]} for d in detector.detect_all(text)["detections"]]
+    status = "[PASS]" if spans == full_spans else "[FAIL]"
+    print(f"{status} fields='pattern,spans' igual a la respuesta completa")
+    
+    try:
+        detector.detect_all(text, fields="pattern,inexistente")
+        print("[FAIL] campo inexistente debería rechazarse")
+    except ValueError:
+        print("[PASS] campo inexistente rechazado")
+
+
+def test_columnar_batch():
+    """Prueba detect_columnar: mismas coincidencias que detect_all, en columnas."""
+    print_section("PRUEBA 43: Lote en Formato Columnar")
+    
+    detector = create_detector()
+    texts = ["Llegó roto y roto", "Muy satisfecho", "Producto con defecto, no funciona", "roto"]
+    index = {p["pattern"]: i for i, p in enumerate(detector.patterns)}
+    
+    for mode in ("all", "count"):
+        columns = detector.detect_columnar(texts, algorithm="kmp", mode=mode)
+        expected = []
+        for m, text in enumerate(texts):
+            for d in detector.detect_all(text, algorithm="kmp", mode=mode)["detections"]:
+                if mode == "count":
+                    expected.append((m, index[d["pattern"]], d["match_count"]))
+                else:
+                    expected += [(m, index[d["pattern"]], p) for p in d["positions"]]
+        rows = list(zip(columns["message_index"], columns["pattern_index"],
+                        columns[columns["value_column"]]))
+        status = "[PASS]" if rows == expected else "[FAIL]"
+        print(f"{status} mode={mode}: {len(rows)} filas ({columns['value_column']})")
+    
+    roto = index["roto"]
+    status = "[PASS]" if columns["pattern_hits"][roto] == 2 else "[FAIL]"
+    print(f"{status} pattern_hits['roto'] = {columns['pattern_hits'][roto]} textos")
+    
+    merged = detector.detect_many(texts * 5, workers=2, chunksize=3, columnar=True)
+    single = detector.detect_columnar(texts * 5)
+    status = "[PASS]" if all(merged[k] == single[k] for k in single) else "[FAIL]"
+    print(f"{status} detect_many(columnar=True) con 2 workers igual a detect_columnar")
+
 def main():
     """Ejecuta todas las pruebas."""
     print("\n" + "=" * 60)
     print("  SISTEMA DE DETECCION DE RECLAMOS")
-    print("  Pruebas: normalize_text, KMP, Boyer-Moore, Detector")
+    print("  Pruebas: normalize_text, KMP, Boyer-Moore, Aho-Corasick, Detector")
     print("=" * 60)
     
     try:
@@ -473,6 +1259,45 @@ def main():
         test_boyer_moore_long_pattern()
         test_comparison_kmp_vs_boyer_moore()
         
+        # Pruebas Aho-Corasick
+        test_aho_corasick_vs_kmp()
+        
+        # Pruebas Boyer-Moore completo
+        test_boyer_moore_full()
+        
+        # Pruebas Horspool / Sunday
+        test_horspool_and_sunday()
+        
+        # Pruebas Wu-Manber
+        test_wu_manber_vs_kmp()
+        
+        # Pruebas Shift-Or
+        test_shift_or()
+        
+        # Pruebas Myers (aproximada)
+        test_myers_fuzzy()
+        
+        # Pruebas Streaming
+        test_streaming()
+        
+        # Pruebas Normalización
+        test_single_pass_normalization()
+        test_original_spans()
+        test_normalized_document()
+        test_normalization_cache()
+        test_result_cache()
+        test_snapshot_swap()
+        test_instrumentation()
+        test_prometheus_metrics()
+        test_pattern_stats()
+        test_triage()
+        test_match_modes()
+        test_non_overlapping()
+        test_detect_many()
+        test_detection_executor()
+        test_compact_fields()
+        test_columnar_batch()
+        
         # Pruebas Detector
         test_detector_basic()
         test_detector_with_both_algorithms()
@@ -485,7 +1310,7 @@ def main():
         test_detector_timing()
         
         print_section("TODAS LAS PRUEBAS COMPLETADAS")
-        
+    
     except Exception as e:
         print(f"\nError durante las pruebas: {e}")
         import traceback
@@ -6,6 +6,18 @@ Responsabilidad única: preparar texto para análisis de patrones.
 import unicodedata
 import string
 import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Hashable, Iterable, Iterator, Optional, Union
+
+
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Último espacio de un texto (seguido solo de caracteres que no son espacio)
+_LAST_SPACE_RE = re.compile(r'\s\S*\Z')
+_TOKEN_RE = re.compile(r'\S+')
 
 
 def remove_accents(text: str) -> str:
@@ -32,10 +44,75 @@ def remove_punctuation(text: str) -> str:
     Returns:
         Texto sin puntuación
     """
-    return text.translate(str.maketrans('', '', string.punctuation))
+    return text.translate(_PUNCTUATION_TABLE)
+
+
+# Tabla ASCII: A-Z → a-z y puntuación → eliminada, en una sola traducción
+_ASCII_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase,
+                             string.punctuation)
+
+
+class _FoldTable(dict):
+    """
+    Tabla de traducción perezosa para str.translate.
+    
+    Cada carácter se calcula una sola vez con la cadena original
+    (minúsculas → NFD sin marcas Mn → sin puntuación) y queda en caché;
+    las llamadas siguientes con el mismo carácter no tocan unicodedata.
+    """
+    
+    def __init__(self):
+        super().__init__(_ASCII_TABLE)
+        # Caracteres cuya traducción conserva marcas combinantes que NFD
+        # reordenaría respecto de sus vecinos (p.ej. U+1D165)
+        self.contextual: set[str] = set()
+    
+    def __missing__(self, code: int) -> Optional[str]:
+        char = chr(code)
+        folded = remove_punctuation(remove_accents(char.lower()))
+        if any(unicodedata.combining(c) for c in folded):
+            self.contextual.add(char)
+        value = folded if folded != char else code
+        self[code] = value
+        return value
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold_text(text: str) -> str:
+    """
+    Minúsculas, sin tildes y sin puntuación en una sola pasada.
+    
+    Equivale a remove_punctuation(remove_accents(text.lower())), pero usa
+    una tabla de traducción precalculada en lugar de tres recorridos:
+        - Texto ASCII: una sola llamada a str.translate con tabla fija
+        - Resto: tabla perezosa por carácter (_FoldTable)
+    
+    La sigma final griega depende del contexto en str.lower(), por lo que
+    si aparece 'Σ' se aplica lower() antes de traducir.
+    
+    Args:
+        text: Texto bruto
+    
+    Returns:
+        Texto en minúsculas, sin acentos ni puntuación (espacios intactos)
+    """
+    if text.isascii():
+        return text.translate(_ASCII_TABLE)
+    
+    if 'Σ' in text:
+        text = text.lower()
+    
+    folded = text.translate(_FOLD_TABLE)
+    
+    if _FOLD_TABLE.contextual and not _FOLD_TABLE.contextual.isdisjoint(text):
+        return remove_punctuation(remove_accents(text.lower()))
+    
+    return folded
 
 
-def normalize_text(text: str) -> str:
+def normalize_text(text: str, with_offsets: bool = False) -> Union[str, tuple[str, array]]:
     """
     Normaliza texto: minúsculas, elimina tildes y puntuación.
     
@@ -43,15 +120,82 @@ def normalize_text(text: str) -> str:
     
     Args:
         text: Texto bruto
+        with_offsets: Si es True, retorna también el mapa de posiciones
+            hacia el texto original (ver normalize_with_offsets)
     
     Returns:
-        Texto normalizado para análisis de patrones
+        Texto normalizado para análisis de patrones, o tupla
+        (texto normalizado, offsets) si with_offsets es True
     
     Proceso:
-        1. Convierte a minúsculas
-        2. Elimina acentos/tildes
-        3. Elimina signos de puntuación
-        4. Normaliza espacios
+        1. Minúsculas, acentos y puntuación en una pasada (fold_text)
+        2. Normaliza espacios
+    
+    El resultado es idéntico al de normalize_text_reference.
+    """
+    if with_offsets:
+        return normalize_with_offsets(text)
+    return ' '.join(fold_text(text).split())
+
+
+def normalize_with_offsets(text: str) -> tuple[str, array]:
+    """
+    Normaliza texto y construye en la misma pasada el mapa de posiciones
+    del texto normalizado al texto original.
+    
+    offsets[i] es el índice en `text` del carácter que produjo el carácter
+    i del texto normalizado; para el espacio que reemplaza un bloque de
+    espacios, el índice del primer espacio del bloque. Una coincidencia
+    normalizada [s, e) corresponde a text[offsets[s]:offsets[e - 1] + 1].
+    
+    El texto se recorre por palabras (bloques sin espacios): las palabras
+    ASCII sin puntuación se mapean 1:1 sin bucle por carácter.
+    
+    Args:
+        text: Texto bruto
+    
+    Returns:
+        Tupla (texto normalizado idéntico a normalize_text(text),
+        array('I') con len(texto normalizado) posiciones)
+    """
+    parts = []
+    offsets = array('I')
+    gap = 0
+    
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        folded = fold_text(token)
+        if not folded:
+            continue
+        
+        start = match.start()
+        if parts:
+            parts.append(' ')
+            offsets.append(gap)
+        parts.append(folded)
+        
+        if token.isascii() and len(folded) == len(token):
+            offsets.extend(range(start, match.end()))
+        else:
+            # Cada carácter puede desaparecer (puntuación, marcas) o expandirse
+            for i, char in enumerate(token, start):
+                for _ in fold_text(char):
+                    offsets.append(i)
+        gap = match.end()
+    
+    return ''.join(parts), offsets
+
+
+def normalize_text_reference(text: str) -> str:
+    """
+    Implementación original en varias pasadas (lower, NFD, translate, regex).
+    Se conserva como referencia para verificar y medir normalize_text.
+    
+    Args:
+        text: Texto bruto
+    
+    Returns:
+        Texto normalizado para análisis de patrones
     """
     text = text.lower()
     text = remove_accents(text)
@@ -60,6 +204,281 @@ def normalize_text(text: str) -> str:
     return text
 
 
+def _split_at_words(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Reagrupa fragmentos para que cada uno termine en un espacio (salvo el
+    último): la palabra incompleta del final se retiene hasta el siguiente.
+    """
+    pending: list[str] = []
+    
+    for chunk in chunks:
+        match = _LAST_SPACE_RE.search(chunk)
+        if match is None:
+            pending.append(chunk)
+            continue
+        
+        cut = match.start() + 1
+        pending.append(chunk[:cut])
+        yield ''.join(pending)
+        pending = [chunk[cut:]]
+    
+    if pending:
+        yield ''.join(pending)
+
+
+def normalize_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Normaliza un texto que llega en fragmentos, sin cargarlo completo.
+    
+    La concatenación de los fragmentos producidos es idéntica a
+    normalize_text(''.join(chunks)): los espacios se colapsan también a
+    través de los límites entre fragmentos y se eliminan al inicio y al
+    final del flujo.
+    
+    Algunos caracteres se pliegan según sus vecinos dentro de la palabra
+    (la sigma final griega, marcas combinantes), así que cada fragmento se
+    procesa hasta su último espacio y la palabra incompleta espera al
+    siguiente. La memoria es O(fragmento + palabra más larga).
+    
+    Args:
+        chunks: Iterable de fragmentos de texto bruto
+    
+    Yields:
+        Fragmentos de texto normalizado (nunca vacíos)
+    """
+    started = False
+    pending_space = False
+    
+    for chunk in _split_at_words(chunks):
+        text = fold_text(chunk)
+        text = _WHITESPACE_RE.sub(' ', text)
+        core = text.strip()
+        
+        if not core:
+            # Fragmento vacío o solo espacios: a lo sumo un espacio pendiente
+            pending_space = pending_space or (started and bool(text))
+            continue
+        
+        if started and (pending_space or text[0] == ' '):
+            core = ' ' + core
+        
+        started = True
+        pending_space = text[-1] == ' '
+        yield core
+
+
+class NormalizedDocument:
+    """
+    Texto normalizado una sola vez y compartido por todas las búsquedas de
+    una solicitud (detect, detect_all, detect_single_pattern, /compare).
+    
+    El texto normalizado se calcula al crear el documento; las palabras y
+    el mapa de posiciones se calculan al primer uso y quedan en caché.
+    """
+    
+    def __init__(self, text: str, with_offsets: bool = False):
+        """
+        Args:
+            text: Texto bruto
+            with_offsets: Construir el mapa de posiciones en la misma pasada
+                que la normalización (conviene si se van a pedir spans)
+        """
+        self.original = text
+        self._tokens: Optional[list[str]] = None
+        self._offsets: Optional[array] = None
+        
+        if with_offsets:
+            self.normalized, self._offsets = normalize_with_offsets(text)
+        else:
+            self.normalized = normalize_text(text)
+    
+    @property
+    def tokens(self) -> list[str]:
+        """Palabras del texto normalizado."""
+        if self._tokens is None:
+            self._tokens = tokenize(self.normalized)
+        return self._tokens
+    
+    @property
+    def offsets(self) -> array:
+        """Mapa de posiciones normalizado → original (ver normalize_with_offsets)."""
+        if self._offsets is None:
+            _, self._offsets = normalize_with_offsets(self.original)
+        return self._offsets
+    
+    def __len__(self) -> int:
+        """Longitud del texto normalizado."""
+        return len(self.normalized)
+
+
+class NormalizationCache:
+    """
+    Caché LRU acotada y segura entre hilos de NormalizedDocument por texto
+    bruto. Pensada para mensajes repetidos ("no funciona", plantillas) y
+    para los patrones, que se normalizan en cada carga.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: Máximo de textos en caché (0 desactiva la caché)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._chars = 0
+        self._entries: OrderedDict[str, NormalizedDocument] = OrderedDict()
+        # Tamaño informado por otras cachés (p.ej. procesos worker)
+        self._remote_sizes: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+    
+    def get_document(self, text: str, with_offsets: bool = False) -> NormalizedDocument:
+        """
+        Retorna el documento normalizado de `text`, desde la caché si existe.
+        
+        La normalización se hace fuera del lock; si dos hilos normalizan el
+        mismo texto a la vez, ambos resultados son idénticos.
+        
+        Args:
+            text: Texto bruto
+            with_offsets: Asegurar que el documento tenga mapa de posiciones
+        
+        Returns:
+            NormalizedDocument (compartido: no debe modificarse)
+        """
+        with self._lock:
+            document = self._entries.get(text)
+            if document is not None:
+                self._entries.move_to_end(text)
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        if document is not None:
+            if with_offsets:
+                # Construye el mapa si el documento en caché aún no lo tenía
+                document.offsets
+            return document
+        
+        document = NormalizedDocument(text, with_offsets)
+        if self.maxsize <= 0:
+            return document
+        
+        with self._lock:
+            if text not in self._entries:
+                self._entries[text] = document
+                self._chars += len(text) + len(document.normalized)
+                self._evict()
+        
+        return document
+    
+    def normalize(self, text: str) -> str:
+        """Equivalente a normalize_text(text), usando la caché."""
+        return self.get_document(text).normalized
+    
+    def resize(self, maxsize: int) -> None:
+        """
+        Cambia el tamaño máximo, descartando los textos menos usados.
+        
+        Args:
+            maxsize: Máximo de textos en caché (0 desactiva la caché)
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+    
+    def merge(self, hits: int, misses: int, source: Hashable, size: int) -> None:
+        """
+        Suma el uso de otra caché (p.ej. la de un proceso worker) a los
+        contadores de esta, para que stats() refleje ambas.
+        
+        Args:
+            hits: Aciertos nuevos de la otra caché
+            misses: Fallos nuevos de la otra caché
+            source: Identificador de la otra caché
+            size: Textos actuales de la otra caché (reemplaza el valor anterior)
+        """
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self._remote_sizes[source] = size
+    
+    def forget_remote(self) -> None:
+        """Descarta los tamaños informados por merge (p.ej. al cerrar los workers)."""
+        with self._lock:
+            self._remote_sizes.clear()
+    
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._remote_sizes.clear()
+            self._chars = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def _evict(self) -> None:
+        """Descarta las entradas menos usadas hasta respetar maxsize (con lock)."""
+        while len(self._entries) > max(self.maxsize, 0):
+            text, document = self._entries.popitem(last=False)
+            self._chars -= len(text) + len(document.normalized)
+    
+    def stats(self) -> dict:
+        """
+        Estadísticas para ajustar el tamaño de la caché.
+        
+        Returns:
+            Diccionario con tamaño (incluidas las cachés remotas), aciertos,
+            fallos, tasa de aciertos y caracteres almacenados localmente
+            (texto bruto + normalizado)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries) + sum(self._remote_sizes.values()),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "cached_chars": self._chars,
+            }
+
+
+# Caché compartida por ComplaintDetector y la API
+normalization_cache = NormalizationCache()
+
+
+def normalize_cached(text: str) -> str:
+    """
+    normalize_text con memoización LRU (ver normalization_cache).
+    
+    Args:
+        text: Texto bruto
+    
+    Returns:
+        Texto normalizado
+    """
+    return normalization_cache.normalize(text)
+
+
+def as_document(text: Union[str, NormalizedDocument],
+                with_offsets: bool = False) -> NormalizedDocument:
+    """
+    Retorna `text` si ya es un NormalizedDocument; si es str, lo obtiene de
+    normalization_cache (normalizándolo si no estaba).
+    
+    Args:
+        text: Texto bruto o documento ya normalizado
+        with_offsets: Asegurar también el mapa de posiciones
+    
+    Returns:
+        NormalizedDocument
+    """
+    if isinstance(text, NormalizedDocument):
+        return text
+    return normalization_cache.get_document(text, with_offsets)
+
+
 def normalize(text: str) -> str:
     """Alias para normalize_text (compatibilidad)."""
     return normalize_text(text)
@@ -5,13 +5,317 @@ Responsabilidad única: detectar patrones de reclamos usando algoritmos de búsq
 
 import csv
 import os
+import threading
 import time
-from dataclasses import dataclass
-from typing import Optional
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence, Union
 
-from preprocessing.normalize import normalize_text
-from algorithms.kmp import kmp_search
-from algorithms.boyer_moore import boyer_moore_search
+from preprocessing.normalize import (
+    NormalizedDocument,
+    as_document,
+    normalize_cached,
+    normalize_stream,
+)
+from algorithms.kmp import kmp_search, build_lps, KMPStream
+from algorithms.boyer_moore import (
+    BoyerMooreStream,
+    boyer_moore_search,
+    boyer_moore_full_search,
+    build_bad_char_table,
+    build_good_suffix_table,
+)
+from algorithms.horspool import horspool_search, build_horspool_shift_table
+from algorithms.sunday import sunday_search, build_sunday_shift_table
+from algorithms.shift_or import (
+    build_shift_or_masks,
+    build_shift_or_multi,
+    shift_or_multi_search,
+    shift_or_search,
+)
+from algorithms.myers import build_peq, myers_exists, myers_search
+from algorithms.result_modes import MATCH_MODES, match_limit
+from services.result_cache import ResultCache, text_digest
+from services.instrumentation import Instrumentation, StageTimer
+from services.pattern_stats import PatternStats
+from algorithms.aho_corasick import (
+    AhoCorasickStream,
+    aho_corasick_matched,
+    aho_corasick_search,
+    aho_corasick_search_single,
+    build_automaton,
+)
+from algorithms.wu_manber import (
+    build_wu_manber_tables,
+    wu_manber_search,
+    wu_manber_search_single,
+)
+
+
+def _fuzzy_positions(hits: Union[list[tuple[int, int]], int]) -> Union[list[int], int]:
+    """Posiciones de inicio de una búsqueda aproximada (o su cantidad en modo "count")."""
+    if isinstance(hits, int):
+        return hits
+    return [start for start, _ in hits]
+
+
+# Algoritmos que buscan un patrón por pasada: nombre -> función (text, pattern)
+SEARCH_FUNCTIONS = {
+    "kmp": kmp_search,
+    "boyer_moore": boyer_moore_search,
+    "boyer_moore_full": boyer_moore_full_search,
+    "horspool": horspool_search,
+    "sunday": sunday_search,
+    "shift_or": shift_or_search,
+    "aho_corasick": aho_corasick_search_single,
+    "wu_manber": wu_manber_search_single,
+    "shift_or_multi": shift_or_search,
+    "myers": lambda text, pattern, **options: _fuzzy_positions(
+        myers_search(text, pattern, **options)
+    ),
+}
+
+# Algoritmos que recorren el texto una sola vez para todos los patrones:
+# nombre -> (construir índice(patrones), buscar(text, índice) -> posiciones por patrón)
+MULTI_PATTERN_ALGORITHMS = {
+    "aho_corasick": (build_automaton, aho_corasick_search),
+    "wu_manber": (build_wu_manber_tables, wu_manber_search),
+    "shift_or_multi": (build_shift_or_multi, shift_or_multi_search),
+}
+
+ALGORITHMS = tuple(SEARCH_FUNCTIONS)
+
+# Algoritmos con matcher incremental para detect_stream
+STREAM_ALGORITHMS = ("aho_corasick", "kmp", "boyer_moore")
+
+DEFAULT_ALGORITHM = "aho_corasick"
+
+# Estrategias de triage (solo existencia, sin posiciones):
+# - substring: `in` de Python por patrón, en orden de triage
+# - aho_corasick: una pasada para todos los patrones, corta en el primer high
+# - myers: existencia aproximada por patrón (max_errors), en orden de triage
+TRIAGE_ALGORITHMS = ("substring", "aho_corasick", "myers")
+
+DEFAULT_TRIAGE_ALGORITHM = "substring"
+
+# Campos de cada detección que se pueden pedir con detect_all(fields=...)
+DETECTION_FIELDS = (
+    "pattern_index", "pattern", "category", "alert_level", "alert_message",
+    "positions", "found", "match_count", "edit_distances", "spans",
+)
+
+# fields=COMPACT_FIELDS: índice del patrón (en detector.patterns), nivel y conteo
+COMPACT_FIELDS = ("pattern_index", "alert_level", "match_count")
+
+# Campos que requieren las posiciones (sin ellos basta con contar)
+POSITION_FIELDS = frozenset({"positions", "spans", "edit_distances"})
+
+# Tipo de los arreglos de detect_columnar (enteros sin signo)
+COLUMN_TYPECODE = "L"
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """
+    Patrón normalizado con sus tablas de búsqueda precalculadas.
+    Se construye al cargar/agregar/actualizar patrones, no en cada detect.
+    """
+    normalized: str
+    lps: list[int]
+    bad_char: dict[str, int]
+    good_suffix: list[int]
+    horspool_shift: dict[str, int]
+    sunday_shift: dict[str, int]
+    shift_or_masks: dict[str, int]
+    max_errors: int
+    peq: dict[str, int]
+
+
+def compile_pattern(pattern: str, max_errors: int = 0) -> CompiledPattern:
+    """
+    Normaliza un patrón y precalcula las tablas de todos los algoritmos.
+    
+    Args:
+        pattern: Patrón tal como está en patterns.csv
+        max_errors: Errores de edición permitidos en la búsqueda aproximada
+    
+    Returns:
+        CompiledPattern listo para las funciones de búsqueda
+    """
+    normalized = normalize_cached(pattern)
+    return CompiledPattern(
+        normalized=normalized,
+        lps=build_lps(normalized),
+        bad_char=build_bad_char_table(normalized),
+        good_suffix=build_good_suffix_table(normalized),
+        horspool_shift=build_horspool_shift_table(normalized),
+        sunday_shift=build_sunday_shift_table(normalized),
+        shift_or_masks=build_shift_or_masks(normalized),
+        max_errors=max_errors,
+        peq=build_peq(normalized),
+    )
+
+
+# Búsqueda con tablas precalculadas: nombre -> función (text, CompiledPattern,
+# **opciones: mode, max_matches, overlapping)
+COMPILED_SEARCH_FUNCTIONS = {
+    "kmp": lambda text, cp, **options: kmp_search(text, cp.normalized, cp.lps, **options),
+    "boyer_moore": lambda text, cp, **options: boyer_moore_search(
+        text, cp.normalized, cp.bad_char, **options
+    ),
+    "boyer_moore_full": lambda text, cp, **options: boyer_moore_full_search(
+        text, cp.normalized, cp.bad_char, cp.good_suffix, **options
+    ),
+    "horspool": lambda text, cp, **options: horspool_search(
+        text, cp.normalized, cp.horspool_shift, **options
+    ),
+    "sunday": lambda text, cp, **options: sunday_search(
+        text, cp.normalized, cp.sunday_shift, **options
+    ),
+    "shift_or": lambda text, cp, **options: shift_or_search(
+        text, cp.normalized, cp.shift_or_masks, **options
+    ),
+}
+
+# Búsqueda aproximada (usa el max_errors de cada patrón):
+# nombre -> función (text, CompiledPattern, **opciones) -> [(posición, distancia)]
+FUZZY_SEARCH_FUNCTIONS = {
+    "myers": lambda text, cp, **options: myers_search(
+        text, cp.normalized, cp.max_errors, cp.peq, **options
+    ),
+}
+
+# Algoritmos de coincidencia exacta: encuentran lo mismo, así que sus
+# tiempos son comparables entre sí (/compare); los aproximados no
+EXACT_ALGORITHMS = tuple(a for a in ALGORITHMS if a not in FUZZY_SEARCH_FUNCTIONS)
+
+
+def validate_max_errors(pattern: str, max_errors: int) -> None:
+    """
+    Verifica que el presupuesto de errores sea menor que el patrón normalizado.
+    
+    Raises:
+        ValueError: Si max_errors es negativo o no deja caracteres exactos
+    """
+    length = len(normalize_cached(pattern))
+    if max_errors < 0 or (max_errors and max_errors >= length):
+        raise ValueError(
+            f"max_errors debe estar entre 0 y {max(length - 1, 0)} para '{pattern}'"
+        )
+
+
+def validate_algorithm(algorithm: str) -> None:
+    """
+    Verifica que el nombre de algoritmo sea soportado.
+    
+    Raises:
+        ValueError: Si el algoritmo no existe
+    """
+    if algorithm not in SEARCH_FUNCTIONS:
+        raise ValueError(f"Algoritmo debe ser uno de: {', '.join(ALGORITHMS)}")
+
+
+def validate_fields(fields: Union[str, Sequence[str]]) -> tuple[str, ...]:
+    """
+    Normaliza una selección de campos de detección.
+    
+    Args:
+        fields: Nombres separados por comas ("pattern_index,match_count") o
+            secuencia de nombres (ver DETECTION_FIELDS)
+    
+    Returns:
+        Tupla de campos, sin repetidos y en el orden indicado
+    
+    Raises:
+        ValueError: Si no hay campos o alguno no existe
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    selected = tuple(dict.fromkeys(f.strip() for f in fields if f.strip()))
+    unknown = [f for f in selected if f not in DETECTION_FIELDS]
+    if not selected or unknown:
+        raise ValueError(f"Campos deben ser uno o más de: {', '.join(DETECTION_FIELDS)}")
+    return selected
+
+
+@dataclass(frozen=True)
+class PatternSnapshot:
+    """
+    Conjunto inmutable de patrones con sus tablas compiladas.
+    
+    El detector publica un snapshot nuevo en cada modificación y cada
+    búsqueda usa el snapshot vigente al comenzar, sin locks: nunca ve una
+    lista a medio actualizar. Los diccionarios de `patterns` no deben
+    modificarse.
+    """
+    patterns: tuple[dict, ...]
+    compiled: tuple[CompiledPattern, ...]
+    version: int
+    # Índices multi-patrón (autómata Aho–Corasick, tablas Wu–Manber, ...)
+    # construidos a demanda; solo se agregan entradas, nunca se modifican
+    indexes: dict[str, object] = field(default_factory=dict, compare=False, repr=False)
+    
+    def get_index(self, algorithm: str) -> object:
+        """
+        Retorna el índice multi-patrón del algoritmo, construyéndolo una
+        sola vez por snapshot. Si dos hilos lo construyen a la vez, ambos
+        índices son equivalentes y se conserva el primero.
+        """
+        index = self.indexes.get(algorithm)
+        if index is None:
+            build_index, _ = MULTI_PATTERN_ALGORITHMS[algorithm]
+            index = self.indexes.setdefault(
+                algorithm, build_index([cp.normalized for cp in self.compiled])
+            )
+        return index
+
+
+def _timed_search(search_fn: Callable, normalized_text: str,
+                  snapshot: PatternSnapshot, timer: StageTimer, **options) -> list:
+    """
+    Aplica search_fn a cada patrón del snapshot midiendo cada búsqueda
+    (solo con la instrumentación activada).
+    
+    Args:
+        options: mode / max_matches / overlapping, se pasan a search_fn
+    
+    Returns:
+        Resultados por patrón, igual que la lista por comprensión sin medir
+    """
+    results = []
+    patterns_ms = timer.patterns_ms
+    
+    for pattern_data, cp in zip(snapshot.patterns, snapshot.compiled):
+        start = time.perf_counter()
+        results.append(search_fn(normalized_text, cp, **options))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        name = pattern_data['pattern']
+        patterns_ms[name] = patterns_ms.get(name, 0.0) + elapsed_ms
+    
+    return results
+
+
+def original_spans(positions: list[int], length: int,
+                   offsets: array) -> list[tuple[int, int]]:
+    """
+    Traduce posiciones del texto normalizado a spans del texto original.
+    
+    Args:
+        positions: Posiciones de inicio en el texto normalizado
+        length: Longitud de la coincidencia en el texto normalizado (para
+            coincidencias aproximadas, la longitud del patrón)
+        offsets: Mapa construido por normalize_with_offsets
+    
+    Returns:
+        Lista de tuplas (inicio, fin) sobre el texto original, fin exclusivo
+    """
+    last = len(offsets) - 1
+    return [
+        (offsets[start], offsets[min(start + length - 1, last)] + 1)
+        for start in positions
+    ]
 
 
 @dataclass
@@ -22,39 +326,104 @@ class DetectionResult:
     alert_level: str
     alert_message: str
     positions: list[int]
+    edit_distances: Optional[list[int]] = None
+    spans: Optional[list[tuple[int, int]]] = None
+    # Solo en modo "count" (positions queda vacía); si no, len(positions)
+    count: Optional[int] = None
+    # Posición del patrón en el snapshot (detector.patterns)
+    index: Optional[int] = None
     
     def to_dict(self) -> dict:
         """Convierte resultado a diccionario."""
-        return {
+        match_count = self.count if self.count is not None else len(self.positions)
+        result = {
             "pattern": self.pattern,
             "category": self.category,
             "alert_level": self.alert_level,
             "alert_message": self.alert_message,
             "positions": self.positions,
-            "found": len(self.positions) > 0,
-            "match_count": len(self.positions)
+            "found": match_count > 0,
+            "match_count": match_count
         }
+        if self.edit_distances is not None:
+            result["edit_distances"] = self.edit_distances
+        if self.spans is not None:
+            result["spans"] = [list(span) for span in self.spans]
+        return result
+    
+    def select(self, fields: Sequence[str]) -> dict:
+        """
+        Convierte resultado a diccionario con solo los campos indicados
+        (ver DETECTION_FIELDS; pattern_index es la posición del patrón).
+        """
+        match_count = self.count if self.count is not None else len(self.positions)
+        result = {}
+        for name in fields:
+            if name == "pattern_index":
+                result[name] = self.index
+            elif name == "match_count":
+                result[name] = match_count
+            elif name == "found":
+                result[name] = match_count > 0
+            elif name == "spans" and self.spans is not None:
+                result[name] = [list(span) for span in self.spans]
+            else:
+                result[name] = getattr(self, name)
+        return result
 
 
 class ComplaintDetector:
     """Detector de reclamos basado en búsqueda de patrones."""
     
-    def __init__(self, patterns_file: str):
+    def __init__(self, patterns_file: Optional[str], result_cache_size: int = 1024,
+                 result_cache_ttl: Optional[float] = None):
         """
         Inicializa el detector cargando patrones desde archivo.
         
         Args:
-            patterns_file: Ruta al archivo CSV con patrones
+            patterns_file: Ruta al archivo CSV con patrones (None = sin
+                patrones; ver load_pattern_list)
+            result_cache_size: Máximo de resultados en caché (0 la desactiva)
+            result_cache_ttl: Segundos de validez de cada resultado (None = sin caducidad)
         """
-        self.patterns = []
-        self.load_patterns(patterns_file)
+        self.result_cache = ResultCache(result_cache_size, result_cache_ttl)
+        # Tiempos por etapa y por patrón (desactivada por defecto)
+        self.instrumentation = Instrumentation()
+        # Frecuencia de aparición y costo por patrón (orden de triage)
+        self.pattern_stats = PatternStats()
+        self._snapshot = PatternSnapshot(patterns=(), compiled=(), version=0)
+        # Serializa a los escritores (CRUD, recarga); los lectores no lo usan
+        self._write_lock = threading.Lock()
+        if patterns_file is not None:
+            self.load_patterns(patterns_file)
+    
+    @property
+    def patterns(self) -> tuple[dict, ...]:
+        """Patrones del snapshot vigente (solo lectura)."""
+        return self._snapshot.patterns
+    
+    @property
+    def snapshot(self) -> PatternSnapshot:
+        """Snapshot vigente: patrones, versión y tablas compiladas (inmutable)."""
+        return self._snapshot
+    
+    @property
+    def version(self) -> int:
+        """
+        Versión del snapshot vigente. Se incrementa con cada cambio de
+        patrones y forma parte de la clave de result_cache, así los
+        resultados anteriores dejan de usarse.
+        """
+        return self._snapshot.version
     
     def load_patterns(self, patterns_file: str) -> None:
         """
-        Carga patrones desde archivo CSV.
+        Carga patrones desde archivo CSV, reemplazando los actuales.
         
         Formato esperado:
-        pattern,category,alert_level,alert_message
+        pattern,category,alert_level,alert_message[,max_errors]
+        
+        La columna max_errors es opcional (0 = solo coincidencia exacta).
         
         Args:
             patterns_file: Ruta al archivo CSV
@@ -62,108 +431,443 @@ class ComplaintDetector:
         if not os.path.exists(patterns_file):
             raise FileNotFoundError(f"Archivo de patrones no encontrado: {patterns_file}")
         
+        patterns = []
         with open(patterns_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                self.patterns.append({
+                patterns.append({
                     'pattern': row['pattern'].strip(),
                     'category': row['category'].strip(),
                     'alert_level': row['alert_level'].strip(),
                     'alert_message': row['alert_message'].strip(),
+                    'max_errors': int((row.get('max_errors') or '0').strip() or 0),
                 })
+        
+        self.load_pattern_list(patterns)
+    
+    def load_pattern_list(self, patterns: Iterable[dict],
+                          version: Optional[int] = None) -> None:
+        """
+        Compila y publica una lista de patrones ya leída, reemplazando los
+        actuales (p.ej. el snapshot de otro detector, en los workers de
+        detect_many y de DetectionExecutor).
+        
+        Args:
+            patterns: Diccionarios con pattern, category, alert_level,
+                alert_message y max_errors
+            version: Versión a publicar, p.ej. la del detector de origen
+                (None = la actual + 1)
+        """
+        patterns = [dict(p) for p in patterns]
+        compiled = [compile_pattern(p['pattern'], p['max_errors']) for p in patterns]
+        
+        with self._write_lock:
+            self._publish(patterns, compiled, version)
+    
+    def _publish(self, patterns: list[dict], compiled: list[CompiledPattern],
+                 version: Optional[int] = None) -> None:
+        """
+        Construye un snapshot nuevo y lo reemplaza atómicamente.
+        Debe llamarse con _write_lock tomado.
+        
+        El índice del algoritmo por defecto se construye aquí, fuera del
+        camino de las búsquedas; los demás, a demanda.
+        """
+        snapshot = PatternSnapshot(
+            patterns=tuple(patterns),
+            compiled=tuple(compiled),
+            version=self._snapshot.version + 1 if version is None else version,
+        )
+        if DEFAULT_ALGORITHM in MULTI_PATTERN_ALGORITHMS:
+            snapshot.get_index(DEFAULT_ALGORITHM)
+        self._snapshot = snapshot
     
-    def detect(self, text: str, algorithm: str = "kmp") -> list[DetectionResult]:
+    def detect(self, text: Union[str, NormalizedDocument],
+               algorithm: str = DEFAULT_ALGORITHM,
+               use_cache: bool = True, mode: str = "all",
+               max_matches: Optional[int] = None,
+               overlapping: bool = True) -> list[DetectionResult]:
         """
         Detecta patrones en el texto.
         
         Args:
-            text: Texto a analizar
-            algorithm: "kmp" o "boyer_moore"
+            text: Texto a analizar o NormalizedDocument ya normalizado
+            algorithm: Nombre del algoritmo (ver ALGORITHMS)
+            use_cache: Usar result_cache (False fuerza el escaneo, p.ej. al medir tiempos)
+            mode: "all", "first" o "count" (ver algorithms.result_modes)
+            max_matches: Tope de posiciones (o de conteo) por patrón
+            overlapping: False = solo coincidencias sin solapamiento de cada
+                patrón, de izquierda a derecha
         
         Returns:
             Lista de resultados de detección
         """
-        if algorithm not in ["kmp", "boyer_moore"]:
-            raise ValueError("Algoritmo debe ser 'kmp' o 'boyer_moore'")
+        validate_algorithm(algorithm)
+        match_limit(mode, max_matches)
         
-        # Normalizar texto
-        normalized_text = normalize_text(text)
+        timer = self.instrumentation.timer()
+        snapshot = self._snapshot
+        document = as_document(text)
+        if timer:
+            timer.mark("normalize")
         
-        # Seleccionar algoritmo de búsqueda
-        search_fn = kmp_search if algorithm == "kmp" else boyer_moore_search
+        all_positions, all_distances, cache_hit = self._cached_search(
+            snapshot, document.normalized, algorithm, use_cache, timer,
+            mode, max_matches, overlapping
+        )
+        if timer:
+            timer.mark("search")
+        
+        results = self._build_results(snapshot, all_positions, all_distances)
+        if timer:
+            timer.mark("build_results")
+            self.instrumentation.observe(timer, algorithm, len(document), cache_hit)
+        return results
+    
+    @staticmethod
+    def _search(snapshot: PatternSnapshot, normalized_text: str, algorithm: str,
+                timer: Optional[StageTimer] = None, mode: str = "all",
+                max_matches: Optional[int] = None, overlapping: bool = True
+                ) -> tuple[dict[int, Any], Optional[dict[int, list[int]]]]:
+        """
+        Busca todos los patrones de un snapshot en un texto ya normalizado.
+        
+        Los resultados son dispersos (solo los patrones encontrados): con
+        los algoritmos multi-patrón, el costo por texto depende de su
+        longitud y de las coincidencias, no de la cantidad de patrones.
+        
+        Args:
+            snapshot: Snapshot de patrones tomado al comenzar la búsqueda
+            normalized_text: Texto normalizado
+            algorithm: Nombre del algoritmo (ya validado)
+            timer: Si se indica, mide cada patrón (algoritmos de un patrón
+                por vez); sin timer el bucle no llama a perf_counter
+            mode: "all", "first" o "count" (ya validado)
+            max_matches: Tope de coincidencias por patrón (None = sin tope)
+            overlapping: False = coincidencias sin solapamiento por patrón
+        
+        Returns:
+            Tupla ({índice de patrón: posiciones}, o conteos en modo
+            "count", ordenado por índice; {índice de patrón: distancias de
+            edición} o None si el algoritmo es exacto o el modo es "count")
+        """
+        all_distances = None
+        # Sin opciones en el caso por defecto: evita pasar kwargs por patrón
+        if mode == "all" and max_matches is None and overlapping:
+            options = {}
+        else:
+            options = {"mode": mode, "max_matches": max_matches, "overlapping": overlapping}
+        
+        if algorithm in MULTI_PATTERN_ALGORITHMS:
+            # Una sola pasada sobre el texto para todos los patrones
+            _, search_all = MULTI_PATTERN_ALGORITHMS[algorithm]
+            hits = search_all(normalized_text, snapshot.get_index(algorithm), **options)
+            # Las coincidencias llegan en orden de aparición en el texto
+            all_positions = dict(sorted(hits.items())) if len(hits) > 1 else hits
+        elif algorithm in FUZZY_SEARCH_FUNCTIONS:
+            # Búsqueda aproximada con el presupuesto de errores de cada patrón
+            search_fn = FUZZY_SEARCH_FUNCTIONS[algorithm]
+            if timer is None:
+                all_hits = [search_fn(normalized_text, cp, **options) for cp in snapshot.compiled]
+            else:
+                all_hits = _timed_search(search_fn, normalized_text, snapshot, timer, **options)
+            if mode == "count":
+                all_positions = {i: hits for i, hits in enumerate(all_hits) if hits}
+            else:
+                all_positions = {i: [start for start, _ in hits]
+                                 for i, hits in enumerate(all_hits) if hits}
+                all_distances = {i: [distance for _, distance in hits]
+                                 for i, hits in enumerate(all_hits) if hits}
+        else:
+            # Seleccionar algoritmo de búsqueda (tablas ya precalculadas)
+            search_fn = COMPILED_SEARCH_FUNCTIONS[algorithm]
+            if timer is None:
+                all_hits = [search_fn(normalized_text, cp, **options) for cp in snapshot.compiled]
+            else:
+                all_hits = _timed_search(search_fn, normalized_text, snapshot, timer, **options)
+            all_positions = {i: hits for i, hits in enumerate(all_hits) if hits}
+        
+        return all_positions, all_distances
+    
+    def _cached_search(self, snapshot: PatternSnapshot, normalized_text: str,
+                       algorithm: str, use_cache: bool = True,
+                       timer: Optional[StageTimer] = None, mode: str = "all",
+                       max_matches: Optional[int] = None,
+                       overlapping: bool = True) -> tuple[dict, Optional[dict], bool]:
+        """
+        _search con caché de resultados.
+        
+        La clave es (hash del texto normalizado, algoritmo, versión de los
+        patrones, modo, tope, solapamiento); las posiciones se guardan como tuplas para que nadie
+        modifique una entrada compartida. Cada búsqueda, venga o no de la
+        caché, se registra en pattern_stats.
         
+        Args:
+            snapshot: Snapshot de patrones tomado al comenzar la búsqueda
+            normalized_text: Texto normalizado
+            algorithm: Nombre del algoritmo (ya validado)
+            use_cache: Si es False, escanea sin leer ni escribir la caché
+            timer: Cronómetro de la instrumentación (ver _search)
+            mode: "all", "first" o "count" (ya validado)
+            max_matches: Tope de coincidencias por patrón
+            overlapping: False = coincidencias sin solapamiento por patrón
+        
+        Returns:
+            Tupla (posiciones por patrón encontrado, distancias por patrón
+            encontrado o None, True si vino de la caché; ver _search)
+        """
+        stats = self.pattern_stats
+        # Sin instrumentación, el costo por patrón se mide solo si se pidió muestreo
+        if timer is None and stats.cost_sample_every and stats.sample_cost():
+            timer = StageTimer()
+        
+        if not use_cache:
+            all_positions, all_distances = self._search(
+                snapshot, normalized_text, algorithm, timer, mode, max_matches, overlapping
+            )
+            stats.record(snapshot.patterns, snapshot.version, all_positions,
+                         timer.patterns_ms if timer else None)
+            return all_positions, all_distances, False
+        
+        key = (text_digest(normalized_text), algorithm, snapshot.version,
+               mode, max_matches, overlapping)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            stats.record(snapshot.patterns, snapshot.version, cached[0])
+            return cached[0], cached[1], True
+        
+        all_positions, all_distances = self._search(
+            snapshot, normalized_text, algorithm, timer, mode, max_matches, overlapping
+        )
+        stats.record(snapshot.patterns, snapshot.version, all_positions,
+                     timer.patterns_ms if timer else None)
+        frozen = (
+            all_positions if mode == "count" else {i: tuple(p) for i, p in all_positions.items()},
+            {i: tuple(d) for i, d in all_distances.items()} if all_distances is not None else None,
+        )
+        self.result_cache.put(key, frozen)
+        return frozen[0], frozen[1], False
+    
+    @staticmethod
+    def _build_results(snapshot: PatternSnapshot, all_positions: Mapping[int, Any],
+                       all_distances: Optional[Mapping[int, Sequence[int]]] = None,
+                       offsets: Optional[array] = None) -> list[DetectionResult]:
+        """
+        Construye los DetectionResult de los patrones con coincidencias.
+        
+        Args:
+            snapshot: Snapshot con el que se obtuvieron las posiciones
+            all_positions: {índice de patrón: posiciones}, o conteos en modo
+                "count", ordenado por índice (ver _search)
+            all_distances: Distancias de edición por patrón (solo búsqueda aproximada)
+            offsets: Mapa de normalize_with_offsets; si se indica, cada
+                resultado incluye sus spans en el texto original
+        
+        Returns:
+            Lista de resultados de detección
+        """
         results = []
+        patterns = snapshot.patterns
         
-        for pattern_data in self.patterns:
-            pattern = normalize_text(pattern_data['pattern'])
-            
-            # Medir tiempo de búsqueda
-            start_time = time.perf_counter()
-            positions = search_fn(normalized_text, pattern)
-            end_time = time.perf_counter()
-            execution_time_ms = (end_time - start_time) * 1000
-            
-            if positions:
-                result = DetectionResult(
-                    pattern=pattern_data['pattern'],
-                    category=pattern_data['category'],
-                    alert_level=pattern_data['alert_level'],
-                    alert_message=pattern_data['alert_message'],
-                    positions=positions
+        for i, positions in all_positions.items():
+            pattern_data = patterns[i]
+            counted = isinstance(positions, int)
+            result = DetectionResult(
+                pattern=pattern_data['pattern'],
+                category=pattern_data['category'],
+                alert_level=pattern_data['alert_level'],
+                alert_message=pattern_data['alert_message'],
+                positions=[] if counted else list(positions),
+                edit_distances=list(all_distances[i]) if all_distances else None,
+                count=positions if counted else None,
+                index=i
+            )
+            if offsets is not None and not counted:
+                result.spans = original_spans(
+                    positions, len(snapshot.compiled[i].normalized), offsets
                 )
-                results.append(result)
+            results.append(result)
         
         return results
     
-    def detect_single_pattern(self, text: str, pattern: str, 
-                             algorithm: str = "kmp") -> DetectionResult:
+    def detect_stream(self, chunks: Iterable[str],
+                      algorithm: str = DEFAULT_ALGORITHM) -> list[DetectionResult]:
+        """
+        Detecta patrones en un texto que llega en fragmentos (por ejemplo,
+        un archivo leído por bloques), sin cargarlo completo en memoria.
+        
+        La memoria usada es independiente del tamaño de la entrada: solo
+        se conserva el estado de cada matcher entre fragmentos (y la
+        palabra incompleta del final, ver normalize_stream). Las
+        posiciones son globales sobre el texto normalizado completo, igual
+        que las de detect().
+        
+        Args:
+            chunks: Iterable de fragmentos de texto bruto
+            algorithm: "aho_corasick", "kmp" o "boyer_moore" (ver STREAM_ALGORITHMS)
+        
+        Returns:
+            Lista de resultados de detección
+        """
+        if algorithm not in STREAM_ALGORITHMS:
+            raise ValueError(
+                f"Algoritmo de streaming debe ser uno de: {', '.join(STREAM_ALGORITHMS)}"
+            )
+        
+        snapshot = self._snapshot
+        all_positions: list[list[int]] = [[] for _ in snapshot.compiled]
+        
+        if algorithm == "aho_corasick":
+            stream = AhoCorasickStream(snapshot.get_index(algorithm))
+            for chunk in normalize_stream(chunks):
+                for index, position in stream.feed(chunk):
+                    all_positions[index].append(position)
+        else:
+            if algorithm == "kmp":
+                streams = [KMPStream(cp.normalized, cp.lps) for cp in snapshot.compiled]
+            else:
+                streams = [BoyerMooreStream(cp.normalized, cp.bad_char) for cp in snapshot.compiled]
+            for chunk in normalize_stream(chunks):
+                for positions, stream in zip(all_positions, streams):
+                    positions.extend(stream.feed(chunk))
+        
+        return self._build_results(
+            snapshot, {i: positions for i, positions in enumerate(all_positions) if positions}
+        )
+    
+    def detect_single_pattern(self, text: Union[str, NormalizedDocument], pattern: str,
+                             algorithm: str = DEFAULT_ALGORITHM,
+                             max_errors: int = 0) -> DetectionResult:
         """
         Detecta un patrón específico en el texto.
         
         Args:
-            text: Texto a analizar
+            text: Texto a analizar o NormalizedDocument ya normalizado
             pattern: Patrón a buscar
-            algorithm: "kmp" o "boyer_moore"
+            algorithm: Nombre del algoritmo (ver ALGORITHMS)
+            max_errors: Errores de edición permitidos (solo algoritmos aproximados)
         
         Returns:
             Resultado de detección
         """
-        normalized_text = normalize_text(text)
-        normalized_pattern = normalize_text(pattern)
+        validate_algorithm(algorithm)
         
-        search_fn = kmp_search if algorithm == "kmp" else boyer_moore_search
-        positions = search_fn(normalized_text, normalized_pattern)
+        normalized_text = as_document(text).normalized
+        edit_distances = None
+        
+        if algorithm in FUZZY_SEARCH_FUNCTIONS:
+            validate_max_errors(pattern, max_errors)
+            hits = FUZZY_SEARCH_FUNCTIONS[algorithm](
+                normalized_text, compile_pattern(pattern, max_errors)
+            )
+            positions = [start for start, _ in hits]
+            edit_distances = [distance for _, distance in hits]
+        else:
+            search_fn = SEARCH_FUNCTIONS[algorithm]
+            positions = search_fn(normalized_text, normalize_cached(pattern))
         
         return DetectionResult(
             pattern=pattern,
             category="custom",
             alert_level="info",
             alert_message=f"Patron '{pattern}' encontrado",
-            positions=positions
+            positions=positions,
+            edit_distances=edit_distances
         )
     
-    def detect_all(self, text: str, algorithm: str = "kmp") -> dict:
+    def detect_all(self, text: Union[str, NormalizedDocument],
+                   algorithm: str = DEFAULT_ALGORITHM, use_cache: bool = True,
+                   mode: str = "all", max_matches: Optional[int] = None,
+                   overlapping: bool = True,
+                   fields: Optional[Union[str, Sequence[str]]] = None) -> dict:
         """
         Detección completa retornando estructura detallada.
         
+        El texto se normaliza una sola vez, construyendo a la vez el mapa de
+        posiciones: cada detección incluye `spans` (inicio, fin) sobre el
+        texto original, listos para resaltar sin volver a normalizar. Al
+        pasar un NormalizedDocument se reutiliza su normalización (por
+        ejemplo, entre los algoritmos de /compare).
+        
+        Si el mismo texto normalizado ya se analizó con el mismo algoritmo y
+        los patrones no cambiaron, el resultado sale de result_cache sin
+        volver a escanear (performance.cache_hit).
+        
+        Con mode="first" cada detección trae solo su primera posición, con
+        mode="count" solo match_count (positions vacía, sin spans), y
+        max_matches acota las posiciones por patrón: textos muy repetitivos
+        no generan listas ni respuestas enormes. Con overlapping=False las
+        coincidencias de un mismo patrón no se solapan (útil para resaltar
+        y contar) y la búsqueda salta m caracteres tras cada una.
+        
+        Con `fields` (p.ej. COMPACT_FIELDS) cada detección trae solo esos
+        campos y el resultado omite original_text y normalized_text e
+        incluye patterns_version (pattern_index se refiere a
+        detector.patterns de esa versión). Si no se piden positions, spans
+        ni edit_distances, se cuenta en lugar de listar posiciones y no se
+        construye el mapa de posiciones.
+        
         Args:
-            text: Texto a analizar
-            algorithm: "kmp" o "boyer_moore"
+            text: Texto a analizar o NormalizedDocument ya normalizado
+            algorithm: Nombre del algoritmo (ver ALGORITHMS)
+            use_cache: Usar result_cache (False fuerza el escaneo, p.ej. al medir tiempos)
+            mode: "all", "first" o "count" (ver algorithms.result_modes)
+            max_matches: Tope de posiciones (o de conteo) por patrón
+            overlapping: False = solo coincidencias sin solapamiento de cada
+                patrón, de izquierda a derecha
+            fields: Campos de cada detección (ver DETECTION_FIELDS), como
+                secuencia o separados por comas; None = todos
         
         Returns:
             Diccionario con resultados y resumen
+        
+        Raises:
+            ValueError: Si el algoritmo, el modo o algún campo no existe
         """
+        validate_algorithm(algorithm)
+        match_limit(mode, max_matches)
+        if fields is not None:
+            fields = validate_fields(fields)
+        with_spans = fields is None or "spans" in fields
+        search_mode = mode
+        if fields is not None and mode == "all" and POSITION_FIELDS.isdisjoint(fields):
+            search_mode = "count"
+        
         start_total = time.perf_counter()
-        results = self.detect(text, algorithm)
+        timer = self.instrumentation.timer()
+        snapshot = self._snapshot
+        document = as_document(text, with_offsets=with_spans)
+        if timer:
+            timer.mark("normalize")
+        
+        all_positions, all_distances, cache_hit = self._cached_search(
+            snapshot, document.normalized, algorithm, use_cache, timer,
+            search_mode, max_matches, overlapping
+        )
+        if timer:
+            timer.mark("search")
+        
+        results = self._build_results(snapshot, all_positions, all_distances,
+                                      document.offsets if with_spans else None)
+        if timer:
+            timer.mark("build_results")
+        
+        if fields is None:
+            detections = [r.to_dict() for r in results]
+        else:
+            detections = [r.select(fields) for r in results]
+        if timer:
+            timer.mark("serialize")
+        
         end_total = time.perf_counter()
         total_execution_time_ms = (end_total - start_total) * 1000
         
-        return {
-            "original_text": text,
-            "normalized_text": normalize_text(text),
+        analysis = {
+            "original_text": document.original,
+            "normalized_text": document.normalized,
             "algorithm": algorithm,
-            "detections": [r.to_dict() for r in results],
-            "total_patterns_checked": len(self.patterns),
+            "detections": detections,
+            "total_patterns_checked": len(snapshot.patterns),
             "patterns_found": len(results),
             "has_complaints": len(results) > 0,
             "alert_levels": {
@@ -173,13 +877,336 @@ class ComplaintDetector:
             },
             "performance": {
                 "total_execution_time_ms": round(total_execution_time_ms, 4),
-                "algorithm_used": algorithm
+                "algorithm_used": algorithm,
+                "cache_hit": cache_hit
             }
         }
-
-
+        
+        if fields is not None:
+            del analysis["original_text"], analysis["normalized_text"]
+            analysis["patterns_version"] = snapshot.version
+        
+        if timer:
+            record = self.instrumentation.observe(timer, algorithm, len(document), cache_hit)
+            analysis["performance"]["stages_ms"] = record["stages_ms"]
+        
+        return analysis
+    
+    def compare(self, text: Union[str, NormalizedDocument],
+                algorithms: Sequence[str] = ALGORITHMS) -> dict[str, dict]:
+        """
+        detect_all con cada algoritmo sobre una sola normalización, sin
+        result_cache para medir el escaneo real (/compare).
+        
+        Args:
+            text: Texto a analizar o NormalizedDocument ya normalizado
+            algorithms: Algoritmos a comparar (default: todos)
+        
+        Returns:
+            Diccionario {algoritmo: resultado de detect_all}
+        """
+        document = as_document(text, with_offsets=True)
+        return {
+            algorithm: self.detect_all(document, algorithm=algorithm, use_cache=False)
+            for algorithm in algorithms
+        }
+    
+    def detect_many(self, texts: Iterable[str], workers: Optional[int] = None,
+                    chunksize: Optional[int] = None,
+                    algorithm: str = DEFAULT_ALGORITHM, use_cache: bool = True,
+                    mode: str = "all", max_matches: Optional[int] = None,
+                    overlapping: bool = True,
+                    fields: Optional[Union[str, Sequence[str]]] = None,
+                    columnar: bool = False) -> Union[list[dict], dict]:
+        """
+        detect_all sobre muchos textos, repartidos en un ProcessPoolExecutor.
+        
+        Cada worker compila el snapshot vigente una sola vez (en el
+        initializer) y luego solo recibe textos, en lotes de `chunksize`:
+        el costo de IPC por texto es el de serializar el texto y su
+        resultado. Los resultados vuelven en el orden de entrada. Cambios
+        de patrones durante la llamada no afectan a los workers.
+        
+        La caché, la instrumentación y pattern_stats de cada worker son
+        propias del proceso: no se reflejan en este detector. Con workers=1
+        (o un solo texto) no se crea el pool.
+        
+        Con columnar=True retorna un único resultado de detect_columnar para
+        todos los textos: cada worker arma las columnas de su lote y aquí
+        solo se concatenan.
+        
+        Args:
+            texts: Textos a analizar
+            workers: Número de procesos (None = os.cpu_count())
+            chunksize: Textos por envío a un worker (None = automático)
+            algorithm, use_cache, mode, max_matches, overlapping, fields:
+                Igual que en detect_all
+            columnar: Retornar columnas (ver detect_columnar) en lugar de un
+                resultado por texto; no admite fields
+        
+        Returns:
+            Lista de resultados de detect_all, uno por texto y en orden, o
+            el resultado de detect_columnar si columnar=True
+        
+        Raises:
+            ValueError: Si workers o chunksize son menores que 1, o si se
+                pide fields con columnar
+        """
+        validate_algorithm(algorithm)
+        match_limit(mode, max_matches)
+        if fields is not None:
+            if columnar:
+                raise ValueError("fields no aplica al formato columnar")
+            fields = validate_fields(fields)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers debe ser al menos 1")
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("chunksize debe ser al menos 1")
+        
+        texts = texts if isinstance(texts, Sequence) else list(texts)
+        options = {
+            "algorithm": algorithm, "use_cache": use_cache, "mode": mode,
+            "max_matches": max_matches, "overlapping": overlapping,
+        }
+        if not columnar:
+            options["fields"] = fields
+        workers = min(workers, len(texts))
+        if workers <= 1:
+            if columnar:
+                return self.detect_columnar(texts, **options)
+            return [self.detect_all(text, **options) for text in texts]
+        
+        if chunksize is None:
+            # ~4 lotes por worker para balancear carga, sin lotes enormes
+            chunksize = max(1, min(1000, len(texts) // (workers * 4)))
+        
+        snapshot = self._snapshot
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(snapshot.patterns, snapshot.version, options),
+        ) as pool:
+            if not columnar:
+                return list(pool.map(_worker_detect_all, texts, chunksize=chunksize))
+            
+            # Cada worker numera los mensajes desde el inicio de su lote
+            batches = [(start, texts[start:start + chunksize])
+                       for start in range(0, len(texts), chunksize)]
+            parts = pool.map(_worker_detect_columnar, batches)
+            result = next(parts)
+            for part in parts:
+                for column in ("message_index", "pattern_index", result["value_column"]):
+                    result[column].extend(part[column])
+                hits = result["pattern_hits"]
+                for i, n in enumerate(part["pattern_hits"]):
+                    hits[i] += n
+            result["total_analyzed"] = len(texts)
+            return result
+    
+    def detect_columnar(self, texts: Iterable[str], algorithm: str = DEFAULT_ALGORITHM,
+                        use_cache: bool = True, mode: str = "all",
+                        max_matches: Optional[int] = None, overlapping: bool = True,
+                        start_index: int = 0) -> dict:
+        """
+        Detección por lotes en formato columnar: una fila por coincidencia
+        en arreglos paralelos, más un diccionario de patrones, en lugar de
+        un resultado por texto con categoría y nivel repetidos.
+        
+        Las columnas se acumulan en arreglos `array` (enteros sin signo,
+        COLUMN_TYPECODE): no se crea un objeto Python por coincidencia ni
+        por detección. Las posiciones son sobre el texto normalizado, como
+        `positions` en detect_all (sin spans).
+        
+        Args:
+            texts: Textos a analizar
+            algorithm, use_cache, mode, max_matches, overlapping: Igual que
+                en detect_all
+            start_index: Índice del primer texto en message_index (para
+                combinar lotes)
+        
+        Returns:
+            Diccionario con:
+            - patterns: diccionario de patrones; pattern_index es la posición
+            - message_index, pattern_index: arreglos paralelos
+            - position (o match_count en mode="count", una fila por texto y
+              patrón); value_column indica cuál
+            - pattern_hits: en cuántos textos apareció cada patrón
+            - algorithm, mode, patterns_version, total_analyzed
+        """
+        validate_algorithm(algorithm)
+        match_limit(mode, max_matches)
+        
+        snapshot = self._snapshot
+        counted = mode == "count"
+        message_index = array(COLUMN_TYPECODE)
+        pattern_index = array(COLUMN_TYPECODE)
+        values = array(COLUMN_TYPECODE)
+        pattern_hits = array(COLUMN_TYPECODE, [0]) * len(snapshot.patterns)
+        
+        total = 0
+        for message, text in enumerate(texts, start_index):
+            total += 1
+            normalized = as_document(text).normalized
+            all_positions, _, _ = self._cached_search(
+                snapshot, normalized, algorithm, use_cache, None,
+                mode, max_matches, overlapping
+            )
+            for i, positions in all_positions.items():
+                pattern_hits[i] += 1
+                if counted:
+                    message_index.append(message)
+                    pattern_index.append(i)
+                    values.append(positions)
+                else:
+                    n = len(positions)
+                    message_index.extend(repeat(message, n))
+                    pattern_index.extend(repeat(i, n))
+                    values.extend(positions)
+        
+        value_column = "match_count" if counted else "position"
+        return {
+            "format": "columnar",
+            "algorithm": algorithm,
+            "mode": mode,
+            "patterns_version": snapshot.version,
+            "total_analyzed": total,
+            "patterns": [
+                {key: p[key] for key in ("pattern", "category", "alert_level", "alert_message")}
+                for p in snapshot.patterns
+            ],
+            "pattern_hits": pattern_hits,
+            "value_column": value_column,
+            "message_index": message_index,
+            "pattern_index": pattern_index,
+            value_column: values,
+        }
+    
+    def triage(self, text: Union[str, NormalizedDocument],
+               algorithm: str = DEFAULT_TRIAGE_ALGORITHM) -> dict:
+        """
+        Triage para enrutamiento: solo si hay reclamos y el nivel de alerta
+        más alto, sin listas de posiciones ni resultados por patrón.
+        
+        substring y myers prueban la existencia de cada patrón en el orden
+        de pattern_stats (severidad primero), así que la primera coincidencia
+        ya es la de nivel máximo y se corta ahí; en un texto limpio se prueba
+        cada patrón una vez. aho_corasick recorre el texto una sola vez y
+        corta en la primera coincidencia high. La existencia de un patrón
+        exacto no depende del algoritmo, así que el resultado coincide con
+        el de detect_all.
+        
+        Args:
+            text: Texto a analizar o NormalizedDocument ya normalizado
+            algorithm: Estrategia (ver TRIAGE_ALGORITHMS)
+        
+        Returns:
+            Diccionario con has_complaints, max_alert_level y el patrón que
+            lo determinó (None si no hay reclamos)
+        """
+        if algorithm not in TRIAGE_ALGORITHMS:
+            raise ValueError(
+                f"Algoritmo de triage debe ser uno de: {', '.join(TRIAGE_ALGORITHMS)}"
+            )
+        
+        start = time.perf_counter()
+        snapshot = self._snapshot
+        patterns = snapshot.patterns
+        normalized_text = as_document(text).normalized
+        order = self.pattern_stats.cached_triage_order(patterns)
+        found = None
+        checked = 0
+        
+        if algorithm == "aho_corasick":
+            high = frozenset(i for i, p in enumerate(patterns) if p['alert_level'] == "high")
+            matched = aho_corasick_matched(
+                normalized_text, snapshot.get_index(algorithm), high
+            )
+            checked = len(patterns)
+            found = next((i for i in order if i in matched), None)
+        elif algorithm == "myers":
+            for i in order:
+                checked += 1
+                cp = snapshot.compiled[i]
+                if myers_exists(normalized_text, cp.normalized, cp.max_errors, cp.peq):
+                    found = i
+                    break
+        else:
+            for i in order:
+                checked += 1
+                pattern = snapshot.compiled[i].normalized
+                if pattern and pattern in normalized_text:
+                    found = i
+                    break
+        
+        pattern_data = patterns[found] if found is not None else None
+        return {
+            "has_complaints": pattern_data is not None,
+            "max_alert_level": pattern_data['alert_level'] if pattern_data else None,
+            "pattern": pattern_data['pattern'] if pattern_data else None,
+            "category": pattern_data['category'] if pattern_data else None,
+            "alert_message": pattern_data['alert_message'] if pattern_data else None,
+            "algorithm": algorithm,
+            "patterns_checked": checked,
+            "total_patterns": len(patterns),
+            "execution_time_ms": round((time.perf_counter() - start) * 1000, 4),
+        }
+    
+    def detect_triage(self, text: Union[str, NormalizedDocument],
+                      algorithm: str = DEFAULT_ALGORITHM) -> Iterator[DetectionResult]:
+        """
+        Modo triage: genera las detecciones en el orden de
+        pattern_stats.triage_order (severidad y, dentro de ella,
+        probabilidad de aparición observada), para que quien consume pueda
+        detenerse en la primera coincidencia que le interesa.
+        
+        Con algoritmos de un patrón por pasada cada patrón se busca recién
+        cuando se pide la siguiente detección, así que cortar antes ahorra
+        las búsquedas restantes. Los algoritmos multi-patrón recorren el
+        texto una sola vez y luego reordenan. Las búsquedas parciales no se
+        registran en pattern_stats (sesgarían las tasas).
+        
+        Args:
+            text: Texto a analizar o NormalizedDocument ya normalizado
+            algorithm: Nombre del algoritmo (ver ALGORITHMS)
+        
+        Yields:
+            DetectionResult de cada patrón con coincidencias, en orden de triage
+        """
+        validate_algorithm(algorithm)
+        
+        snapshot = self._snapshot
+        normalized_text = as_document(text).normalized
+        order = self.pattern_stats.cached_triage_order(snapshot.patterns)
+        
+        if algorithm in MULTI_PATTERN_ALGORITHMS:
+            all_positions, _ = self._search(snapshot, normalized_text, algorithm)
+            search = lambda i: (all_positions.get(i), None)
+        elif algorithm in FUZZY_SEARCH_FUNCTIONS:
+            def search(i: int) -> tuple[list[int], list[int]]:
+                hits = FUZZY_SEARCH_FUNCTIONS[algorithm](normalized_text, snapshot.compiled[i])
+                return [start for start, _ in hits], [distance for _, distance in hits]
+        else:
+            search_fn = COMPILED_SEARCH_FUNCTIONS[algorithm]
+            search = lambda i: (search_fn(normalized_text, snapshot.compiled[i]), None)
+        
+        for i in order:
+            positions, edit_distances = search(i)
+            if positions:
+                pattern_data = snapshot.patterns[i]
+                yield DetectionResult(
+                    pattern=pattern_data['pattern'],
+                    category=pattern_data['category'],
+                    alert_level=pattern_data['alert_level'],
+                    alert_message=pattern_data['alert_message'],
+                    positions=list(positions),
+                    edit_distances=edit_distances
+                )
+    
+    
     def add_pattern(self, pattern: str, category: str, alert_level: str, 
-                    alert_message: str) -> dict:
+                    alert_message: str, max_errors: int = 0) -> dict:
         """
         Agrega un nuevo patrón.
         
@@ -188,21 +1215,35 @@ class ComplaintDetector:
             category: Categoría del patrón
             alert_level: Nivel de alerta (high, medium, low)
             alert_message: Mensaje de alerta
+            max_errors: Errores de edición permitidos en búsqueda aproximada
         
         Returns:
             El patrón agregado con su índice
         """
+        validate_max_errors(pattern, max_errors)
+        
         new_pattern = {
             'pattern': pattern.strip(),
             'category': category.strip(),
             'alert_level': alert_level.strip(),
             'alert_message': alert_message.strip(),
+            'max_errors': max_errors,
         }
-        self.patterns.append(new_pattern)
-        return {'index': len(self.patterns) - 1, **new_pattern}
+        compiled = compile_pattern(new_pattern['pattern'], max_errors)
+        
+        with self._write_lock:
+            current = self._snapshot
+            self._publish(
+                [*current.patterns, new_pattern],
+                [*current.compiled, compiled],
+            )
+            index = len(current.patterns)
+        
+        return {'index': index, **new_pattern}
     
     def update_pattern(self, index: int, pattern: str, category: str, 
-                       alert_level: str, alert_message: str) -> dict:
+                       alert_level: str, alert_message: str,
+                       max_errors: Optional[int] = None) -> dict:
         """
         Actualiza un patrón existente.
         
@@ -212,20 +1253,34 @@ class ComplaintDetector:
             category: Nueva categoría
             alert_level: Nuevo nivel de alerta
             alert_message: Nuevo mensaje de alerta
+            max_errors: Nuevo presupuesto de errores (None conserva el actual)
         
         Returns:
             El patrón actualizado
         """
-        if index < 0 or index >= len(self.patterns):
-            raise IndexError(f"Índice {index} fuera de rango")
+        with self._write_lock:
+            current = self._snapshot
+            if index < 0 or index >= len(current.patterns):
+                raise IndexError(f"Índice {index} fuera de rango")
+            
+            if max_errors is None:
+                max_errors = current.patterns[index].get('max_errors', 0)
+            validate_max_errors(pattern, max_errors)
+            
+            updated = {
+                'pattern': pattern.strip(),
+                'category': category.strip(),
+                'alert_level': alert_level.strip(),
+                'alert_message': alert_message.strip(),
+                'max_errors': max_errors,
+            }
+            patterns = list(current.patterns)
+            compiled = list(current.compiled)
+            patterns[index] = updated
+            compiled[index] = compile_pattern(updated['pattern'], max_errors)
+            self._publish(patterns, compiled)
         
-        self.patterns[index] = {
-            'pattern': pattern.strip(),
-            'category': category.strip(),
-            'alert_level': alert_level.strip(),
-            'alert_message': alert_message.strip(),
-        }
-        return {'index': index, **self.patterns[index]}
+        return {'index': index, **updated}
     
     def delete_pattern(self, index: int) -> dict:
         """
@@ -237,10 +1292,17 @@ class ComplaintDetector:
         Returns:
             El patrón eliminado
         """
-        if index < 0 or index >= len(self.patterns):
-            raise IndexError(f"Índice {index} fuera de rango")
+        with self._write_lock:
+            current = self._snapshot
+            if index < 0 or index >= len(current.patterns):
+                raise IndexError(f"Índice {index} fuera de rango")
+            
+            patterns = list(current.patterns)
+            compiled = list(current.compiled)
+            deleted = patterns.pop(index)
+            compiled.pop(index)
+            self._publish(patterns, compiled)
         
-        deleted = self.patterns.pop(index)
         return {'deleted_index': index, **deleted}
     
     def save_patterns(self, patterns_file: Optional[str] = None) -> bool:
@@ -258,10 +1320,10 @@ class ComplaintDetector:
             patterns_file = os.path.join(base_path, "data", "patterns.csv")
         
         with open(patterns_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['pattern', 'category', 'alert_level', 'alert_message']
+            fieldnames = ['pattern', 'category', 'alert_level', 'alert_message', 'max_errors']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            for p in self.patterns:
+            for p in self._snapshot.patterns:
                 writer.writerow(p)
         
         return True
@@ -280,11 +1342,34 @@ class ComplaintDetector:
             base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             patterns_file = os.path.join(base_path, "data", "patterns.csv")
         
-        self.patterns = []
         self.load_patterns(patterns_file)
         return len(self.patterns)
 
 
+# Estado de cada proceso worker de detect_many (lo fija _init_worker)
+_worker_detector: Optional[ComplaintDetector] = None
+_worker_options: dict = {}
+
+
+def _init_worker(patterns: Sequence[dict], version: int, options: dict) -> None:
+    """Initializer del pool: compila los patrones una vez por proceso."""
+    global _worker_detector, _worker_options
+    _worker_detector = ComplaintDetector(None)
+    _worker_detector.load_pattern_list(patterns, version)
+    _worker_options = options
+
+
+def _worker_detect_all(text: str) -> dict:
+    """Tarea del pool: detect_all con el detector del proceso."""
+    return _worker_detector.detect_all(text, **_worker_options)
+
+
+def _worker_detect_columnar(batch: tuple[int, Sequence[str]]) -> dict:
+    """Tarea del pool: detect_columnar de un lote (índice inicial, textos)."""
+    start_index, texts = batch
+    return _worker_detector.detect_columnar(texts, start_index=start_index, **_worker_options)
+
+
 def create_detector(patterns_path: Optional[str] = None) -> ComplaintDetector:
     """
     Factory para crear detector con ruta por defecto.
@@ -0,0 +1,243 @@
+"""
+Ejecución de las detecciones fuera del threadpool de la API.
+Responsabilidad única: correr tareas de detección (funciones cuyo primer
+argumento es un ComplaintDetector) en un pool dedicado y de tamaño
+configurable, y exponerlas como corrutinas.
+
+- "process" (por defecto): ProcessPoolExecutor. Cada worker compila los
+  patrones una vez por versión; la búsqueda no retiene el GIL del
+  servidor, así que los endpoints livianos (/health, /patterns) siguen
+  respondiendo. El uso de cachés, pattern_stats e instrumentación de cada
+  tarea vuelve con el resultado y se suma al detector de la API.
+- "thread": ThreadPoolExecutor sobre el mismo detector. Comparte caché,
+  estadísticas e instrumentación; pensado para pruebas y desarrollo.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from preprocessing.normalize import normalization_cache
+from services.detector import ComplaintDetector, PatternSnapshot
+
+
+EXECUTION_BACKENDS = ("process", "thread")
+
+DEFAULT_BACKEND = "process"
+
+
+# Detector de cada proceso worker (lo fija _init_worker)
+_worker_detector: Optional[ComplaintDetector] = None
+# Registros de instrumentación de la tarea en curso
+_worker_records: list[dict] = []
+
+
+def _init_worker(patterns: list[str], version: int) -> None:
+    """Initializer del pool: compila los patrones vigentes al crearlo."""
+    global _worker_detector
+    _worker_detector = ComplaintDetector(None)
+    _worker_detector.load_pattern_list(patterns, version)
+    _worker_detector.instrumentation.add_hook(_worker_records.append)
+
+
+def _run_in_worker(state: tuple[int, Optional[bytes], bool], task: Callable,
+                   args: tuple, kwargs: dict) -> tuple[Any, Optional[dict]]:
+    """
+    Ejecuta una tarea con el detector del proceso worker.
+    
+    Si la versión de patrones de `state` no es la del worker y `state` no
+    trae los patrones, no ejecuta la tarea y retorna (None, None): el pool
+    reintenta enviándolos (ver DetectionExecutor.run). Si los trae, los
+    recompila antes de ejecutar: los cambios llegan sin reemplazar el pool.
+    
+    Args:
+        state: (versión de patrones, patrones serializados con pickle o
+            None, instrumentación activada) del detector de la API
+        task, args, kwargs: Ver DetectionExecutor.run
+    
+    Returns:
+        Tupla (resultado, uso de cachés, pattern_stats e instrumentación
+        durante la tarea; ver DetectionExecutor._merge_usage), o (None,
+        None) si faltan los patrones de la versión pedida
+    """
+    version, patterns, instrumented = state
+    detector = _worker_detector
+    if detector.version != version:
+        if patterns is None:
+            return None, None
+        detector.load_pattern_list(pickle.loads(patterns), version)
+    detector.instrumentation.enabled = instrumented
+    
+    cache = detector.result_cache
+    hits, misses = cache.hits, cache.misses
+    normalization_hits, normalization_misses = normalization_cache.hits, normalization_cache.misses
+    _worker_records.clear()
+    
+    result = task(detector, *args, **kwargs)
+    
+    scans, changed = detector.pattern_stats.drain()
+    usage = {
+        "pid": os.getpid(),
+        "cache_hits": cache.hits - hits,
+        "cache_misses": cache.misses - misses,
+        "cache_size": cache.stats()["size"],
+        "normalization_hits": normalization_cache.hits - normalization_hits,
+        "normalization_misses": normalization_cache.misses - normalization_misses,
+        "normalization_size": normalization_cache.stats()["size"],
+        "scans": scans,
+        "pattern_counts": changed,
+        "records": list(_worker_records),
+    }
+    return result, usage
+
+
+class DetectionExecutor:
+    """
+    Pool dedicado para las detecciones de la API.
+    
+    Con el backend de procesos, cada worker tiene su copia de los patrones:
+    los recibe al crearse el pool y cada tarea lleva solo la versión vigente
+    y si la instrumentación está activa. Si la versión cambió (CRUD,
+    recarga), el worker rechaza la tarea y esta se reenvía una vez con los
+    patrones (serializados una vez por versión), que el worker recompila
+    sin reemplazar el pool. Los aciertos y fallos de result_cache y de
+    normalization_cache, los conteos de pattern_stats y los registros de
+    instrumentación de cada tarea se suman a la API, así que /cache/stats,
+    /metrics, /patterns/stats, /instrumentation y los hooks ven todas las
+    búsquedas.
+    """
+    
+    def __init__(self, detector: ComplaintDetector, backend: str = DEFAULT_BACKEND,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            detector: Detector cuyos patrones se usan
+            backend: "process" o "thread"
+            workers: Tamaño del pool (None = os.cpu_count())
+        
+        Raises:
+            ValueError: Si el backend no existe o workers < 1
+        """
+        if backend not in EXECUTION_BACKENDS:
+            raise ValueError(f"Backend debe ser uno de: {', '.join(EXECUTION_BACKENDS)}")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers debe ser al menos 1")
+        
+        self.detector = detector
+        self.backend = backend
+        self.workers = workers
+        self._pool: Optional[Executor] = None
+        # Última versión de patrones enviada a los workers
+        self._version: Optional[int] = None
+        # (versión, patrones serializados) para los workers desactualizados
+        self._payload: Optional[tuple[int, bytes]] = None
+        self._lock = threading.Lock()
+    
+    def _current_pool(self) -> Executor:
+        """Retorna el pool, creándolo (con los patrones vigentes) si hace falta."""
+        with self._lock:
+            if self._pool is None:
+                if self.backend == "thread":
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="detection")
+                else:
+                    snapshot = self.detector.snapshot
+                    self._pool = ProcessPoolExecutor(
+                        self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(snapshot.patterns, snapshot.version),
+                    )
+            return self._pool
+    
+    def _patterns_payload(self, snapshot: PatternSnapshot) -> bytes:
+        """Patrones de `snapshot` serializados (una vez por versión)."""
+        payload = self._payload
+        if payload is None or payload[0] != snapshot.version:
+            payload = (snapshot.version, pickle.dumps(snapshot.patterns, pickle.HIGHEST_PROTOCOL))
+            self._payload = payload
+        return payload[1]
+    
+    def _merge_usage(self, snapshot: PatternSnapshot, usage: dict) -> None:
+        """Suma al detector de la API lo registrado por un worker durante una tarea."""
+        detector = self.detector
+        detector.result_cache.merge(usage["cache_hits"], usage["cache_misses"],
+                                    usage["pid"], usage["cache_size"])
+        normalization_cache.merge(usage["normalization_hits"], usage["normalization_misses"],
+                                  usage["pid"], usage["normalization_size"])
+        if usage["scans"]:
+            detector.pattern_stats.merge(snapshot.patterns, snapshot.version,
+                                         usage["scans"], usage["pattern_counts"])
+        for record in usage["records"]:
+            detector.instrumentation.merge(record)
+    
+    async def run(self, task: Callable, *args, **kwargs) -> Any:
+        """
+        Ejecuta `task(detector, *args, **kwargs)` en el pool sin bloquear
+        el event loop.
+        
+        Args:
+            task: Función de nivel de módulo o método de ComplaintDetector
+                (p.ej. ComplaintDetector.detect_all); con el backend de
+                procesos, task, argumentos y resultado deben ser picklables
+        
+        Returns:
+            Resultado de la tarea
+        """
+        pool = self._current_pool()
+        loop = asyncio.get_running_loop()
+        if self.backend == "thread":
+            return await loop.run_in_executor(pool, partial(task, self.detector, *args, **kwargs))
+        
+        snapshot = self.detector.snapshot
+        instrumented = self.detector.instrumentation.enabled
+        self._version = snapshot.version
+        try:
+            state = (snapshot.version, None, instrumented)
+            result, usage = await loop.run_in_executor(
+                pool, partial(_run_in_worker, state, task, args, kwargs))
+            if usage is None:
+                # El worker tenía otra versión: reenviar con los patrones
+                state = (snapshot.version, self._patterns_payload(snapshot), instrumented)
+                result, usage = await loop.run_in_executor(
+                    pool, partial(_run_in_worker, state, task, args, kwargs))
+        except BrokenExecutor:
+            # Un worker murió: el próximo llamado crea un pool nuevo
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            self._forget_remote()
+            raise
+        
+        self._merge_usage(snapshot, usage)
+        return result
+    
+    def _forget_remote(self) -> None:
+        """Descarta los tamaños de caché informados por los workers."""
+        self.detector.result_cache.forget_remote()
+        normalization_cache.forget_remote()
+    
+    def stats(self) -> dict:
+        """Backend, tamaño y última versión de patrones enviada a los workers."""
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "started": self._pool is not None,
+            "patterns_version": self._version,
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Detiene el pool (se vuelve a crear si llega otra tarea)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._version = self._payload = None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+            if self.backend == "process":
+                self._forget_remote()
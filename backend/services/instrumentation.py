@@ -0,0 +1,238 @@
+"""
+Instrumentación opcional del detector.
+Responsabilidad única: medir etapas y patrones cuando está activada y
+agregarlas en histogramas en memoria.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+# Límites superiores (ms) de los buckets de los histogramas
+DEFAULT_BUCKETS_MS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0,
+)
+
+
+class Histogram:
+    """Histograma de buckets fijos, seguro entre hilos."""
+    
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        """
+        Args:
+            buckets: Límites superiores de los buckets, en orden ascendente
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        """
+        Registra un valor.
+        
+        Args:
+            value: Valor observado (en la unidad de los buckets)
+        """
+        slot = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                slot = i
+                break
+        
+        with self._lock:
+            self.counts[slot] += 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+    
+    def snapshot(self) -> dict:
+        """
+        Copia consistente del histograma.
+        
+        Returns:
+            Diccionario con count, sum, min, max, mean y buckets acumulados
+            como lista de [límite, cantidad de valores <= límite]
+            (el último límite es "+Inf")
+        """
+        with self._lock:
+            counts = list(self.counts)
+            count, total = self.count, self.total
+            low, high = self.min, self.max
+        
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip([*self.buckets, "+Inf"], counts):
+            running += bucket_count
+            cumulative.append([bound, running])
+        
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "min": round(low, 6) if low is not None else None,
+            "max": round(high, 6) if high is not None else None,
+            "mean": round(total / count, 6) if count else None,
+            "buckets": cumulative,
+        }
+
+
+class StageTimer:
+    """
+    Cronómetro de una detección instrumentada.
+    Cada mark() registra el tiempo transcurrido desde la marca anterior.
+    """
+    
+    def __init__(self):
+        self.stages_ms: dict[str, float] = {}
+        self.patterns_ms: dict[str, float] = {}
+        self._last = time.perf_counter()
+    
+    def mark(self, stage: str) -> None:
+        """
+        Cierra una etapa.
+        
+        Args:
+            stage: Nombre de la etapa ("normalize", "search", ...)
+        """
+        now = time.perf_counter()
+        self.stages_ms[stage] = (now - self._last) * 1000
+        self._last = now
+
+
+class Instrumentation:
+    """
+    Agregador de tiempos por etapa y por patrón, desactivado por defecto.
+    
+    Con enabled = False el detector no crea StageTimer ni llama a
+    perf_counter por patrón: el único costo es leer `enabled` una vez por
+    detección.
+    """
+    
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled: Activar la instrumentación desde el inicio
+        """
+        self.enabled = enabled
+        self._stages: dict[str, Histogram] = {}
+        self._patterns: dict[str, Histogram] = {}
+        self._hooks: list[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+    
+    def timer(self) -> Optional[StageTimer]:
+        """Retorna un StageTimer si la instrumentación está activa, si no None."""
+        return StageTimer() if self.enabled else None
+    
+    def _histogram(self, table: dict[str, Histogram], name: str) -> Histogram:
+        """Retorna (creándolo si hace falta) el histograma `name` de `table`."""
+        histogram = table.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(name, Histogram())
+        return histogram
+    
+    def record_stage(self, stage: str, elapsed_ms: float) -> None:
+        """
+        Registra el tiempo de una etapa medida fuera del detector (p.ej. la
+        serialización de la respuesta en la API).
+        
+        Args:
+            stage: Nombre de la etapa
+            elapsed_ms: Duración en milisegundos
+        """
+        self._histogram(self._stages, stage).observe(elapsed_ms)
+    
+    def observe(self, timer: StageTimer, algorithm: str, text_length: int,
+                cache_hit: bool = False) -> dict:
+        """
+        Agrega las mediciones de una detección y notifica a los hooks.
+        
+        Args:
+            timer: Cronómetro de la detección
+            algorithm: Algoritmo usado
+            text_length: Longitud del texto normalizado
+            cache_hit: Si el resultado vino de la caché de resultados
+        
+        Returns:
+            Registro entregado a los hooks
+        """
+        for stage, elapsed_ms in timer.stages_ms.items():
+            self._histogram(self._stages, stage).observe(elapsed_ms)
+        for pattern, elapsed_ms in timer.patterns_ms.items():
+            self._histogram(self._patterns, pattern).observe(elapsed_ms)
+        
+        record = {
+            "algorithm": algorithm,
+            "text_length": text_length,
+            "cache_hit": cache_hit,
+            "stages_ms": {k: round(v, 6) for k, v in timer.stages_ms.items()},
+            "patterns_ms": {k: round(v, 6) for k, v in timer.patterns_ms.items()},
+        }
+        for hook in list(self._hooks):
+            hook(record)
+        return record
+    
+    def merge(self, record: dict) -> None:
+        """
+        Agrega el registro de una detección medida en otra instancia (p.ej.
+        en un proceso worker, ver observe) y notifica a los hooks.
+        
+        Args:
+            record: Registro retornado por observe
+        """
+        for stage, elapsed_ms in record["stages_ms"].items():
+            self._histogram(self._stages, stage).observe(elapsed_ms)
+        for pattern, elapsed_ms in record["patterns_ms"].items():
+            self._histogram(self._patterns, pattern).observe(elapsed_ms)
+        
+        for hook in list(self._hooks):
+            hook(record)
+    
+    def add_hook(self, hook: Callable[[dict], None]) -> None:
+        """
+        Registra una función que recibe el registro de cada detección
+        instrumentada. Se ejecuta en el hilo de la solicitud: debe ser rápida.
+        
+        Args:
+            hook: Función (registro) -> None
+        """
+        with self._lock:
+            self._hooks.append(hook)
+    
+    def remove_hook(self, hook: Callable[[dict], None]) -> None:
+        """Quita un hook registrado con add_hook (si no está, no hace nada)."""
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+    
+    def reset(self) -> None:
+        """Descarta todos los histogramas (los hooks se conservan)."""
+        with self._lock:
+            self._stages = {}
+            self._patterns = {}
+    
+    def snapshot(self) -> dict:
+        """
+        Estado actual de la instrumentación.
+        
+        Returns:
+            Diccionario con enabled y los histogramas por etapa y por patrón
+            (tiempos en milisegundos)
+        """
+        with self._lock:
+            stages = dict(self._stages)
+            patterns = dict(self._patterns)
+        
+        return {
+            "enabled": self.enabled,
+            "unit": "ms",
+            "stages": {name: h.snapshot() for name, h in stages.items()},
+            "patterns": {name: h.snapshot() for name, h in patterns.items()},
+        }
@@ -0,0 +1,163 @@
+"""
+Métricas en formato de texto de Prometheus.
+Responsabilidad única: acumular contadores e histogramas con etiquetas y
+exponerlos sin dependencias externas.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from services.instrumentation import Histogram
+
+
+# Buckets por defecto para latencias, en segundos
+LATENCY_BUCKETS_S = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = tuple[tuple[str, str], ...]
+# Un colector retorna muestras calculadas al momento de la lectura:
+# (nombre, tipo, ayuda, [(etiquetas, valor)])
+Collector = Callable[[], list[tuple[str, str, str, list[tuple[dict, float]]]]]
+
+
+def _escape(value: str) -> str:
+    """Escapa un valor de etiqueta según el formato de Prometheus."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, extra: Optional[tuple[str, str]] = None) -> str:
+    """Formatea etiquetas como {a="1",b="2"} (cadena vacía si no hay)."""
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Formatea un número para Prometheus (enteros sin decimales)."""
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Registro de contadores e histogramas con etiquetas, seguro entre hilos.
+    Las métricas se declaran una vez y se actualizan con inc/observe.
+    """
+    
+    def __init__(self):
+        self._help: dict[str, str] = {}
+        self._types: dict[str, str] = {}
+        self._buckets: dict[str, tuple[float, ...]] = {}
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+    
+    def counter(self, name: str, help_text: str) -> None:
+        """
+        Declara un contador.
+        
+        Args:
+            name: Nombre de la métrica (p.ej. "requests_total")
+            help_text: Descripción para la línea # HELP
+        """
+        self._help[name] = help_text
+        self._types[name] = 'counter'
+        self._counters.setdefault(name, {})
+    
+    def histogram(self, name: str, help_text: str,
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS_S) -> None:
+        """
+        Declara un histograma.
+        
+        Args:
+            name: Nombre de la métrica (p.ej. "request_duration_seconds")
+            help_text: Descripción para la línea # HELP
+            buckets: Límites superiores de los buckets
+        """
+        self._help[name] = help_text
+        self._types[name] = 'histogram'
+        self._buckets[name] = buckets
+        self._histograms.setdefault(name, {})
+    
+    def add_collector(self, collector: Collector) -> None:
+        """
+        Registra una función que aporta métricas calculadas al leer
+        /metrics (p.ej. tamaños de caché o versión de patrones).
+        
+        Args:
+            collector: Función sin argumentos que retorna muestras
+        """
+        self._collectors.append(collector)
+    
+    def inc(self, name: str, labels: Optional[dict] = None, value: float = 1) -> None:
+        """
+        Incrementa un contador declarado.
+        
+        Args:
+            name: Nombre del contador
+            labels: Etiquetas de la serie
+            value: Incremento
+        """
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        """
+        Registra un valor en un histograma declarado.
+        
+        Args:
+            name: Nombre del histograma
+            value: Valor observado
+            labels: Etiquetas de la serie
+        """
+        key = tuple(sorted((labels or {}).items()))
+        series = self._histograms[name]
+        histogram = series.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = series.setdefault(key, Histogram(self._buckets[name]))
+        histogram.observe(value)
+    
+    def render(self) -> str:
+        """
+        Genera el texto de exposición de Prometheus (versión 0.0.4).
+        
+        Returns:
+            Todas las métricas, terminadas en salto de línea
+        """
+        lines = []
+        
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+        
+        for name, series in counters.items():
+            lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} counter')
+            for labels, value in sorted(series.items()):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        
+        for name, series in histograms.items():
+            lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, histogram in sorted(series.items()):
+                data = histogram.snapshot()
+                for bound, count in data['buckets']:
+                    le = bound if bound == '+Inf' else _format_value(float(bound))
+                    lines.append(f'{name}_bucket{_format_labels(labels, ("le", le))} {count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(data["sum"])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {data["count"]}')
+        
+        for collector in self._collectors:
+            for name, metric_type, help_text, samples in collector():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    key = tuple(sorted(labels.items()))
+                    lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+        
+        return '\n'.join(lines) + '\n'
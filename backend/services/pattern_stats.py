@@ -0,0 +1,245 @@
+"""
+Estadísticas de uso de patrones.
+Responsabilidad única: contar con qué frecuencia aparece cada patrón y
+cuánto cuesta buscarlo, y derivar un orden de búsqueda para triage.
+"""
+
+import threading
+from typing import Any, Mapping, Optional, Sequence
+
+
+# Orden de severidad: menor = más urgente
+SEVERITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+class PatternStats:
+    """
+    Contadores por patrón (clave: texto del patrón), seguros entre hilos.
+    
+    - hits: textos en los que el patrón apareció al menos una vez
+    - matches: coincidencias totales
+    - scans: textos analizados desde que el patrón existe
+    - costo: tiempo medio de búsqueda, medido con la instrumentación
+      activada o, si se pide, en 1 de cada `cost_sample_every` análisis
+    """
+    
+    def __init__(self, cost_sample_every: int = 0, order_refresh: int = 256):
+        """
+        Args:
+            cost_sample_every: Cada cuántos análisis se mide el costo por patrón
+                aunque la instrumentación esté desactivada (0 = nunca: sin
+                instrumentación, ninguna búsqueda llama a perf_counter)
+            order_refresh: Cada cuántos análisis se recalcula el orden que
+                retorna cached_triage_order
+        """
+        self.cost_sample_every = cost_sample_every
+        self.order_refresh = order_refresh
+        self.scans = 0
+        # patrón -> [primer scan, hits, matches, muestras de costo, costo total ms]
+        self._entries: dict[str, list] = {}
+        self._known_version = -1
+        # Patrones registrados desde el último drain y lo ya informado por drain
+        self._changed: set[str] = set()
+        self._drained: dict[str, tuple] = {}
+        self._drained_scans = 0
+        self._until_sample = cost_sample_every
+        # (patrones, scans al calcular, orden) de la última llamada a cached_triage_order
+        self._order_cache: Optional[tuple] = None
+        self._lock = threading.Lock()
+    
+    def sample_cost(self) -> bool:
+        """
+        Indica si el análisis actual debe medir el costo por patrón.
+        Sin lock: un muestreo de más o de menos no altera las estadísticas.
+        """
+        if self.cost_sample_every <= 0:
+            return False
+        self._until_sample -= 1
+        if self._until_sample > 0:
+            return False
+        self._until_sample = self.cost_sample_every
+        return True
+    
+    def record(self, patterns: Sequence[dict], version: int,
+               all_positions: Mapping[int, Any],
+               patterns_ms: Optional[dict[str, float]] = None) -> None:
+        """
+        Registra el resultado de un análisis. Solo recorre los patrones
+        encontrados (y todos, una vez por versión).
+        
+        Args:
+            patterns: Patrones del snapshot usado
+            version: Versión del snapshot (para detectar patrones nuevos)
+            all_positions: {índice en patterns: posiciones o conteo} de los
+                patrones encontrados
+            patterns_ms: Tiempo de búsqueda por patrón, si se midió
+        """
+        with self._lock:
+            self._register(patterns, version)
+            self.scans += 1
+            entries = self._entries
+            for index, positions in all_positions.items():
+                pattern = patterns[index]['pattern']
+                entry = entries.get(pattern)
+                if entry is None:
+                    # Snapshot anterior a un reset(): registrar al vuelo
+                    entry = entries[pattern] = [self.scans - 1, 0, 0, 0, 0.0]
+                entry[1] += 1
+                # Conteo directo en modo "count"
+                entry[2] += positions if isinstance(positions, int) else len(positions)
+                self._changed.add(pattern)
+            
+            if patterns_ms:
+                for pattern, elapsed_ms in patterns_ms.items():
+                    entry = entries.get(pattern)
+                    if entry is not None:
+                        entry[3] += 1
+                        entry[4] += elapsed_ms
+                        self._changed.add(pattern)
+    
+    def _register(self, patterns: Sequence[dict], version: int) -> None:
+        """Crea las entradas de los patrones nuevos. Debe llamarse con _lock tomado."""
+        if version != self._known_version:
+            for pattern_data in patterns:
+                self._entries.setdefault(pattern_data['pattern'], [self.scans, 0, 0, 0, 0.0])
+            self._known_version = version
+    
+    def drain(self) -> tuple[int, dict[str, tuple]]:
+        """
+        Lo registrado desde la llamada anterior, para sumarlo a otra
+        instancia (ver merge). Solo recorre los patrones que cambiaron.
+        
+        Returns:
+            Tupla (scans, {patrón: (hits, matches, muestras de costo, costo total ms)})
+            con los incrementos de cada patrón que cambió
+        """
+        with self._lock:
+            scans = self.scans - self._drained_scans
+            self._drained_scans = self.scans
+            counts = {}
+            for pattern in self._changed:
+                totals = tuple(self._entries[pattern][1:])
+                previous = self._drained.get(pattern)
+                counts[pattern] = (tuple(a - b for a, b in zip(totals, previous))
+                                   if previous else totals)
+                self._drained[pattern] = totals
+            self._changed.clear()
+            return scans, counts
+    
+    def merge(self, patterns: Sequence[dict], version: int, scans: int,
+              counts: dict[str, tuple]) -> None:
+        """
+        Suma lo registrado por otra instancia (p.ej. la de un proceso worker).
+        
+        Args:
+            patterns: Patrones del snapshot usado
+            version: Versión del snapshot
+            scans: Análisis registrados
+            counts: {patrón: (hits, matches, muestras de costo, costo total ms)}
+                con los incrementos de cada patrón
+        """
+        with self._lock:
+            self._register(patterns, version)
+            self.scans += scans
+            entries = self._entries
+            for pattern, (hits, matches, cost_samples, cost_ms) in counts.items():
+                entry = entries.get(pattern)
+                if entry is None:
+                    entry = entries[pattern] = [self.scans - scans, 0, 0, 0, 0.0]
+                entry[1] += hits
+                entry[2] += matches
+                entry[3] += cost_samples
+                entry[4] += cost_ms
+    
+    def triage_order(self, patterns: Sequence[dict]) -> list[int]:
+        """
+        Orden de búsqueda para triage: primero por severidad (high,
+        medium, low), dentro de cada nivel por probabilidad de aparición
+        descendente y, a igual probabilidad, por costo ascendente. Así la
+        primera coincidencia high aparece lo antes posible.
+        
+        Args:
+            patterns: Patrones del snapshot
+        
+        Returns:
+            Índices de `patterns` en el orden de búsqueda
+        """
+        with self._lock:
+            scans = self.scans
+            entries = {p['pattern']: list(self._entries.get(p['pattern'], [scans, 0, 0, 0, 0.0]))
+                       for p in patterns}
+        
+        def key(index: int) -> tuple:
+            pattern_data = patterns[index]
+            first_scan, hits, _, cost_samples, cost_ms = entries[pattern_data['pattern']]
+            probability = (hits + 1) / (scans - first_scan + 2)
+            cost = cost_ms / cost_samples if cost_samples else 0.0
+            return (SEVERITY_RANK.get(pattern_data['alert_level'], len(SEVERITY_RANK)),
+                    -probability, cost)
+        
+        return sorted(range(len(patterns)), key=key)
+    
+    def cached_triage_order(self, patterns: Sequence[dict]) -> tuple[int, ...]:
+        """
+        triage_order sin ordenar en cada llamada: el orden se reutiliza
+        mientras el conjunto de patrones sea el mismo objeto (un snapshot)
+        y no hayan pasado order_refresh análisis. Las tasas cambian
+        despacio, así que un orden algo viejo sigue siendo bueno.
+        """
+        cached = self._order_cache
+        if (cached is not None and cached[0] is patterns
+                and self.scans - cached[1] < self.order_refresh):
+            return cached[2]
+        
+        order = tuple(self.triage_order(patterns))
+        self._order_cache = (patterns, self.scans, order)
+        return order
+    
+    def snapshot(self, patterns: Sequence[dict]) -> list[dict]:
+        """
+        Estadísticas de los patrones indicados, en orden de triage.
+        
+        Args:
+            patterns: Patrones del snapshot vigente
+        
+        Returns:
+            Lista de diccionarios con contadores, tasa de aparición, costo
+            medio (µs) y posición en el orden de triage
+        """
+        order = self.triage_order(patterns)
+        
+        with self._lock:
+            scans = self.scans
+            entries = {p['pattern']: list(self._entries.get(p['pattern'], [scans, 0, 0, 0, 0.0]))
+                       for p in patterns}
+        
+        result = []
+        for rank, index in enumerate(order):
+            pattern_data = patterns[index]
+            first_scan, hits, matches, cost_samples, cost_ms = entries[pattern_data['pattern']]
+            pattern_scans = scans - first_scan
+            result.append({
+                "index": index,
+                "triage_rank": rank,
+                "pattern": pattern_data['pattern'],
+                "category": pattern_data['category'],
+                "alert_level": pattern_data['alert_level'],
+                "scans": pattern_scans,
+                "hits": hits,
+                "matches": matches,
+                "hit_rate": round(hits / pattern_scans, 4) if pattern_scans else 0.0,
+                "avg_scan_us": round(cost_ms * 1000 / cost_samples, 3) if cost_samples else None,
+                "cost_samples": cost_samples,
+            })
+        return result
+    
+    def reset(self) -> None:
+        """Descarta todas las estadísticas."""
+        with self._lock:
+            self.scans = 0
+            self._entries = {}
+            self._known_version = -1
+            self._order_cache = None
+            self._changed.clear()
+            self._drained = {}
+            self._drained_scans = 0
@@ -0,0 +1,137 @@
+"""
+Caché de resultados de detección.
+Responsabilidad única: guardar, con expulsión LRU y caducidad opcional,
+el resultado de buscar los patrones en un texto ya normalizado.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def text_digest(text: str) -> bytes:
+    """
+    Resumen (hash) de un texto para usarlo como clave de caché.
+    
+    BLAKE2b de 16 bytes: la clave ocupa poco aunque el texto sea largo y
+    la probabilidad de colisión es despreciable.
+    
+    Args:
+        text: Texto (normalmente ya normalizado)
+    
+    Returns:
+        Resumen de 16 bytes
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class ResultCache:
+    """
+    Caché LRU acotada y segura entre hilos, con caducidad (TTL) opcional.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Máximo de entradas (0 desactiva la caché)
+            ttl: Segundos de validez de cada entrada (None = sin caducidad)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Último tamaño informado por cada caché remota (ver merge)
+        self._remote_sizes: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retorna el valor guardado para `key`, o None si no existe o caducó.
+        
+        Args:
+            key: Clave de la entrada
+        
+        Returns:
+            Valor guardado o None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Guarda un valor, descartando las entradas menos usadas si se
+        supera maxsize. El valor no debe modificarse después.
+        
+        Args:
+            key: Clave de la entrada
+            value: Valor a guardar
+        """
+        if self.maxsize <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def merge(self, hits: int, misses: int, source: Hashable, size: int) -> None:
+        """
+        Suma el uso de otra caché (p.ej. la de un proceso worker) a los
+        contadores de esta, para que stats() refleje ambas.
+        
+        Args:
+            hits: Aciertos nuevos de la otra caché
+            misses: Fallos nuevos de la otra caché
+            source: Identificador de la otra caché
+            size: Entradas actuales de la otra caché (reemplaza el valor anterior)
+        """
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self._remote_sizes[source] = size
+    
+    def forget_remote(self) -> None:
+        """Descarta los tamaños informados por merge (p.ej. al cerrar los workers)."""
+        with self._lock:
+            self._remote_sizes.clear()
+    
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._remote_sizes.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> dict:
+        """
+        Estadísticas de uso de la caché.
+        
+        Returns:
+            Diccionario con tamaño (incluidas las cachés remotas),
+            configuración, aciertos, fallos y tasas
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries) + sum(self._remote_sizes.values()),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "miss_rate": round(self.misses / lookups, 4) if lookups else 0.0,
+            }
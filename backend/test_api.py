@@ -5,6 +5,7 @@ Simula solicitudes HTTP y valida respuestas.
 
 import json
 from services.detector import create_detector
+from services.executor import DetectionExecutor
 
 
 def test_api_endpoints():
@@ -162,6 +163,53 @@ def test_api_response_schema():
     print(json.dumps(analysis, indent=2))
 
 
+def test_analyze_stream():
+    """POST /analyze/stream: NDJSON de entrada y de salida, en orden."""
+    from fastapi.testclient import TestClient
+    import api
+    
+    print("\n" + "=" * 70)
+    print("  POST /analyze/stream (NDJSON)")
+    print("=" * 70 + "\n")
+    
+    # Pool de hilos: sin procesos hijos durante la prueba
+    executor = api.executor
+    api.executor = DetectionExecutor(api.detector, backend="thread", workers=2)
+    try:
+        client = TestClient(api.app)
+        
+        lines = [
+            json.dumps("Producto con defecto"),
+            json.dumps({"text": "Llegó roto", "id": "m-2"}),
+            "no es json",
+            "",
+            json.dumps({"text": "Todo bien, gracias"}),
+        ] + [json.dumps(f"mensaje {i} sin problema") for i in range(600)]
+        body = ("\n".join(lines)).encode("utf-8")
+        
+        response = client.post("/analyze/stream?algorithm=kmp", content=body)
+        results = [json.loads(line) for line in response.text.splitlines()]
+        
+        print(f"Status: {response.status_code}  Content-Type: {response.headers['content-type']}")
+        print(f"Mensajes: {len(lines) - 1}  Resultados: {len(results)}")
+        for result in results[:4]:
+            print(f"  [{result['index']}] id={result.get('id')} "
+                  f"{result.get('error') or [d['pattern'] for d in result['detections']]}")
+        
+        assert response.status_code == 200
+        assert [r["index"] for r in results] == list(range(len(lines) - 1))
+        assert results[0]["has_complaints"] and results[1]["id"] == "m-2"
+        assert "error" in results[2] and not results[3]["has_complaints"]
+        assert "original_text" not in results[0] and "normalized_text" not in results[0]
+        
+        response = client.post("/analyze/stream?algorithm=invalido", content=body)
+        assert response.status_code == 400
+    finally:
+        api.executor.shutdown()
+        api.executor = executor
+
+
 if __name__ == "__main__":
     test_api_endpoints()
     test_api_response_schema()
+    test_analyze_stream()
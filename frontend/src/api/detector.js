@@ -1,6 +1,6 @@
 const API_BASE = 'http://localhost:8000';
 
-export async function analyzeText(text, algorithm = 'kmp') {
+export async function analyzeText(text, algorithm = 'aho_corasick') {
   const response = await fetch(`${API_BASE}/analyze`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
@@ -10,7 +10,7 @@ export async function analyzeText(text, algorithm = 'kmp') {
   return response.json();
 }
 
-export async function analyzeBatch(texts, algorithm = 'kmp') {
+export async function analyzeBatch(texts, algorithm = 'aho_corasick') {
   const response = await fetch(`${API_BASE}/analyze/batch?algorithm=${algorithm}`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
@@ -5,9 +5,15 @@ export default function HighlightedText({ text, detections = [] }) {
     return <span>{text}</span>;
   }
 
-  // Get all pattern positions
+  // Get all pattern positions (spans on the original text when available)
   const highlights = [];
   detections.forEach(detection => {
+    if (detection.spans) {
+      detection.spans.forEach(([start, end]) => {
+        highlights.push({ start, end, pattern: detection.pattern });
+      });
+      return;
+    }
     detection.positions.forEach(pos => {
       highlights.push({
         start: pos,
@@ -57,7 +57,7 @@ export default function Analysis() {
         <div className="analysis-content">
           <div className="analysis-text-panel">
             <HighlightedText 
-              text={result.normalized_text} 
+              text={result.original_text} 
               detections={result.detections} 
             />
           </div>
@@ -8,7 +8,7 @@ export default function Setup() {
   const [textName, setTextName] = useState('');
   const [patternGroup, setPatternGroup] = useState('Claims');
   const [text, setText] = useState('');
-  const [algorithm, setAlgorithm] = useState('kmp');
+  const [algorithm, setAlgorithm] = useState('aho_corasick');
   const [loading, setLoading] = useState(false);
   const [patterns, setPatterns] = useState([]);
   const [configLoading, setConfigLoading] = useState(true);
@@ -26,7 +26,7 @@ export default function Setup() {
         if (configData) {
           setTextName(configData.text_name || '');
           setPatternGroup(configData.pattern_group || 'Claims');
-          setAlgorithm(configData.algorithm || 'kmp');
+          setAlgorithm(configData.algorithm || 'aho_corasick');
         }
       } catch (error) {
         console.error('Error loading data:', error);
@@ -157,8 +157,16 @@ export default function Setup() {
               value={algorithm}
               onChange={(e) => setAlgorithm(e.target.value)}
             >
+              <option value="aho_corasick">Aho-Corasick</option>
+              <option value="wu_manber">Wu-Manber</option>
               <option value="kmp">KMP</option>
               <option value="boyer_moore">Boyer-Moore</option>
+              <option value="boyer_moore_full">Boyer-Moore (full)</option>
+              <option value="horspool">Horspool</option>
+              <option value="sunday">Sunday</option>
+              <option value="shift_or">Shift-Or</option>
+              <option value="shift_or_multi">Shift-Or (multi)</option>
+              <option value="myers">Myers (fuzzy)</option>
             </select>
             <button className="btn btn-secondary " onClick={handleAdapt}>
               Setup